@@ -0,0 +1,23 @@
+"""命令行入口 — `getnotes` / `python -m getnotes_cli`
+
+`--version` 直接在此处理，无需导入 typer / rich 并构建全部子命令。
+"""
+
+import sys
+
+from getnotes_cli import __version__
+
+
+def main() -> None:
+    """CLI 主入口"""
+    if sys.argv[1:] in (["--version"], ["-v"]):
+        print(f"getnotes-cli v{__version__}")
+        return
+
+    from getnotes_cli.cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""文件系统辅助函数 — 多个模块共用的目录/文件操作"""
+
+from pathlib import Path
+
+
+def ensure_dir(path: Path, seen: set[Path] | None = None) -> None:
+    """创建目录。
+
+    Args:
+        path: 目录路径
+        seen: 调用方持有的已创建目录集合（通常随一次运行/一个实例存在）；
+            传入时同一路径只 mkdir 一次，不传则每次都 mkdir
+    """
+    if seen is not None and path in seen:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    if seen is not None:
+        seen.add(path)
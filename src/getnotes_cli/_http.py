@@ -0,0 +1,44 @@
+"""共享 HTTP 连接 — 进程内复用连接池，避免每个请求重新握手 TLS"""
+
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 可重试的服务端状态码（429 会遵循 Retry-After）
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+def _make_session() -> requests.Session:
+    session = requests.Session()
+    # 默认 allowed_methods 不含 POST，创建笔记等非幂等请求不会被重复提交
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=RETRY_STATUS)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# requests 共享会话（NoteCreator 等使用）
+SESSION = _make_session()
+
+_httpx_client: httpx.Client | None = None
+_httpx_lock = threading.Lock()
+
+
+def shared_client() -> httpx.Client:
+    """返回进程内共享的 httpx.Client（首次调用时创建）"""
+    global _httpx_client
+    if _httpx_client is None:
+        with _httpx_lock:
+            if _httpx_client is None:
+                # retries 仅针对连接失败重试，不会重复已发出的请求
+                # 保活连接数覆盖 NOTE_WORKERS x ATTACHMENT_WORKERS 的并发下载
+                transport = httpx.HTTPTransport(
+                    retries=3,
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                )
+                _httpx_client = httpx.Client(timeout=30, transport=transport)
+    return _httpx_client
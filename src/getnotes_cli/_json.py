@@ -0,0 +1,31 @@
+"""JSON 序列化适配层 — 优先使用 orjson，未安装时回退到标准库 json"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: bytes | str):
+    """解析 JSON（接受 bytes 或 str）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj, *, indent: bool = False) -> bytes:
+    """序列化为 UTF-8 编码的 JSON bytes（中文不转义）"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
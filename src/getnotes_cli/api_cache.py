@@ -0,0 +1,140 @@
+"""接口响应磁盘缓存 — 为变化缓慢的列表接口提供 TTL 缓存与过期回退"""
+
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from getnotes_cli import _json
+from getnotes_cli.config import API_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# fetcher 返回该值表示服务端响应 304，沿用缓存内容
+NOT_MODIFIED = object()
+
+# 进程内缓存：同一进程内连续调用（REPL、脚本串联命令、MCP 服务）无需重复读盘
+_memory: dict[str, dict] = {}
+
+
+def _cache_path(key: str) -> Path:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return API_CACHE_DIR / f"{digest}.json"
+
+
+def _read_entry(path: Path) -> dict | None:
+    try:
+        entry = _json.loads(path.read_bytes())
+    except (_json.JSONDecodeError, OSError):
+        return None
+    if not isinstance(entry, dict) or "body" not in entry:
+        return None
+    return entry
+
+
+def _write_entry(path: Path, body: Any, ttl: float, validators: dict[str, str]) -> dict:
+    now = time.time()
+    entry = {"ts": now, "stale_at": now + ttl, "body": body}
+    if validators:
+        entry["validators"] = validators
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(_json.dumps(entry))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug("写入接口缓存失败: %s", e)
+    return entry
+
+
+def get_or_fetch(
+    key: str,
+    ttl: float,
+    fetcher: Callable[[], Any],
+    *,
+    refresh: bool = False,
+) -> Any:
+    """优先返回未过期的缓存，否则调用 fetcher 并写入缓存。
+
+    Args:
+        key: 缓存 key（需区分用户）
+        ttl: 有效期（秒）
+        fetcher: 实际请求函数，返回可 JSON 序列化的数据
+        refresh: 忽略现有缓存，强制重新请求
+
+    Raises:
+        fetcher 抛出的异常（且没有可用的过期缓存时）
+    """
+    return get_or_revalidate(key, ttl, lambda _validators: (fetcher(), {}), refresh=refresh)
+
+
+def get_or_revalidate(
+    key: str,
+    ttl: float,
+    fetcher: Callable[[dict[str, str]], tuple[Any, dict[str, str]]],
+    *,
+    refresh: bool = False,
+) -> Any:
+    """与 get_or_fetch 相同，但缓存过期后以条件请求重新验证。
+
+    fetcher 接收上次保存的条件请求 headers（If-None-Match / If-Modified-Since），
+    返回 (body, 新的条件请求 headers)；服务端返回 304 时 body 应为 NOT_MODIFIED。
+    refresh=True 时同样携带条件 headers —— 304 本身就是最新结果。
+    """
+    path = _cache_path(key)
+    entry = _memory.get(key)
+    if entry is None or time.time() >= entry.get("stale_at", 0):
+        # 内存中没有或已过期时再读盘（其它进程可能已刷新）
+        entry = _read_entry(path)
+    if entry is not None and not refresh and time.time() < entry.get("stale_at", 0):
+        _memory[key] = entry
+        return entry["body"]
+
+    validators = entry.get("validators", {}) if entry is not None else {}
+    try:
+        body, new_validators = fetcher(validators)
+    except Exception as e:
+        if entry is None:
+            raise
+        # 网络失败时回退到过期缓存，好过直接报错
+        logger.warning("⚠️  使用过期缓存（请求失败: %s）", e)
+        return entry["body"]
+
+    if body is NOT_MODIFIED:
+        body = entry["body"]
+        new_validators = new_validators or validators
+    _memory[key] = _write_entry(path, body, ttl, new_validators)
+    return body
+
+
+def invalidate(key: str) -> bool:
+    """删除单个缓存条目（数据已被修改时调用），返回是否存在该条目"""
+    in_memory = _memory.pop(key, None) is not None
+    try:
+        _cache_path(key).unlink()
+    except OSError:
+        return in_memory
+    return True
+
+
+def count() -> int:
+    """返回缓存条目数"""
+    try:
+        return sum(1 for p in API_CACHE_DIR.glob("*.json"))
+    except OSError:
+        return 0
+
+
+def clear() -> int:
+    """清除所有接口缓存，返回清除的条目数"""
+    _memory.clear()
+    removed = 0
+    for path in API_CACHE_DIR.glob("*.json"):
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            continue
+    return removed
@@ -0,0 +1,53 @@
+"""知识库并发下载驱动 — 使用 asyncio 限流并发处理多个知识库"""
+
+import asyncio
+import logging
+
+from getnotes_cli.config import NOTEBOOK_CONCURRENCY
+from getnotes_cli.notebook_downloader import NotebookDownloader
+
+logger = logging.getLogger(__name__)
+
+
+async def download_all_async(
+    downloader: NotebookDownloader,
+    notebooks: list[dict],
+    concurrency: int = NOTEBOOK_CONCURRENCY,
+) -> dict:
+    """并发下载多个知识库，同时进行的知识库数量不超过 concurrency。
+
+    单个知识库内部仍按原有顺序同步下载（在工作线程中运行），
+    不同知识库之间互不依赖，因此可以重叠各自的网络等待时间。
+
+    Args:
+        downloader: 共享的 NotebookDownloader（httpx.Client 线程安全）
+        notebooks: 知识库列表（来自 fetch_notebooks）
+        concurrency: 最大并发知识库数
+
+    Returns:
+        汇总统计
+    """
+    total = len(notebooks)
+    logger.info("🚀 开始下载 %d 个知识库（并发 %d）...", total, concurrency)
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(index: int, nb: dict) -> None:
+        async with sem:
+            name = nb.get("name", "未命名")
+            logger.info("[%d/%d] 正在处理知识库: %s", index, total, name)
+            try:
+                await asyncio.to_thread(downloader.download_notebook, nb)
+            except Exception as e:
+                logger.error("  ❌ 知识库 [%s] 下载失败: %s", name, e)
+
+    try:
+        await asyncio.gather(*(_one(i, nb) for i, nb in enumerate(notebooks, 1)))
+    except asyncio.CancelledError:
+        # Ctrl-C：asyncio.run 退出前会等待 to_thread 的工作线程结束，
+        # 通知它们尽快返回，而不是把进行中的知识库下载完
+        logger.warning("⚠️  下载已中断")
+        downloader.cancel()
+        raise
+
+    downloader.print_summary(total)
+    return downloader.stats
@@ -1,23 +1,32 @@
 """Auth token 管理 — 缓存与刷新 Bearer token"""
 
-import json
+import hashlib
 import logging
 import time
+from collections import ChainMap
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 
+from getnotes_cli import _json
+from getnotes_cli._fs import ensure_dir
 from getnotes_cli.config import AUTH_CACHE_FILE, CONFIG_DIR, DEFAULT_HEADERS
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AuthToken:
-    """存储 Bearer token 及相关 headers"""
+    """存储 Bearer token 及相关 headers（不可变，刷新时创建新实例）"""
     authorization: str  # "Bearer xxx"
     csrf_token: str = ""  # Xi-Csrf-Token
     extra_headers: dict[str, str] = field(default_factory=dict)
     extracted_at: float = 0.0
+    # get_headers() 的结果缓存（实例不可变，构建一次即可）
+    _cached_headers: Mapping[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
 
     def to_dict(self) -> dict:
         return {
@@ -41,34 +50,76 @@ class AuthToken:
         age = time.time() - self.extracted_at
         return age > (max_age_minutes * 60)
 
-    def get_headers(self) -> dict[str, str]:
-        """生成完整的请求 headers"""
-        headers = dict(DEFAULT_HEADERS)
-        headers["Authorization"] = self.authorization
+    def token_hash(self) -> str:
+        """token 的稳定短哈希，用作缓存 key（不暴露明文 token）"""
+        return hashlib.sha1(self.authorization.encode("utf-8")).hexdigest()[:16]
+
+    def get_headers(self) -> Mapping[str, str]:
+        """生成完整的请求 headers。
+
+        返回只读的 ChainMap（认证 headers 叠加在 DEFAULT_HEADERS 之上），
+        首次构建后复用；需要追加 headers 时请再包一层 ChainMap 或复制为 dict。
+        """
+        if self._cached_headers is not None:
+            return self._cached_headers
+        overlay = {"Authorization": self.authorization}
         if self.csrf_token:
-            headers["Xi-Csrf-Token"] = self.csrf_token
-        headers.update(self.extra_headers)
+            overlay["Xi-Csrf-Token"] = self.csrf_token
+        overlay.update(self.extra_headers)
+        headers = ChainMap(MappingProxyType(overlay), DEFAULT_HEADERS)
+        object.__setattr__(self, "_cached_headers", headers)
         return headers
 
 
+# AuthToken 字段固定，直接拼接序列化结果，省去 to_dict() 中间字典
+_TOKEN_JSON_TEMPLATE = (
+    b'{"authorization":%b,"csrf_token":%b,"extra_headers":%b,"extracted_at":%b}'
+)
+
+
+def _serialize_token(token: AuthToken) -> bytes:
+    """将 token 序列化为与 to_dict() 等价的 JSON bytes"""
+    return _TOKEN_JSON_TEMPLATE % (
+        _json.dumps(token.authorization),
+        _json.dumps(token.csrf_token),
+        _json.dumps(token.extra_headers),
+        _json.dumps(token.extracted_at),
+    )
+
+
+# 进程内解析结果缓存：(缓存文件路径, st_mtime_ns, AuthToken)
+_token_cache: tuple[Path, int, AuthToken] | None = None
+
+
 def load_cached_token() -> AuthToken | None:
-    """从缓存加载 token"""
-    if not AUTH_CACHE_FILE.exists():
+    """从缓存加载 token（文件未变化时复用上次解析结果）"""
+    global _token_cache
+    try:
+        mtime = AUTH_CACHE_FILE.stat().st_mtime_ns
+    except OSError:
         return None
+    if _token_cache is not None and _token_cache[:2] == (AUTH_CACHE_FILE, mtime):
+        return _token_cache[2]
     try:
-        data = json.loads(AUTH_CACHE_FILE.read_text(encoding="utf-8"))
-        return AuthToken.from_dict(data)
-    except (json.JSONDecodeError, KeyError, TypeError):
+        data = _json.loads(AUTH_CACHE_FILE.read_bytes())
+        token = AuthToken.from_dict(data)
+    except (_json.JSONDecodeError, KeyError, TypeError):
         return None
+    _token_cache = (AUTH_CACHE_FILE, mtime, token)
+    return token
 
 
 def save_token(token: AuthToken) -> None:
     """保存 token 到缓存"""
-    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    AUTH_CACHE_FILE.write_text(
-        json.dumps(token.to_dict(), ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    global _token_cache
+    data = _serialize_token(token)
+    try:
+        AUTH_CACHE_FILE.write_bytes(data)
+    except FileNotFoundError:
+        # 配置目录不存在（首次保存或已被删除）时才创建，避免每次保存都 mkdir
+        ensure_dir(CONFIG_DIR)
+        AUTH_CACHE_FILE.write_bytes(data)
+    _token_cache = None
 
 
 def get_or_refresh_token(force_login: bool = False) -> AuthToken:
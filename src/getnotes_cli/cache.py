@@ -1,54 +1,150 @@
 """缓存管理 — 跟踪已下载笔记的版本与状态"""
 
-import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 
+from getnotes_cli import _json
+from getnotes_cli._fs import ensure_dir
 from getnotes_cli.config import CACHE_MANIFEST_FILE, CONFIG_DIR
 
 logger = logging.getLogger(__name__)
 
+# 增量日志超过该大小时自动合并进快照
+LOG_COMPACT_THRESHOLD = 1024 * 1024
+
+# check() 附带的条目预览数量上限（CLI 仅在条目不多时展示表格）
+CHECK_PREVIEW_LIMIT = 20
+
+# 从磁盘重建缓存时并行读取 note.json 的线程数
+REBUILD_WORKERS = 16
+
+
+def _signature(info: dict) -> tuple:
+    """缓存命中判断所用的 (version, updated_at) 签名"""
+    return (info.get("version"), info.get("updated_at"))
+
+
+def _parse_note_folder(folder: Path) -> tuple[str, dict] | None:
+    """读取单个笔记文件夹的 note.json，返回 (note_id, 缓存条目)"""
+    try:
+        # 直接读取，文件不存在时由异常处理，省去一次 exists() 的 stat
+        data = _json.loads((folder / "note.json").read_bytes())
+    except (_json.JSONDecodeError, OSError):
+        return None
+    note_id = data.get("note_id", data.get("id", ""))
+    if not note_id:
+        return None
+    return note_id, {
+        "version": data.get("version"),
+        "updated_at": data.get("updated_at", ""),
+        "folder_name": folder.name,
+        "title": data.get("title", ""),
+        "created_at": data.get("created_at", ""),
+    }
+
 
 class CacheManager:
-    """管理下载缓存清单"""
+    """管理下载缓存清单。
+
+    清单由两部分组成：
+    - 快照 ``cache_manifest.json``：完整的 note_id → 条目映射
+    - 增量日志 ``cache_manifest.log.jsonl``：每次 update() 追加一行，
+      load() 时在快照之上重放，compact() 时合并回快照并清空
+    """
 
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         self.cache_path = CONFIG_DIR / CACHE_MANIFEST_FILE
         self._manifest: dict = {}
+        # note_id → (version, updated_at)，供 is_cached() 单次查表比较
+        self._sig: dict[str, tuple] = {}
+        self._loaded = False
+        # 自上次写快照以来是否有变更；无变更时 compact() 不重写整个快照
+        self._dirty = False
+        # 本实例已创建的目录，避免每次 update() 追加日志都 mkdir
+        self._created_dirs: set[Path] = set()
+
+    @property
+    def log_path(self) -> Path:
+        """增量日志路径（与快照位于同一目录）"""
+        return self.cache_path.with_name(f"{self.cache_path.stem}.log.jsonl")
 
     def load(self) -> dict:
-        """加载缓存清单"""
-        if self.cache_path.exists():
-            try:
-                self._manifest = json.loads(self.cache_path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, IOError):
-                logger.warning("⚠️  缓存清单损坏，将重新构建。")
-                self._manifest = {}
+        """加载缓存清单（快照 + 增量日志）"""
+        try:
+            self._manifest = _json.loads(self.cache_path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (_json.JSONDecodeError, IOError):
+            logger.warning("⚠️  缓存清单损坏，将重新构建。")
+            self._manifest = {}
+        # 存在未合并的增量日志时，下次 compact() 需要写快照
+        self._dirty = self._replay_log()
+        self._sig = {nid: _signature(info) for nid, info in self._manifest.items()}
+        self._loaded = True
         return self._manifest
 
-    def save(self) -> None:
-        """保存缓存清单"""
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        self.cache_path.write_text(
-            json.dumps(self._manifest, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    def _replay_log(self) -> bool:
+        """将增量日志中的条目应用到内存清单，返回日志是否存在"""
+        try:
+            raw = self.log_path.read_bytes()
+        except OSError:
+            return False
+        for line in raw.splitlines():
+            try:
+                entry = _json.loads(line)
+                self._manifest[entry["id"]] = entry["info"]
+            except (_json.JSONDecodeError, KeyError, TypeError):
+                # 中断时可能留下半行，忽略即可
+                continue
+        return True
+
+    def save(self, pretty: bool = False) -> None:
+        """保存缓存清单（等同于 compact()）
+
+        Args:
+            pretty: 是否缩进输出；默认紧凑格式，体积与序列化耗时约减半
+        """
+        self.compact(pretty=pretty)
+
+    def compact(self, pretty: bool = False) -> None:
+        """将完整清单原子写入快照，并清空增量日志（无变更时跳过）"""
+        if not self._dirty and self.cache_path.exists():
+            return
+        ensure_dir(self.cache_path.parent, self._created_dirs)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_json.dumps(self._manifest, indent=pretty))
+        os.replace(tmp_path, self.cache_path)
+        self.log_path.unlink(missing_ok=True)
+        self._dirty = False
 
     def is_cached(self, note: dict) -> bool:
         """检查笔记是否已缓存且版本未变化"""
         note_id = note.get("note_id", note.get("id", ""))
-        if note_id not in self._manifest:
-            return False
-        cached = self._manifest[note_id]
-        return (
-            cached.get("version") == note.get("version")
-            and cached.get("updated_at") == note.get("updated_at")
-        )
+        sig = self._sig.get(note_id)
+        if sig is None:
+            # 未经 load()/update() 写入的条目，按需补算签名
+            cached = self._manifest.get(note_id)
+            if cached is None:
+                return False
+            sig = self._sig[note_id] = _signature(cached)
+        return sig == (note.get("version"), note.get("updated_at"))
 
     def update(self, note_id: str, info: dict) -> None:
-        """更新缓存条目"""
+        """更新缓存条目，并追加写入增量日志"""
         self._manifest[note_id] = info
+        self._sig[note_id] = _signature(info)
+        self._dirty = True
+        ensure_dir(self.log_path.parent, self._created_dirs)
+        with open(self.log_path, "ab") as f:
+            f.write(_json.dumps({"id": note_id, "info": info}) + b"\n")
+            log_size = f.tell()
+        if log_size > LOG_COMPACT_THRESHOLD:
+            self.compact()
 
     def get(self, note_id: str) -> dict | None:
         """获取缓存条目"""
@@ -62,23 +158,39 @@ class CacheManager:
     def manifest(self) -> dict:
         return self._manifest
 
+    def by_folder(self) -> dict[str, tuple[str, dict]]:
+        """返回 folder_name → (note_id, 缓存条目) 的映射（用于生成索引）"""
+        return {
+            info["folder_name"]: (nid, info)
+            for nid, info in self._manifest.items()
+            if info.get("folder_name")
+        }
+
+    def _exists(self) -> bool:
+        return self.cache_path.exists() or self.log_path.exists()
+
     def check(self) -> dict:
-        """检查缓存状态，返回统计信息"""
-        if not self.cache_path.exists():
+        """检查缓存状态，返回统计信息（notes 仅包含前 CHECK_PREVIEW_LIMIT 条预览）"""
+        if not self._exists():
             return {"exists": False, "count": 0, "path": str(self.cache_path)}
-        self.load()
+        if not self._loaded:
+            self.load()
         return {
             "exists": True,
             "count": self.count,
             "path": str(self.cache_path),
-            "notes": {
-                nid: {
-                    "title": info.get("title", "(无标题)"),
-                    "created_at": info.get("created_at", ""),
-                    "folder": info.get("folder_name", ""),
-                }
-                for nid, info in self._manifest.items()
-            },
+            "notes": self.preview(CHECK_PREVIEW_LIMIT),
+        }
+
+    def preview(self, n: int = CHECK_PREVIEW_LIMIT) -> dict:
+        """返回前 n 条缓存条目的展示信息"""
+        return {
+            nid: {
+                "title": info.get("title", "(无标题)"),
+                "created_at": info.get("created_at", ""),
+                "folder": info.get("folder_name", ""),
+            }
+            for nid, info in islice(self._manifest.items(), n)
         }
 
     def rebuild_from_disk(self, notes_dir: Path) -> int:
@@ -93,44 +205,44 @@ class CacheManager:
         if not notes_dir.exists():
             return 0
 
+        # scandir 的 DirEntry 自带文件类型，无需逐个 stat
+        with os.scandir(notes_dir) as it:
+            folders = [Path(entry.path) for entry in it if entry.is_dir(follow_symlinks=False)]
+        with ThreadPoolExecutor(max_workers=REBUILD_WORKERS) as executor:
+            results = list(executor.map(_parse_note_folder, folders))
+
+        # 合并在主线程串行进行（保持目录遍历顺序，先出现的 note_id 优先）
         rebuilt = 0
-        for folder in notes_dir.iterdir():
-            if not folder.is_dir():
-                continue
-            json_file = folder / "note.json"
-            if not json_file.exists():
+        for result in results:
+            if result is None:
                 continue
-            try:
-                data = json.loads(json_file.read_text(encoding="utf-8"))
-                note_id = data.get("note_id", data.get("id", ""))
-                if not note_id:
-                    continue
-                # 避免覆盖已有缓存条目
-                if note_id in self._manifest:
-                    continue
-                self._manifest[note_id] = {
-                    "version": data.get("version"),
-                    "updated_at": data.get("updated_at", ""),
-                    "folder_name": folder.name,
-                    "title": data.get("title", ""),
-                    "created_at": data.get("created_at", ""),
-                }
-                rebuilt += 1
-            except (json.JSONDecodeError, IOError):
+            note_id, entry = result
+            # 避免覆盖已有缓存条目
+            if note_id in self._manifest:
                 continue
+            self._manifest[note_id] = entry
+            self._sig[note_id] = _signature(entry)
+            rebuilt += 1
 
         if rebuilt > 0:
+            self._dirty = True
             self.save()
             logger.info("💾 从磁盘重建缓存: 恢复了 %d 条记录", rebuilt)
 
         return rebuilt
 
-    def clear(self) -> int:
-        """清除缓存，返回清除的条目数"""
-        count = 0
-        if self.cache_path.exists():
-            self.load()
-            count = self.count
-            self.cache_path.unlink()
+    def clear(self) -> int | None:
+        """清除缓存，返回清除的条目数
+
+        只删除文件，不为统计数量而解析清单：清单尚未加载（未调用 load() / check()）
+        时条目数未知，返回 None。
+        """
+        count: int | None = 0
+        if self._exists():
+            count = self.count if self._loaded else None
+            self.cache_path.unlink(missing_ok=True)
+            self.log_path.unlink(missing_ok=True)
         self._manifest = {}
+        self._sig = {}
+        self._loaded = False
         return count
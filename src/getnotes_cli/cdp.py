@@ -3,32 +3,59 @@
 通过 CDP 启动 Chrome，打开得到笔记页面，监听网络请求以捕获 Authorization header。
 """
 
-import json
+import functools
 import platform
+import re
 import shutil
 import socket
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import httpx
 
+from getnotes_cli import _json
 from getnotes_cli.config import CHROME_PROFILE_DIR, LOGIN_URL, API_DOMAINS
 
-_httpx = httpx.Client(timeout=10)
+# 模块级共享客户端：探测 /json 端点时复用本机 keep-alive 连接
+_httpx = httpx.Client(
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=30),
+)
 
 # CDP 端口范围
 CDP_PORT_RANGE = range(9222, 9232)
 
+# 事件帧预过滤关键字：不含这些子串的帧无需解析
+_EVENT_MARKER = "Network.requestWillBeSent"
+_AUTH_MARKER = '"Authorization"'
+_EVENT_MARKER_B = _EVENT_MARKER.encode()
+_AUTH_MARKER_B = _AUTH_MARKER.encode()
+
+# 得到笔记 API 域名匹配（预编译为单个正则）
+_API_RE = re.compile("|".join(re.escape(domain) for domain in API_DOMAINS))
+
+
+def _is_candidate_frame(raw: str | bytes) -> bool:
+    """粗筛 CDP 帧：仅带 Authorization 的 requestWillBeSent 事件才值得 json.loads
+
+    先查更罕见的 Authorization 标记，绝大多数帧一次子串扫描即可排除。
+    """
+    if isinstance(raw, bytes):
+        return _AUTH_MARKER_B in raw and _EVENT_MARKER_B in raw
+    return _AUTH_MARKER in raw and _EVENT_MARKER in raw
+
 
 # ========================================================================
 # Chrome 管理
 # ========================================================================
 
 
+@functools.lru_cache(maxsize=None)
 def get_chrome_path() -> str | None:
-    """获取 Chrome 可执行文件路径"""
+    """获取 Chrome 可执行文件路径（结果在进程内缓存）"""
     system = platform.system()
     if system == "Darwin":
         path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
@@ -44,29 +71,36 @@ def get_chrome_path() -> str | None:
     return None
 
 
+def _port_in_use(port: int) -> bool:
+    """通过 connect_ex 判断本机端口是否有进程监听（不占用端口）"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.2)
+        return s.connect_ex(("127.0.0.1", port)) == 0
+
+
 def find_available_port(start: int = 9222, attempts: int = 10) -> int:
     """查找可用端口"""
-    for offset in range(attempts):
-        port = start + offset
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("127.0.0.1", port))
-                return port
-        except OSError:
-            continue
+    for port in range(start, start + attempts):
+        if not _port_in_use(port):
+            return port
     raise RuntimeError(f"在 {start}-{start + attempts - 1} 范围内找不到可用端口")
 
 
+def _probe_port(port: int) -> str | None:
+    """探测单个端口：确认有进程监听后再请求调试 URL"""
+    if not _port_in_use(port):
+        return None
+    return get_debugger_url(port, timeout=2)
+
+
 def find_existing_chrome(port_range: range = CDP_PORT_RANGE) -> tuple[int | None, str | None]:
-    """扫描端口范围，查找已运行的 Chrome 调试实例"""
-    for port in port_range:
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("127.0.0.1", port))
-                continue  # 端口空闲，跳过
-        except OSError:
-            pass  # 端口已占用
-        url = get_debugger_url(port, timeout=2)
+    """并行扫描端口范围，查找已运行的 Chrome 调试实例（按端口顺序返回第一个）"""
+    ports = list(port_range)
+    if not ports:
+        return None, None
+    with ThreadPoolExecutor(max_workers=len(ports)) as executor:
+        urls = list(executor.map(_probe_port, ports))
+    for port, url in zip(ports, urls):
         if url:
             return port, url
     return None, None
@@ -136,32 +170,52 @@ def get_debugger_url(port: int = 9222, tries: int = 1, timeout: int = 5) -> str
     return None
 
 
-def execute_cdp_command(ws_url: str, method: str, params: dict | None = None) -> dict:
-    """通过 WebSocket 发送 CDP 命令"""
-    import websocket
-    ws = websocket.create_connection(ws_url, timeout=30, suppress_origin=True)
-    try:
-        command = {"id": 1, "method": method, "params": params or {}}
-        ws.send(json.dumps(command))
+class CDPSession:
+    """复用单个 WebSocket 连接的 CDP 会话，按自增 id 匹配命令响应"""
+
+    def __init__(self, ws_url: str, timeout: float = 30):
+        import websocket
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._next_id = 0
+
+    def send(self, method: str, params: dict | None = None) -> dict:
+        """发送 CDP 命令并等待对应 id 的响应，期间收到的事件会被丢弃"""
+        self._next_id += 1
+        msg_id = self._next_id
+        payload = _json.dumps({"id": msg_id, "method": method, "params": params or {}})
+        self.ws.send(payload.decode("utf-8"))
         while True:
-            response = json.loads(ws.recv())
-            if response.get("id") == 1:
+            response = _json.loads(self.ws.recv())
+            if response.get("id") == msg_id:
                 return response.get("result", {})
-    finally:
-        ws.close()
 
+    def close(self) -> None:
+        self.ws.close()
+
+    def __enter__(self) -> "CDPSession":
+        return self
 
-def get_current_url(ws_url: str) -> str:
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def execute_cdp_command(ws_url: str, method: str, params: dict | None = None) -> dict:
+    """通过 WebSocket 发送单条 CDP 命令（多条命令请直接使用 CDPSession）"""
+    with CDPSession(ws_url) as session:
+        return session.send(method, params)
+
+
+def get_current_url(session: CDPSession) -> str:
     """获取当前页面 URL"""
-    execute_cdp_command(ws_url, "Runtime.enable")
-    result = execute_cdp_command(ws_url, "Runtime.evaluate", {"expression": "window.location.href"})
+    session.send("Runtime.enable")
+    result = session.send("Runtime.evaluate", {"expression": "window.location.href"})
     return result.get("result", {}).get("value", "")
 
 
-def navigate_to_url(ws_url: str, url: str) -> None:
+def navigate_to_url(session: CDPSession, url: str) -> None:
     """导航到指定 URL"""
-    execute_cdp_command(ws_url, "Page.enable")
-    execute_cdp_command(ws_url, "Page.navigate", {"url": url})
+    session.send("Page.enable")
+    session.send("Page.navigate", {"url": url})
 
 
 # ========================================================================
@@ -243,15 +297,11 @@ def extract_auth_via_cdp(
         raise RuntimeError("❌ 无法获取页面 WebSocket URL")
 
     # 3. 通过 CDP 网络监听捕获 Authorization header
-    ws = websocket.create_connection(ws_url, timeout=30, suppress_origin=True)
+    session = CDPSession(ws_url)
+    ws = session.ws
     try:
         # 启用网络监听
-        ws.send(json.dumps({"id": 10, "method": "Network.enable", "params": {}}))
-        # 读取 enable 的响应
-        while True:
-            resp = json.loads(ws.recv())
-            if resp.get("id") == 10:
-                break
+        session.send("Network.enable")
 
         print("⏳ 等待登录并捕获 API 请求中...")
         print(f"   请在浏览器中登录 {LOGIN_URL}")
@@ -266,7 +316,10 @@ def extract_auth_via_cdp(
             try:
                 ws.settimeout(2.0)
                 raw = ws.recv()
-                event = json.loads(raw)
+                # 绝大多数事件与 token 无关，先做子串匹配，命中再完整解析
+                if not _is_candidate_frame(raw):
+                    continue
+                event = _json.loads(raw)
             except websocket.WebSocketTimeoutException:
                 continue
             except Exception:
@@ -279,7 +332,7 @@ def extract_auth_via_cdp(
                 headers = request.get("headers", {})
 
                 # 检查是否是得到笔记的 API 请求
-                is_target = any(domain in url for domain in API_DOMAINS)
+                is_target = _API_RE.search(url) is not None
                 if is_target and "Authorization" in headers:
                     auth_value = headers["Authorization"]
                     if auth_value.startswith("Bearer "):
@@ -294,6 +347,6 @@ def extract_auth_via_cdp(
         raise RuntimeError("⏰ 登录超时，未捕获到 API 请求。请重试。")
 
     finally:
-        ws.close()
+        session.close()
         if not reused:
             terminate_chrome()
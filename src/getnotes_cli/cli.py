@@ -3,15 +3,14 @@
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from getnotes_cli import __version__
-from getnotes_cli.config import DEFAULT_LIMIT, DEFAULT_OUTPUT_DIR, PAGE_SIZE, REQUEST_DELAY
-from getnotes_cli.settings import resolve_delay, resolve_output, resolve_page_size
+from getnotes_cli.config import DEFAULT_LIMIT, PAGE_SIZE, REQUEST_DELAY
+from getnotes_cli.settings import resolve_delay, resolve_output_dir, resolve_page_size
 
 # Configure logging to stderr so CLI users see progress from downloader modules
 logging.basicConfig(
@@ -209,6 +208,7 @@ def search(
     ),
 ) -> None:
     """🔍 搜索笔记 — 根据关键词搜索相关笔记"""
+    from rich.table import Table
     from getnotes_cli.searcher import NoteSearcher
 
     auth = _get_auth(token)
@@ -331,7 +331,7 @@ def download(
             raise typer.Exit(1)
 
     max_notes = None if all_notes else limit
-    output_dir = Path(resolve_output(output, str(DEFAULT_OUTPUT_DIR)))
+    output_dir = resolve_output_dir(output)
     final_delay = resolve_delay(delay, REQUEST_DELAY)
     final_page_size = resolve_page_size(page_size, PAGE_SIZE)
 
@@ -360,9 +360,10 @@ cache_app = typer.Typer(
 @cache_app.command("check")
 def cache_check() -> None:
     """📊 查看缓存状态"""
-    from getnotes_cli.cache import CacheManager
+    from rich.table import Table
+    from getnotes_cli.cache import CHECK_PREVIEW_LIMIT, CacheManager
 
-    cm = CacheManager(Path(resolve_output(None, str(DEFAULT_OUTPUT_DIR))))
+    cm = CacheManager(resolve_output_dir(None))
     info = cm.check()
 
     if not info["exists"]:
@@ -374,7 +375,7 @@ def cache_check() -> None:
     console.print(f"  📁 路径: {info['path']}")
     console.print(f"  📝 已缓存笔记: [cyan]{info['count']}[/cyan] 条\n")
 
-    if info["count"] > 0 and info["count"] <= 20:
+    if 0 < info["count"] <= CHECK_PREVIEW_LIMIT:
         table = Table(title="缓存条目")
         table.add_column("标题", style="cyan", max_width=50)
         table.add_column("创建时间", style="dim")
@@ -390,13 +391,15 @@ def cache_clear(
         help="跳过确认提示",
     ),
 ) -> None:
-    """🗑️ 清除缓存"""
+    """🗑️ 清除缓存（下载记录与知识库列表缓存）"""
+    from getnotes_cli import api_cache
     from getnotes_cli.cache import CacheManager
 
-    cm = CacheManager(Path(resolve_output(None, str(DEFAULT_OUTPUT_DIR))))
+    cm = CacheManager(resolve_output_dir(None))
     info = cm.check()
+    api_count = api_cache.count()
 
-    if not info["exists"]:
+    if not info["exists"] and not api_count:
         console.print("[dim]暂无缓存数据。[/dim]")
         return
 
@@ -405,6 +408,9 @@ def cache_clear(
 
     count = cm.clear()
     console.print(f"[green]✓[/green] 已清除 {count} 条缓存记录。")
+    if api_count:
+        removed = api_cache.clear()
+        console.print(f"[green]✓[/green] 已清除 {removed} 条接口缓存。")
 
 
 app.add_typer(cache_app, name="cache")
@@ -434,184 +440,348 @@ def _get_auth(token: str | None) -> "AuthToken":
         raise typer.Exit(1)
 
 
-@notebook_app.command("list")
-def notebook_list(
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📋 列出所有知识库"""
-    from getnotes_cli.notebook import fetch_notebooks
+def _make_limiter(delay: float | None, rate: float | None) -> "RateLimiter":
+    """根据 --rate / --delay 构建请求限速器（--rate 优先）"""
+    from getnotes_cli.ratelimit import RateLimiter
+
+    if rate is not None:
+        return RateLimiter(rate)
+    return RateLimiter.from_delay(resolve_delay(delay, REQUEST_DELAY))
+
+
+def _fetch_notebook_list(
+    auth: "AuthToken",
+    *,
+    subscribed: bool = False,
+    no_cache: bool = False,
+    refresh_cache: bool = False,
+) -> list[dict]:
+    """获取（订阅）知识库列表，默认使用磁盘 TTL 缓存"""
+    from getnotes_cli import notebook
+
+    if no_cache:
+        if subscribed:
+            return notebook.fetch_subscribed_notebooks(auth)
+        return notebook.fetch_notebooks(auth)
+    if subscribed:
+        return notebook.cached_fetch_subscribed_notebooks(auth, refresh=refresh_cache)
+    return notebook.cached_fetch_notebooks(auth, refresh=refresh_cache)
+
+
+def _fetch_notebook_index(
+    auth: "AuthToken",
+    *,
+    subscribed: bool = False,
+    no_cache: bool = False,
+    refresh_cache: bool = False,
+) -> dict:
+    """获取（订阅）知识库列表及其查找索引（notebook.index_notebooks 结构）"""
+    from getnotes_cli import notebook
+
+    if no_cache:
+        return notebook.index_notebooks(
+            _fetch_notebook_list(auth, subscribed=subscribed, no_cache=True)
+        )
+    return notebook.cached_notebook_index(
+        auth, subscribed=subscribed, refresh=refresh_cache
+    )
 
-    auth = _get_auth(token)
-    console.print("\n[bold]📚 正在获取知识库列表...[/bold]\n")
 
-    try:
-        notebooks = fetch_notebooks(auth)
-    except Exception as e:
-        console.print(f"[red]✗[/red] 获取失败: {e}")
-        raise typer.Exit(1)
+# 知识库列表表格列定义：(列名, Column 参数)，"#" 列由 _make_list_cmd 统一添加
+_NOTEBOOK_COLUMNS = (
+    ("知识库名称", {"style": "cyan", "max_width": 30}),
+    ("内容数", {"justify": "right", "style": "green"}),
+    ("更新时间", {"style": "dim"}),
+    ("ID", {"style": "dim", "max_width": 12}),
+)
 
-    if not notebooks:
-        console.print("[dim]暂无知识库。[/dim]")
-        return
+_SUBSCRIBE_COLUMNS = (
+    ("知识库名称", {"style": "cyan", "max_width": 30}),
+    ("创建者", {"style": "yellow", "max_width": 12}),
+    ("内容数", {"justify": "right", "style": "green"}),
+    ("订阅数", {"justify": "right", "style": "magenta"}),
+    ("更新时间", {"style": "dim"}),
+    ("ID", {"style": "dim", "max_width": 12}),
+)
 
-    table = Table(title=f"我的知识库 （共 {len(notebooks)} 个）")
-    table.add_column("#", style="dim", width=4)
-    table.add_column("知识库名称", style="cyan", max_width=30)
-    table.add_column("内容数", justify="right", style="green")
-    table.add_column("更新时间", style="dim")
-    table.add_column("ID", style="dim", max_width=12)
-
-    for i, nb in enumerate(notebooks, 1):
-        name = nb.get("name", "(未命名)")
-        count = nb.get("extend_data", {}).get("all_resource_count", 0)
-        update_desc = nb.get("last_update_time_desc", "")
-        id_alias = nb.get("id_alias", "")
-        table.add_row(str(i), name, str(count), update_desc, id_alias)
 
-    console.print(table)
-    console.print("\n[dim]使用 `getnotes notebook download --name <名称>` 下载指定知识库[/dim]")
-    console.print("[dim]使用 `getnotes notebook download-all` 下载全部知识库[/dim]")
+def _notebook_row(nb: dict) -> tuple[str, ...]:
+    return (
+        nb.get("name", "(未命名)"),
+        str((nb.get("extend_data") or {}).get("all_resource_count", 0)),
+        nb.get("last_update_time_desc", ""),
+        nb.get("id_alias", ""),
+    )
 
 
-@notebook_app.command("download")
-def notebook_download(
-    name: Optional[str] = typer.Option(
-        None, "--name", "-n",
-        help="知识库名称（模糊匹配）",
-    ),
-    nb_id: Optional[str] = typer.Option(
-        None, "--id",
-        help="知识库 ID (id_alias)",
-    ),
-    output: Optional[str] = typer.Option(
-        None, "--output", "-o",
-        help="输出目录（可通过 config set 持久化）",
-    ),
-    delay: Optional[float] = typer.Option(
-        None, "--delay", "-d",
-        help="请求间隔秒数（可通过 config set 持久化）",
-    ),
-    force: bool = typer.Option(
-        False, "--force", "-f",
-        help="强制重新下载，忽略已有文件",
-    ),
-    save_json: bool = typer.Option(
-        False, "--save-json", "-j",
-        help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
-    ),
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📥 下载指定知识库的笔记"""
-    from getnotes_cli.notebook import fetch_notebooks
-    from getnotes_cli.notebook_downloader import NotebookDownloader
+def _subscribe_row(nb: dict) -> tuple[str, ...]:
+    extend = nb.get("extend_data") or {}
+    return (
+        nb.get("name", "(未命名)"),
+        nb.get("creator", ""),
+        str(extend.get("all_resource_count", 0)),
+        str(extend.get("subscribe_count", 0)),
+        nb.get("last_update_time_desc", ""),
+        nb.get("id_alias", ""),
+    )
 
-    if not name and not nb_id:
-        console.print("[red]✗[/red] 请指定 --name 或 --id")
-        console.print("[dim]使用 `getnotes notebook list` 查看可用知识库[/dim]")
-        raise typer.Exit(1)
 
-    auth = _get_auth(token)
+def _make_list_cmd(
+    subscribed: bool, label: str, emoji: str, group: str, title: str,
+    columns: tuple, row: Callable[[dict], tuple[str, ...]],
+) -> Callable[..., None]:
+    """构建 `<group> list` 命令；notebook / subscribe 仅在以上参数上不同"""
 
-    # 获取知识库列表并匹配
-    console.print("\n[bold]📚 正在获取知识库列表...[/bold]")
-    notebooks = fetch_notebooks(auth)
+    def list_cmd(
+        no_cache: bool = typer.Option(
+            False, "--no-cache",
+            help="不使用知识库列表缓存",
+        ),
+        refresh_cache: bool = typer.Option(
+            False, "--refresh-cache",
+            help="强制刷新知识库列表缓存",
+        ),
+        token: Optional[str] = typer.Option(
+            None, "--token", "-t",
+            help="直接传入 Bearer token",
+        ),
+    ) -> None:
+        from rich.table import Table
 
-    target = None
-    if nb_id:
-        target = next((nb for nb in notebooks if nb.get("id_alias") == nb_id), None)
-        if not target:
-            console.print(f"[red]✗[/red] 未找到 ID 为 '{nb_id}' 的知识库")
-            raise typer.Exit(1)
-    elif name:
-        # 模糊匹配
-        matches = [nb for nb in notebooks if name.lower() in nb.get("name", "").lower()]
-        if not matches:
-            console.print(f"[red]✗[/red] 未找到名称包含 '{name}' 的知识库")
-            console.print("[dim]可用知识库:[/dim]")
-            for nb in notebooks:
-                console.print(f"  - {nb.get('name', '')}")
+        auth = _get_auth(token)
+        console.print(f"\n[bold]{emoji} 正在获取{label}列表...[/bold]\n")
+
+        # 列表接口一次返回全部知识库（无分页可流式展示），请求期间显示进度动画
+        try:
+            with console.status(f"{emoji} 等待服务端响应..."):
+                notebooks = _fetch_notebook_list(
+                    auth, subscribed=subscribed, no_cache=no_cache, refresh_cache=refresh_cache
+                )
+        except Exception as e:
+            console.print(f"[red]✗[/red] 获取失败: {e}")
             raise typer.Exit(1)
-        if len(matches) > 1:
-            console.print(f"[yellow]⚠[/yellow] 找到 {len(matches)} 个匹配:")
-            for nb in matches:
-                console.print(f"  - {nb.get('name', '')} (ID: {nb.get('id_alias', '')})")
-            console.print("[dim]请使用 --id 精确指定[/dim]")
+
+        if not notebooks:
+            console.print(f"[dim]暂无{label}。[/dim]")
+            return
+
+        table = Table(title=f"{title} （共 {len(notebooks)} 个）")
+        table.add_column("#", style="dim", width=4)
+        for header, kwargs in columns:
+            table.add_column(header, **kwargs)
+
+        rows = [(str(i), *row(nb)) for i, nb in enumerate(notebooks, 1)]
+        for r in rows:
+            table.add_row(*r)
+
+        console.print(table)
+        console.print(f"\n[dim]使用 `getnotes {group} download --name <名称>` 下载指定{label}[/dim]")
+        console.print(f"[dim]使用 `getnotes {group} download-all` 下载全部{label}[/dim]")
+
+    return list_cmd
+
+
+def _describe_notebook(nb: dict, subscribed: bool) -> str:
+    """知识库展示名称，订阅知识库附带创建者"""
+    name = nb.get("name", "")
+    return f"{name} (by {nb.get('creator', '')})" if subscribed else name
+
+
+def _make_download_cmd(subscribed: bool, label: str, emoji: str, group: str) -> Callable[..., None]:
+    """构建 `<group> download` 命令"""
+    available = "已订阅知识库" if subscribed else "可用知识库"
+
+    def download_cmd(
+        name: Optional[str] = typer.Option(
+            None, "--name", "-n",
+            help="知识库名称（模糊匹配）",
+        ),
+        nb_id: Optional[str] = typer.Option(
+            None, "--id",
+            help="知识库 ID (id_alias)",
+        ),
+        output: Optional[str] = typer.Option(
+            None, "--output", "-o",
+            help="输出目录（可通过 config set 持久化）",
+        ),
+        delay: Optional[float] = typer.Option(
+            None, "--delay", "-d",
+            help="请求间隔秒数（可通过 config set 持久化）",
+        ),
+        rate: Optional[float] = typer.Option(
+            None, "--rate", "-r",
+            help="每秒请求数上限（指定后覆盖 --delay）",
+        ),
+        force: bool = typer.Option(
+            False, "--force", "-f",
+            help="强制重新下载，忽略已有文件",
+        ),
+        save_json: bool = typer.Option(
+            False, "--save-json", "-j",
+            help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
+        ),
+        no_cache: bool = typer.Option(
+            False, "--no-cache",
+            help="不使用知识库列表缓存",
+        ),
+        refresh_cache: bool = typer.Option(
+            False, "--refresh-cache",
+            help="强制刷新知识库列表缓存",
+        ),
+        token: Optional[str] = typer.Option(
+            None, "--token", "-t",
+            help="直接传入 Bearer token",
+        ),
+    ) -> None:
+        from getnotes_cli.notebook import lookup_notebook, match_notebooks
+        from getnotes_cli.notebook_downloader import NotebookDownloader
+
+        if not name and not nb_id:
+            console.print("[red]✗[/red] 请指定 --name 或 --id")
+            console.print(f"[dim]使用 `getnotes {group} list` 查看{available}[/dim]")
             raise typer.Exit(1)
-        target = matches[0]
 
-    console.print(f"[green]✓[/green] 目标知识库: {target.get('name', '')}")
+        auth = _get_auth(token)
 
-    downloader = NotebookDownloader(
-        token=auth,
-        output_dir=Path(resolve_output(output, str(DEFAULT_OUTPUT_DIR))),
-        delay=resolve_delay(delay, REQUEST_DELAY),
-        force=force,
-        save_json=save_json,
-    )
-    downloader.download_notebook(target)
+        # 获取知识库列表并匹配
+        console.print(f"\n[bold]{emoji} 正在获取{label}列表...[/bold]")
+        index = _fetch_notebook_index(
+            auth, subscribed=subscribed, no_cache=no_cache, refresh_cache=refresh_cache
+        )
+        notebooks = index["list"]
+
+        target = None
+        if nb_id:
+            target = lookup_notebook(index, nb_id)
+            if not target:
+                console.print(f"[red]✗[/red] 未找到 ID 为 '{nb_id}' 的{label}")
+                raise typer.Exit(1)
+        elif name:
+            # 模糊匹配
+            matches = match_notebooks(index, name)
+            if not matches:
+                console.print(f"[red]✗[/red] 未找到名称包含 '{name}' 的{label}")
+                console.print(f"[dim]{available}:[/dim]")
+                for nb in notebooks:
+                    console.print(f"  - {_describe_notebook(nb, subscribed)}")
+                raise typer.Exit(1)
+            if len(matches) > 1:
+                console.print(f"[yellow]⚠[/yellow] 找到 {len(matches)} 个匹配:")
+                for nb in matches:
+                    console.print(f"  - {nb.get('name', '')} (ID: {nb.get('id_alias', '')})")
+                console.print("[dim]请使用 --id 精确指定[/dim]")
+                raise typer.Exit(1)
+            target = matches[0]
+
+        console.print(f"[green]✓[/green] 目标{label}: {_describe_notebook(target, subscribed)}")
+
+        downloader = NotebookDownloader(
+            token=auth,
+            output_dir=resolve_output_dir(output),
+            delay=resolve_delay(delay, REQUEST_DELAY),
+            limiter=_make_limiter(delay, rate),
+            force=force,
+            save_json=save_json,
+        )
+        downloader.download_notebook(target)
 
+    return download_cmd
 
-@notebook_app.command("download-all")
-def notebook_download_all(
-    output: Optional[str] = typer.Option(
-        None, "--output", "-o",
-        help="输出目录（可通过 config set 持久化）",
-    ),
-    delay: Optional[float] = typer.Option(
-        None, "--delay", "-d",
-        help="请求间隔秒数（可通过 config set 持久化）",
-    ),
-    force: bool = typer.Option(
-        False, "--force", "-f",
-        help="强制重新下载",
-    ),
-    save_json: bool = typer.Option(
-        False, "--save-json", "-j",
-        help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
-    ),
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📥 下载所有知识库的笔记"""
-    from getnotes_cli.notebook import fetch_notebooks
-    from getnotes_cli.notebook_downloader import NotebookDownloader
 
-    auth = _get_auth(token)
+def _make_download_all_cmd(subscribed: bool, label: str, emoji: str) -> Callable[..., None]:
+    """构建 `<group> download-all` 命令"""
 
-    console.print("\n[bold]📚 正在获取知识库列表...[/bold]")
-    notebooks = fetch_notebooks(auth)
+    def download_all_cmd(
+        output: Optional[str] = typer.Option(
+            None, "--output", "-o",
+            help="输出目录（可通过 config set 持久化）",
+        ),
+        delay: Optional[float] = typer.Option(
+            None, "--delay", "-d",
+            help="请求间隔秒数（可通过 config set 持久化）",
+        ),
+        rate: Optional[float] = typer.Option(
+            None, "--rate", "-r",
+            help="每秒请求数上限（指定后覆盖 --delay）",
+        ),
+        force: bool = typer.Option(
+            False, "--force", "-f",
+            help="强制重新下载",
+        ),
+        save_json: bool = typer.Option(
+            False, "--save-json", "-j",
+            help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
+        ),
+        no_cache: bool = typer.Option(
+            False, "--no-cache",
+            help="不使用知识库列表缓存",
+        ),
+        refresh_cache: bool = typer.Option(
+            False, "--refresh-cache",
+            help="强制刷新知识库列表缓存",
+        ),
+        yes: bool = typer.Option(
+            False, "--yes", "-y",
+            help="跳过确认提示（非交互环境下必须指定）",
+        ),
+        token: Optional[str] = typer.Option(
+            None, "--token", "-t",
+            help="直接传入 Bearer token",
+        ),
+    ) -> None:
+        from getnotes_cli.notebook_downloader import NotebookDownloader
 
-    if not notebooks:
-        console.print("[dim]暂无知识库。[/dim]")
-        return
+        auth = _get_auth(token)
 
-    console.print(f"[green]✓[/green] 共找到 {len(notebooks)} 个知识库:\n")
-    for i, nb in enumerate(notebooks, 1):
-        name = nb.get("name", "(未命名)")
-        count = nb.get("extend_data", {}).get("all_resource_count", 0)
-        console.print(f"  {i}. {name} ({count} 个内容)")
+        console.print(f"\n[bold]{emoji} 正在获取{label}列表...[/bold]")
+        notebooks = _fetch_notebook_list(
+            auth, subscribed=subscribed, no_cache=no_cache, refresh_cache=refresh_cache
+        )
 
-    if not typer.confirm(f"\n确认下载全部 {len(notebooks)} 个知识库？"):
-        raise typer.Exit()
+        if not notebooks:
+            console.print(f"[dim]暂无{label}。[/dim]")
+            return
 
-    downloader = NotebookDownloader(
-        token=auth,
-        output_dir=Path(resolve_output(output, str(DEFAULT_OUTPUT_DIR))),
-        delay=resolve_delay(delay, REQUEST_DELAY),
-        force=force,
-        save_json=save_json,
-    )
-    downloader.download_all(notebooks)
+        if yes:
+            console.print(f"[green]✓[/green] 共找到 {len(notebooks)} 个{label}")
+        elif not sys.stdin.isatty():
+            console.print("[red]✗[/red] 非交互环境下请使用 --yes 确认下载")
+            raise typer.Exit(1)
+        else:
+            console.print(f"[green]✓[/green] 共找到 {len(notebooks)} 个{label}:\n")
+            for i, nb in enumerate(notebooks, 1):
+                name = nb.get("name", "(未命名)")
+                if subscribed:
+                    name = f"{name} by {nb.get('creator', '')}"
+                count = nb.get("extend_data", {}).get("all_resource_count", 0)
+                console.print(f"  {i}. {name} ({count} 个内容)")
+
+            if not typer.confirm(f"\n确认下载全部 {len(notebooks)} 个{label}？"):
+                raise typer.Exit()
+
+        downloader = NotebookDownloader(
+            token=auth,
+            output_dir=resolve_output_dir(output),
+            delay=resolve_delay(delay, REQUEST_DELAY),
+            limiter=_make_limiter(delay, rate),
+            force=force,
+            save_json=save_json,
+        )
+        downloader.download_all(notebooks)
+
+    return download_all_cmd
 
 
+notebook_app.command("list", help="📋 列出所有知识库")(
+    _make_list_cmd(False, "知识库", "📚", "notebook", "我的知识库", _NOTEBOOK_COLUMNS, _notebook_row)
+)
+notebook_app.command("download", help="📥 下载指定知识库的笔记")(
+    _make_download_cmd(False, "知识库", "📚", "notebook")
+)
+notebook_app.command("download-all", help="📥 下载所有知识库的笔记")(
+    _make_download_all_cmd(False, "知识库", "📚")
+)
+
 
 @notebook_app.command("add-note")
 def notebook_add_note(
@@ -633,7 +803,14 @@ def notebook_add_note(
     ),
 ) -> None:
     """➕ 将笔记加入知识库"""
-    from getnotes_cli.notebook import add_note_to_notebook, fetch_notebooks
+    from getnotes_cli.notebook import (
+        add_note_to_notebook,
+        fetch_notebooks,
+        index_notebooks,
+        invalidate_cached_notebooks,
+        lookup_notebook,
+        match_notebooks,
+    )
 
     if not name and not nb_id:
         console.print("[red]✗[/red] 请指定 --name 或 --id")
@@ -643,16 +820,16 @@ def notebook_add_note(
     auth = _get_auth(token)
 
     console.print("\n[bold]📚 正在获取知识库列表...[/bold]")
-    notebooks = fetch_notebooks(auth)
+    index = index_notebooks(fetch_notebooks(auth))
 
     target = None
     if nb_id:
-        target = next((nb for nb in notebooks if nb.get("id_alias") == nb_id), None)
+        target = lookup_notebook(index, nb_id)
         if not target:
             console.print(f"[red]✗[/red] 未找到 ID 为 \'{nb_id}\' 的知识库")
             raise typer.Exit(1)
     elif name:
-        matches = [nb for nb in notebooks if name.lower() in nb.get("name", "").lower()]
+        matches = match_notebooks(index, name)
         if not matches:
             console.print(f"[red]✗[/red] 未找到名称包含 \'{name}\' 的知识库")
             raise typer.Exit(1)
@@ -681,6 +858,8 @@ def notebook_add_note(
         result = add_note_to_notebook(auth, note_id, topic_id, directory_id)
         header = result.get("h", {})
         if header.get("c") == 0:
+            # 知识库内容数已变化，丢弃列表缓存
+            invalidate_cached_notebooks(auth)
             console.print(f"\n[green]✓[/green] 笔记 `{note_id}` 已成功加入知识库 [{nb_name}]！")
         else:
             console.print(f"[yellow]⚠[/yellow] API 返回: {result}")
@@ -701,187 +880,15 @@ subscribe_app = typer.Typer(
 )
 
 
-@subscribe_app.command("list")
-def subscribe_list(
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📋 列出所有已订阅的知识库"""
-    from getnotes_cli.notebook import fetch_subscribed_notebooks
-
-    auth = _get_auth(token)
-    console.print("\n[bold]📬 正在获取订阅知识库列表...[/bold]\n")
-
-    try:
-        notebooks = fetch_subscribed_notebooks(auth)
-    except Exception as e:
-        console.print(f"[red]✗[/red] 获取失败: {e}")
-        raise typer.Exit(1)
-
-    if not notebooks:
-        console.print("[dim]暂无订阅知识库。[/dim]")
-        return
-
-    table = Table(title=f"已订阅知识库 （共 {len(notebooks)} 个）")
-    table.add_column("#", style="dim", width=4)
-    table.add_column("知识库名称", style="cyan", max_width=30)
-    table.add_column("创建者", style="yellow", max_width=12)
-    table.add_column("内容数", justify="right", style="green")
-    table.add_column("订阅数", justify="right", style="magenta")
-    table.add_column("更新时间", style="dim")
-    table.add_column("ID", style="dim", max_width=12)
-
-    for i, nb in enumerate(notebooks, 1):
-        name = nb.get("name", "(未命名)")
-        creator = nb.get("creator", "")
-        extend = nb.get("extend_data", {})
-        count = extend.get("all_resource_count", 0)
-        sub_count = extend.get("subscribe_count", 0)
-        update_desc = nb.get("last_update_time_desc", "")
-        id_alias = nb.get("id_alias", "")
-        table.add_row(str(i), name, creator, str(count), str(sub_count), update_desc, id_alias)
-
-    console.print(table)
-    console.print("\n[dim]使用 `getnotes subscribe download --name <名称>` 下载指定订阅知识库[/dim]")
-    console.print("[dim]使用 `getnotes subscribe download-all` 下载全部订阅知识库[/dim]")
-
-
-@subscribe_app.command("download")
-def subscribe_download(
-    name: Optional[str] = typer.Option(
-        None, "--name", "-n",
-        help="知识库名称（模糊匹配）",
-    ),
-    nb_id: Optional[str] = typer.Option(
-        None, "--id",
-        help="知识库 ID (id_alias)",
-    ),
-    output: Optional[str] = typer.Option(
-        None, "--output", "-o",
-        help="输出目录（可通过 config set 持久化）",
-    ),
-    delay: Optional[float] = typer.Option(
-        None, "--delay", "-d",
-        help="请求间隔秒数（可通过 config set 持久化）",
-    ),
-    force: bool = typer.Option(
-        False, "--force", "-f",
-        help="强制重新下载，忽略已有文件",
-    ),
-    save_json: bool = typer.Option(
-        False, "--save-json", "-j",
-        help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
-    ),
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📥 下载指定订阅知识库的笔记"""
-    from getnotes_cli.notebook import fetch_subscribed_notebooks
-    from getnotes_cli.notebook_downloader import NotebookDownloader
-
-    if not name and not nb_id:
-        console.print("[red]✗[/red] 请指定 --name 或 --id")
-        console.print("[dim]使用 `getnotes subscribe list` 查看已订阅知识库[/dim]")
-        raise typer.Exit(1)
-
-    auth = _get_auth(token)
-
-    console.print("\n[bold]📬 正在获取订阅知识库列表...[/bold]")
-    notebooks = fetch_subscribed_notebooks(auth)
-
-    target = None
-    if nb_id:
-        target = next((nb for nb in notebooks if nb.get("id_alias") == nb_id), None)
-        if not target:
-            console.print(f"[red]✗[/red] 未找到 ID 为 '{nb_id}' 的订阅知识库")
-            raise typer.Exit(1)
-    elif name:
-        matches = [nb for nb in notebooks if name.lower() in nb.get("name", "").lower()]
-        if not matches:
-            console.print(f"[red]✗[/red] 未找到名称包含 '{name}' 的订阅知识库")
-            console.print("[dim]已订阅知识库:[/dim]")
-            for nb in notebooks:
-                console.print(f"  - {nb.get('name', '')} (by {nb.get('creator', '')})")
-            raise typer.Exit(1)
-        if len(matches) > 1:
-            console.print(f"[yellow]⚠[/yellow] 找到 {len(matches)} 个匹配:")
-            for nb in matches:
-                console.print(f"  - {nb.get('name', '')} (ID: {nb.get('id_alias', '')})")
-            console.print("[dim]请使用 --id 精确指定[/dim]")
-            raise typer.Exit(1)
-        target = matches[0]
-
-    console.print(f"[green]✓[/green] 目标订阅知识库: {target.get('name', '')} (by {target.get('creator', '')})")
-
-    downloader = NotebookDownloader(
-        token=auth,
-        output_dir=Path(resolve_output(output, str(DEFAULT_OUTPUT_DIR))),
-        delay=resolve_delay(delay, REQUEST_DELAY),
-        force=force,
-        save_json=save_json,
-    )
-    downloader.download_notebook(target)
-
-
-@subscribe_app.command("download-all")
-def subscribe_download_all(
-    output: Optional[str] = typer.Option(
-        None, "--output", "-o",
-        help="输出目录（可通过 config set 持久化）",
-    ),
-    delay: Optional[float] = typer.Option(
-        None, "--delay", "-d",
-        help="请求间隔秒数（可通过 config set 持久化）",
-    ),
-    force: bool = typer.Option(
-        False, "--force", "-f",
-        help="强制重新下载",
-    ),
-    save_json: bool = typer.Option(
-        False, "--save-json", "-j",
-        help="保存原始 JSON 数据等技术文件（默认仅保存 Markdown 和附件）",
-    ),
-    token: Optional[str] = typer.Option(
-        None, "--token", "-t",
-        help="直接传入 Bearer token",
-    ),
-) -> None:
-    """📥 下载所有订阅知识库的笔记"""
-    from getnotes_cli.notebook import fetch_subscribed_notebooks
-    from getnotes_cli.notebook_downloader import NotebookDownloader
-
-    auth = _get_auth(token)
-
-    console.print("\n[bold]📬 正在获取订阅知识库列表...[/bold]")
-    notebooks = fetch_subscribed_notebooks(auth)
-
-    if not notebooks:
-        console.print("[dim]暂无订阅知识库。[/dim]")
-        return
-
-    console.print(f"[green]✓[/green] 共找到 {len(notebooks)} 个订阅知识库:\n")
-    for i, nb in enumerate(notebooks, 1):
-        name = nb.get("name", "(未命名)")
-        creator = nb.get("creator", "")
-        count = nb.get("extend_data", {}).get("all_resource_count", 0)
-        console.print(f"  {i}. {name} by {creator} ({count} 个内容)")
-
-    if not typer.confirm(f"\n确认下载全部 {len(notebooks)} 个订阅知识库？"):
-        raise typer.Exit()
-
-    downloader = NotebookDownloader(
-        token=auth,
-        output_dir=Path(resolve_output(output, str(DEFAULT_OUTPUT_DIR))),
-        delay=resolve_delay(delay, REQUEST_DELAY),
-        force=force,
-        save_json=save_json,
-    )
-    downloader.download_all(notebooks)
-
+subscribe_app.command("list", help="📋 列出所有已订阅的知识库")(
+    _make_list_cmd(True, "订阅知识库", "📬", "subscribe", "已订阅知识库", _SUBSCRIBE_COLUMNS, _subscribe_row)
+)
+subscribe_app.command("download", help="📥 下载指定订阅知识库的笔记")(
+    _make_download_cmd(True, "订阅知识库", "📬", "subscribe")
+)
+subscribe_app.command("download-all", help="📥 下载所有订阅知识库的笔记")(
+    _make_download_all_cmd(True, "订阅知识库", "📬")
+)
 
 app.add_typer(subscribe_app, name="subscribe")
 
@@ -930,6 +937,7 @@ def config_get(
     ),
 ) -> None:
     """📋 查看配置"""
+    from rich.table import Table
     from getnotes_cli.settings import UserSettings, CONFIG_FILE
 
     settings = UserSettings()
@@ -1034,6 +1042,10 @@ def export(
         False, "--force", "-f",
         help="强制重新转换，忽略已有输出文件",
     ),
+    hardlink: bool = typer.Option(
+        False, "--hardlink-attachments",
+        help="HTML 导出时以硬链接代替复制附件（同一文件系统下不占额外空间）",
+    ),
 ) -> None:
     """🌐 导出笔记 — 将本地 Markdown 笔记批量转换为 HTML 或 PDF 格式"""
     fmt_lower = fmt.lower()
@@ -1057,7 +1069,7 @@ def export(
     if source:
         source_path = Path(source).expanduser().resolve()
     else:
-        source_path = Path(resolve_output(None, str(DEFAULT_OUTPUT_DIR))).resolve()
+        source_path = resolve_output_dir(None).resolve()
 
     # 情形 1：source 是单个 .md 文件
     if source_path.is_file() and source_path.suffix == ".md":
@@ -1122,7 +1134,7 @@ def export(
         if is_pdf:
             stats = export_notes_to_pdf(notes_dir, output_dir, force=force)
         else:
-            stats = export_notes_to_html(notes_dir, output_dir, force=force)
+            stats = export_notes_to_html(notes_dir, output_dir, force=force, hardlink=hardlink)
     except ImportError as e:
         console.print(f"[red]✗[/red] 缺少依赖: {e}")
         console.print("[dim]请运行: pip install reportlab[/dim]")
@@ -1153,6 +1165,7 @@ def sync_check(
 ) -> None:
     """🔄 同步检测 — 对比本地缓存与服务端，查看有多少新笔记待下载"""
     import httpx as _httpx
+    from getnotes_cli import _json
     from getnotes_cli.cache import CacheManager
     from getnotes_cli.config import NOTES_API_URL
 
@@ -1169,7 +1182,7 @@ def sync_check(
             console.print("[red]✗[/red] Token 已过期，请重新运行 `getnotes login`")
             raise typer.Exit(1)
         resp.raise_for_status()
-        data = resp.json()
+        data = _json.loads(resp.content)
         server_total = data.get("c", {}).get("total_items", None)
     except Exception as e:
         console.print(f"[red]✗[/red] 无法获取服务端数据: {e}")
@@ -1178,7 +1191,7 @@ def sync_check(
         client.close()
 
     # 查询本地缓存数
-    output_dir = Path(resolve_output(None, str(DEFAULT_OUTPUT_DIR)))
+    output_dir = resolve_output_dir(None)
     cache = CacheManager(output_dir)
     cache_info = cache.check()
     local_count = cache_info["count"]
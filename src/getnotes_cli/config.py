@@ -1,6 +1,8 @@
 """配置与常量"""
 
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 # ========================================================================
 # API 配置
@@ -42,8 +44,8 @@ API_DOMAINS = [
     "knowledge-api.trytalks.com",
 ]
 
-# 默认请求 headers
-DEFAULT_HEADERS = {
+# 默认请求 headers（只读，请求时以 ChainMap 叠加认证 headers）
+DEFAULT_HEADERS = MappingProxyType({
     "Accept": "application/json, text/plain, */*",
     "Accept-Language": "zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7",
     "Content-Type": "application/json",
@@ -54,7 +56,7 @@ DEFAULT_HEADERS = {
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/145.0.0.0 Safari/537.36"
     ),
-}
+})
 
 # ========================================================================
 # 路径配置
@@ -69,8 +71,22 @@ AUTH_CACHE_FILE = CONFIG_DIR / "auth.json"
 # Chrome profile 目录（CDP 用）
 CHROME_PROFILE_DIR = CONFIG_DIR / "chrome-profile"
 
-# 默认下载目录
-DEFAULT_OUTPUT_DIR = Path.home() / "Downloads" / "getnotes_export"
+# 接口响应缓存目录（知识库列表等变化缓慢的数据）
+API_CACHE_DIR = CONFIG_DIR / "api_cache"
+
+
+@lru_cache(maxsize=None)
+def get_default_output_dir() -> Path:
+    """默认下载目录（首次使用时计算，传入 --output 时不会用到）"""
+    return Path.home() / "Downloads" / "getnotes_export"
+
+
+def __getattr__(name: str) -> Path:
+    # 兼容旧的 DEFAULT_OUTPUT_DIR 常量
+    if name == "DEFAULT_OUTPUT_DIR":
+        return get_default_output_dir()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # ========================================================================
 # 下载配置
@@ -82,8 +98,17 @@ PAGE_SIZE = 20
 # 请求间隔（秒）
 REQUEST_DELAY = 0.5
 
+# 附件下载的读取块大小与写入缓冲区大小（字节）
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# 批量下载知识库时同时处理的知识库数量
+NOTEBOOK_CONCURRENCY = 4
+
 # 默认下载数量限制
 DEFAULT_LIMIT = 100
 
+# 知识库列表缓存有效期（秒）
+API_CACHE_TTL = 60
+
 # 缓存清单文件名
 CACHE_MANIFEST_FILE = "cache_manifest.json"
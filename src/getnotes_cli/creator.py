@@ -1,37 +1,79 @@
 """笔记创建模块 — 处理图片上传与笔记发布"""
 
-import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-import requests
 from requests_toolbelt.multipart.encoder import MultipartEncoder
 
+from getnotes_cli import _json
+from getnotes_cli._http import SESSION
 from getnotes_cli.auth import AuthToken
 from getnotes_cli.config import IMAGE_TOKEN_API_URL, NOTE_CREATE_API_URL, LINK_NOTE_CREATE_API_URL
 
+# 多图笔记并发上传的线程数
+UPLOAD_WORKERS = 4
+
+# 上传凭证未声明过期时间时的保守有效期（秒）
+IMAGE_TOKEN_TTL = 60
+
+
+def _token_ttl(token_info: dict[str, Any]) -> float:
+    """根据凭证自带的过期时间（秒或毫秒级时间戳）计算剩余有效期"""
+    expire = token_info.get("expire") or token_info.get("expire_time")
+    try:
+        expire = float(expire)
+    except (TypeError, ValueError):
+        return IMAGE_TOKEN_TTL
+    if expire > 1e12:  # 毫秒时间戳
+        expire /= 1000
+    return max(0.0, expire - time.time())
+
+
 class NoteCreator:
     """笔记创建器，处理图片上传和笔记创建"""
 
     def __init__(self, token: AuthToken):
         self.token = token
         self.headers = token.get_headers()
+        # 复用进程级连接池：凭证请求、OSS 上传与创建请求无需各自握手
+        self.session = SESSION
+        # ext → (过期时刻 monotonic, 未使用的凭证列表)；每条凭证的 object_key 唯一，只发放一次
+        self._token_pool: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._token_lock = threading.Lock()
 
     def _get_image_token(self, ext: str) -> dict[str, Any]:
-        """获取阿里云 OSS 上传凭证"""
+        """获取阿里云 OSS 上传凭证（优先使用上次请求返回的剩余凭证）"""
+        with self._token_lock:
+            expires_at, pool = self._token_pool.get(ext, (0.0, []))
+            if pool and expires_at > time.monotonic() + 5:
+                return pool.pop(0)
+
+        credentials = self._fetch_image_tokens(ext)
+        with self._token_lock:
+            self._token_pool[ext] = (
+                time.monotonic() + _token_ttl(credentials[0]),
+                credentials[1:],
+            )
+        return credentials[0]
+
+    def _fetch_image_tokens(self, ext: str) -> list[dict[str, Any]]:
+        """请求阿里云 OSS 上传凭证列表"""
         payload = {"source": "web", "type": ext.lstrip(".")}
-        resp = requests.post(
+        resp = self.session.post(
             IMAGE_TOKEN_API_URL,
             headers=self.headers,
-            json=payload,
+            data=_json.dumps(payload),
             timeout=10,
         )
         resp.raise_for_status()
-        data = resp.json()
-        if data.get("h", {}).get("c") != 0:
+        data = _json.loads(resp.content)
+        credentials = data.get("c") or []
+        if data.get("h", {}).get("c") != 0 or not credentials:
             raise RuntimeError(f"获取上传凭证失败: {data}")
-        # 返回第一条凭证
-        return data.get("c", [])[0]
+        return credentials
 
     def upload_image(self, image_path: Path) -> dict[str, Any]:
         """上传图片到阿里云 OSS，返回图片信息（包含 access_url）"""
@@ -45,42 +87,44 @@ class NoteCreator:
         # 1. 获取上传凭证
         token_info = self._get_image_token(ext)
         
-        # 2. 组装表单数据
+        # 2. 组装表单数据并上传到 OSS
         # 阿里云 OSS 要求表单字段顺序：前面的参数，最后是 file
-        fields = {
-            "OSSAccessKeyId": token_info["accessid"],
-            "policy": token_info["policy"],
-            "Signature": token_info["signature"],
-            "key": token_info["object_key"],
-            "callback": token_info["callback"],
-            "success_action_status": "201",
-            "file": (image_path.name, open(image_path, "rb"), token_info.get("oss_content_type", f"image/{ext.lstrip('.')}")),
-        }
+        # MultipartEncoder 边读边发，文件在上传结束后关闭
+        content_type = token_info.get("oss_content_type", f"image/{ext.lstrip('.')}")
+        with image_path.open("rb") as fh:
+            fields = {
+                "OSSAccessKeyId": token_info["accessid"],
+                "policy": token_info["policy"],
+                "Signature": token_info["signature"],
+                "key": token_info["object_key"],
+                "callback": token_info["callback"],
+                "success_action_status": "201",
+                "file": (image_path.name, fh, content_type),
+            }
 
-        encoder = MultipartEncoder(fields=fields)
-        upload_headers = {
-            "Accept": "application/json, text/plain, */*",
-            "Content-Type": encoder.content_type,
-            "User-Agent": self.headers.get("User-Agent", ""),
-            "Origin": self.headers.get("Origin", ""),
-            "Referer": self.headers.get("Referer", ""),
-        }
+            encoder = MultipartEncoder(fields=fields)
+            upload_headers = {
+                "Accept": "application/json, text/plain, */*",
+                "Content-Type": encoder.content_type,
+                "User-Agent": self.headers.get("User-Agent", ""),
+                "Origin": self.headers.get("Origin", ""),
+                "Referer": self.headers.get("Referer", ""),
+            }
 
-        # 3. 上传到 OSS
-        resp = requests.post(
-            token_info["host"],
-            headers=upload_headers,
-            data=encoder,
-            timeout=30,
-        )
+            resp = self.session.post(
+                token_info["host"],
+                headers=upload_headers,
+                data=encoder,
+                timeout=30,
+            )
         resp.raise_for_status()
         
         # 得到笔记的 callback 返回的是 json
         try:
-            callback_data = resp.json()
+            callback_data = _json.loads(resp.content)
             if callback_data.get("h", {}).get("c") != 0:
                  raise RuntimeError(f"图片上传回调失败: {callback_data}")
-        except json.JSONDecodeError:
+        except _json.JSONDecodeError:
              pass # 有时不会返回标准 json
 
         return token_info
@@ -133,17 +177,19 @@ class NoteCreator:
             "type": "doc",
             "content": content_nodes
         }
-        return json.dumps(json_content, ensure_ascii=False)
+        return _json.dumps(json_content).decode("utf-8")
 
     def create_note(self, text: str, image_paths: list[Path] = None) -> dict[str, Any]:
         """创建笔记"""
         image_paths = image_paths or []
-        uploaded_images = []
         
-        # 1. 上传所有图片
-        for img_path in image_paths:
-            img_info = self.upload_image(img_path)
-            uploaded_images.append(img_info)
+        # 1. 上传所有图片（多张时并发上传，结果保持原顺序）
+        if len(image_paths) > 1:
+            workers = min(UPLOAD_WORKERS, len(image_paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                uploaded_images = list(executor.map(self.upload_image, image_paths))
+        else:
+            uploaded_images = [self.upload_image(p) for p in image_paths]
 
         # 2. 组装纯文本 content（末尾添加图片 markdown 语法）
         content = text
@@ -164,14 +210,14 @@ class NoteCreator:
             "tags": []
         }
 
-        resp = requests.post(
+        resp = self.session.post(
             NOTE_CREATE_API_URL,
             headers=self.headers,
-            json=payload,
+            data=_json.dumps(payload),
             timeout=10,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json.loads(resp.content)
         if data.get("h", {}).get("c") != 0:
             raise RuntimeError(f"创建笔记失败: {data}")
             
@@ -199,10 +245,10 @@ class NoteCreator:
             "prompt_template_id": ""
         }
 
-        resp = requests.post(
+        resp = self.session.post(
             LINK_NOTE_CREATE_API_URL,
             headers=self.headers,
-            json=payload,
+            data=_json.dumps(payload),
             stream=True,
             timeout=60,
         )
@@ -213,7 +259,7 @@ class NoteCreator:
                 decoded_line = line.decode("utf-8")
                 if decoded_line.startswith("data: "):
                     try:
-                        data = json.loads(decoded_line[6:])
+                        data = _json.loads(decoded_line[6:])
                         yield data
-                    except json.JSONDecodeError:
+                    except _json.JSONDecodeError:
                         pass
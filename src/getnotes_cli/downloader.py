@@ -1,25 +1,37 @@
 """核心下载逻辑 — 分页拉取笔记并下载附件"""
 
-import json
 import logging
 import os
+import shutil
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 import httpx
 
+from getnotes_cli import _json
+from getnotes_cli._fs import ensure_dir
+from getnotes_cli._http import shared_client
 from getnotes_cli.auth import AuthToken
 from getnotes_cli.cache import CacheManager
-from getnotes_cli.config import NOTES_API_URL, PAGE_SIZE, REQUEST_DELAY
+from getnotes_cli.config import DOWNLOAD_CHUNK_SIZE, NOTES_API_URL, PAGE_SIZE, REQUEST_DELAY
 from getnotes_cli.markdown import (
+    format_date_prefix,
     get_file_extension,
-    note_to_markdown,
     sanitize_filename,
+    write_note_markdown,
 )
 
 logger = logging.getLogger(__name__)
 
+# 单条笔记多个附件并发下载的线程数
+ATTACHMENT_WORKERS = 8
+
+# 并发处理笔记（下载附件、写文件）的线程数；翻页请求在主线程中与之重叠
+NOTE_WORKERS = 4
+
 
 class NoteDownloader:
     """笔记下载器"""
@@ -43,10 +55,21 @@ class NoteDownloader:
         self.force = force
         self.save_json = save_json
 
-        self.client = httpx.Client(timeout=60)
+        # 共享连接池：翻页请求与并发附件下载复用 keep-alive 连接
+        self.client = shared_client()
         self.cache = CacheManager(output_dir)
         self.stats = {"new": 0, "updated": 0, "cached": 0}
         self.total_processed = 0
+        # 保护 stats / cache / 笔记文件夹分配（多个笔记并发处理）
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        # 本次运行中已创建的目录，避免每个附件重复 mkdir
+        self._created_dirs: set[Path] = set()
+        # 本次运行中 URL → 已落盘文件；同一 CDN 资源出现在多条笔记中时复制本地文件，不再重复下载。
+        # 复制而非硬链接：各笔记的附件相互独立，修改其中一份不影响其它笔记
+        self._url_files: dict[str, Path] = {}
+        # 附件在多个线程中并发下载，保护 self._url_files
+        self._url_lock = threading.Lock()
 
     def run(self) -> dict:
         """执行下载流程，返回统计结果"""
@@ -70,18 +93,33 @@ class NoteDownloader:
         page_num = 0
         total_items = None
 
+        # 生产者/消费者：主线程翻页并提交笔记，线程池处理笔记；
+        # 信号量限制已提交未完成的笔记数，避免翻页远远跑在处理前面
+        executor = ThreadPoolExecutor(max_workers=NOTE_WORKERS)
+        in_flight = threading.BoundedSemaphore(self.page_size * 2)
+
+        def _on_done(future: Future) -> None:
+            in_flight.release()
+            # 出错或中断时 shutdown(cancel_futures=True) 会取消排队中的笔记，
+            # 对已取消的 future 调用 exception() 会抛出 CancelledError
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None and self._error is None:
+                self._error = error
+
         try:
             while True:
                 page_num += 1
                 logger.info("📄 正在拉取第 %d 页 (since_id=%s) ...",
                             page_num, since_id or "(首页)")
 
-                data = self._fetch_page(since_id)
+                data, raw = self._fetch_page(since_id)
 
-                # 保存 API 响应
+                # 保存 API 响应（原样写入响应体，不再重新序列化）
                 if self.save_json:
                     resp_path = self.output_dir / "api_responses" / f"page_{page_num:04d}.json"
-                    resp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+                    resp_path.write_bytes(raw)
 
                 content = data.get("c", {})
                 notes = content.get("list", [])
@@ -98,12 +136,12 @@ class NoteDownloader:
                 logger.info("  本页 %d 条笔记:", len(notes))
 
                 for note in notes:
-                    self._process_note(note)
+                    in_flight.acquire()
+                    if self._error is not None:
+                        raise self._error
                     self.total_processed += 1
-
-                    # 定期保存缓存
-                    if self.total_processed % 50 == 0:
-                        self.cache.save()
+                    future = executor.submit(self._process_note, note, self.total_processed)
+                    future.add_done_callback(_on_done)
 
                     # 检查限制
                     if self.limit is not None and self.total_processed >= self.limit:
@@ -121,6 +159,10 @@ class NoteDownloader:
                 since_id = notes[-1].get("id", "")
                 time.sleep(self.delay)
 
+            executor.shutdown(wait=True)
+            if self._error is not None:
+                raise self._error
+
         except KeyboardInterrupt:
             logger.info("⚠️  用户中断下载。")
         except httpx.HTTPStatusError as e:
@@ -134,7 +176,9 @@ class NoteDownloader:
             logger.error("❌ 意外错误: %s", e)
             raise
         finally:
-            self.cache.save()
+            executor.shutdown(wait=True, cancel_futures=True)
+            # 处理过程中每条更新已追加到增量日志，这里合并为快照
+            self.cache.compact()
 
         # 生成索引
         self._generate_index(total_items)
@@ -142,8 +186,8 @@ class NoteDownloader:
 
         return self.stats
 
-    def _fetch_page(self, since_id: str = "") -> dict:
-        """拉取一页笔记"""
+    def _fetch_page(self, since_id: str = "") -> tuple[dict, bytes]:
+        """拉取一页笔记，返回 (解析结果, 原始响应体)"""
         params = {
             "limit": self.page_size,
             "since_id": since_id,
@@ -152,87 +196,97 @@ class NoteDownloader:
         headers = self.token.get_headers()
         resp = self.client.get(NOTES_API_URL, headers=headers, params=params, timeout=30)
         resp.raise_for_status()
-        return resp.json()
+        raw = resp.content
+        return _json.loads(raw), raw
 
-    def _process_note(self, note: dict) -> str:
-        """处理单条笔记"""
-        note_id = note.get("note_id", note.get("id", "unknown"))
-        title = note.get("title", "").strip()
+    def _process_note(self, note: dict, index: int | None = None) -> str:
+        """处理单条笔记（可在工作线程中并发调用）"""
+        note_id = note.get("note_id") or note.get("id") or "unknown"
 
-        # 缓存检查
+        # 缓存命中是重复运行时的常见路径：只做字典查找，不构造路径/文件夹名
         if not self.force and self.cache.is_cached(note):
-            self._print_status(note_id, title, "⏭ 缓存")
-            self.stats["cached"] += 1
+            with self._lock:
+                self.stats["cached"] += 1
+            if logger.isEnabledFor(logging.INFO):
+                self._print_status(note_id, note.get("title", "").strip(), "⏭ 缓存", index)
             return "cached"
 
-        is_update = self.cache.get(note_id) is not None
-
-        # 生成文件夹名
+        title = note.get("title", "").strip()
+        # 生成文件夹名（加锁：同名笔记并发时先到者占用原名，后到者追加 ID 后缀）
         folder_name = self._make_folder_name(note)
-        if is_update:
+        with self._lock:
             cached = self.cache.get(note_id)
-            if cached and "folder_name" in cached:
+            is_update = cached is not None
+            if is_update and "folder_name" in cached:
                 folder_name = cached["folder_name"]
 
-        note_dir = self.output_dir / "notes" / folder_name
-        if not is_update and note_dir.exists():
-            note_dir = self.output_dir / "notes" / f"{folder_name}_{note_id[-6:]}"
-            folder_name = f"{folder_name}_{note_id[-6:]}"
+            note_dir = self.output_dir / "notes" / folder_name
+            if not is_update and note_dir.exists():
+                note_dir = self.output_dir / "notes" / f"{folder_name}_{note_id[-6:]}"
+                folder_name = f"{folder_name}_{note_id[-6:]}"
 
-        note_dir.mkdir(parents=True, exist_ok=True)
+            note_dir.mkdir(parents=True, exist_ok=True)
         attachments_dir = note_dir / "attachments"
 
         # 下载附件
         has_attachments = self._download_attachments(note, attachments_dir)
 
         # 生成 Markdown
-        md_content = note_to_markdown(note, attachments_dir, note_dir)
-        (note_dir / "note.md").write_text(md_content, encoding="utf-8")
+        with open(note_dir / "note.md", "w", encoding="utf-8", newline="") as f:
+            write_note_markdown(note, attachments_dir, note_dir, f)
 
         # 保存 JSON（save-json 模式）
         if self.save_json:
-            (note_dir / "note.json").write_text(
-                json.dumps(note, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            (note_dir / "note.json").write_bytes(_json.dumps(note, indent=True))
 
         # 更新缓存
-        self.cache.update(note_id, {
-            "version": note.get("version"),
-            "updated_at": note.get("updated_at", ""),
-            "folder_name": folder_name,
-            "title": title,
-            "created_at": note.get("created_at", ""),
-        })
+        with self._lock:
+            self.cache.update(note_id, {
+                "version": note.get("version"),
+                "updated_at": note.get("updated_at", ""),
+                "folder_name": folder_name,
+                "title": title,
+                "created_at": note.get("created_at", ""),
+            })
+            self.stats["updated" if is_update else "new"] += 1
 
         action = "🔄 更新" if is_update else "✨ 新增"
         extra = " 📎" if has_attachments else ""
-        self._print_status(note_id, title, f"{action}{extra}")
-        self.stats["updated" if is_update else "new"] += 1
+        self._print_status(note_id, title, f"{action}{extra}", index)
         return "updated" if is_update else "new"
 
     def _download_attachments(self, note: dict, attachments_dir: Path) -> bool:
         """下载笔记的附件（音频/图片），返回是否有附件"""
-        has = False
+        tasks: list[tuple[str, Path]] = []
 
         # 音频附件
         for i, att in enumerate(note.get("attachments", [])):
             att_url = att.get("url", "")
             att_type = att.get("type", "")
             if att_url and att_type != "link":
-                has = True
                 ext = get_file_extension(att_url, f".{att_type or 'bin'}")
-                self._download_file(att_url, attachments_dir / f"attachment_{i + 1}{ext}")
+                tasks.append((att_url, attachments_dir / f"attachment_{i + 1}{ext}"))
 
         # 图片
         images = note.get("original_images", []) or note.get("small_images", []) or note.get("body_images", [])
         for i, img in enumerate(images):
             img_url = img if isinstance(img, str) else img.get("url", "") if isinstance(img, dict) else ""
             if img_url:
-                has = True
                 ext = get_file_extension(img_url, ".jpg")
-                self._download_file(img_url, attachments_dir / f"image_{i + 1}{ext}")
+                tasks.append((img_url, attachments_dir / f"image_{i + 1}{ext}"))
+
+        # 多个附件时并发下载（各自写入不同文件，httpx.Client 线程安全）
+        if len(tasks) > 1:
+            workers = min(ATTACHMENT_WORKERS, len(tasks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(self._download_file, url, path) for url, path in tasks]
+                for future in as_completed(futures):
+                    future.result()
+        else:
+            for url, path in tasks:
+                self._download_file(url, path)
 
-        return has
+        return bool(tasks)
 
     def _download_file(self, url: str, save_path: Path) -> bool:
         """下载文件，已存在则跳过"""
@@ -240,15 +294,32 @@ class NoteDownloader:
             if save_path.exists() and not self.force:
                 kb = save_path.stat().st_size / 1024
                 logger.info("    ⏭  已存在: %s (%.1f KB)", save_path.name, kb)
+                with self._url_lock:
+                    self._url_files.setdefault(url, save_path)
                 return True
 
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.client.stream("GET", url, timeout=60) as resp:
-                resp.raise_for_status()
-                with open(save_path, "wb") as f:
-                    for chunk in resp.iter_bytes(8192):
-                        f.write(chunk)
+            ensure_dir(save_path.parent, self._created_dirs)
+            with self._url_lock:
+                existing = self._url_files.get(url)
+            if existing is not None and existing != save_path and existing.exists():
+                shutil.copy2(existing, save_path)
+                logger.info("    📋 已复用: %s", save_path.name)
+                return True
 
+            # 先写入 .part 再原子替换，中断的下载不会被下次当作已存在而跳过
+            part_path = save_path.with_name(save_path.name + ".part")
+            try:
+                with self.client.stream("GET", url, timeout=60) as resp:
+                    resp.raise_for_status()
+                    with open(part_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                        for chunk in resp.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                os.replace(part_path, save_path)
+            finally:
+                part_path.unlink(missing_ok=True)
+
+            with self._url_lock:
+                self._url_files[url] = save_path
             kb = save_path.stat().st_size / 1024
             logger.info("    ✅ 已下载: %s (%.1f KB)", save_path.name, kb)
             return True
@@ -262,19 +333,15 @@ class NoteDownloader:
         title = note.get("title", "").strip()
         created_at = note.get("created_at", "")
 
-        date_prefix = ""
-        if created_at:
-            try:
-                dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-                date_prefix = dt.strftime("%Y%m%d_%H%M%S")
-            except ValueError:
-                date_prefix = created_at.replace(" ", "_").replace(":", "")
+        date_prefix = format_date_prefix(created_at) if created_at else ""
 
         return sanitize_filename(f"{date_prefix}_{title}" if title else f"{date_prefix}_{note_id}")
 
-    def _print_status(self, note_id: str, title: str, action: str) -> None:
+    def _print_status(
+        self, note_id: str, title: str, action: str, index: int | None = None
+    ) -> None:
         """打印笔记处理状态"""
-        parts = [f"#{self.total_processed + 1}", f"ID:{note_id[-8:]}"]
+        parts = [f"#{index or self.total_processed + 1}", f"ID:{note_id[-8:]}"]
         if title:
             display = title[:40] + "..." if len(title) > 40 else title
             parts.append(display)
@@ -315,53 +382,48 @@ class NoteDownloader:
         """生成索引文件（优先使用缓存清单，无需依赖 note.json）"""
         index_path = self.output_dir / "INDEX.md"
 
-        # 建立 folder_name → (note_id, title, created_at) 的映射（来自缓存）
-        cache_by_folder: dict[str, dict] = {}
-        for nid, info in self.cache.manifest.items():
-            fn = info.get("folder_name", "")
-            if fn:
-                cache_by_folder[fn] = {
-                    "note_id": nid,
-                    "title": info.get("title", "(无标题)"),
-                    "created_at": info.get("created_at", ""),
-                }
-
-        with open(index_path, "w", encoding="utf-8") as f:
-            f.write("# Get笔记 导出索引\n\n")
-            f.write(f"- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"- 处理笔记数: {self.total_processed}\n")
-            f.write(f"- 服务端总数: {total_items}\n")
-            f.write(f"- 新增: {self.stats['new']} | 更新: {self.stats['updated']} | 缓存跳过: {self.stats['cached']}\n\n")
-            f.write("## 笔记列表\n\n")
-            f.write("| # | 标题 | 创建时间 | 文件夹 |\n")
-            f.write("|---|------|----------|--------|\n")
-
-            notes_dir = self.output_dir / "notes"
-            if notes_dir.exists():
-                folders = sorted(
-                    (d for d in notes_dir.iterdir() if d.is_dir()),
+        # folder_name → (note_id, 缓存条目)，已缓存的笔记无需读取 note.json
+        cache_by_folder = self.cache.by_folder()
+
+        lines = [
+            "# Get笔记 导出索引\n\n",
+            f"- 导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"- 处理笔记数: {self.total_processed}\n",
+            f"- 服务端总数: {total_items}\n",
+            f"- 新增: {self.stats['new']} | 更新: {self.stats['updated']} | 缓存跳过: {self.stats['cached']}\n\n",
+            "## 笔记列表\n\n",
+            "| # | 标题 | 创建时间 | 文件夹 |\n",
+            "|---|------|----------|--------|\n",
+        ]
+
+        notes_dir = self.output_dir / "notes"
+        if notes_dir.exists():
+            # scandir 的 DirEntry 自带文件类型，无需逐个 stat
+            with os.scandir(notes_dir) as it:
+                names = sorted(
+                    (e.name for e in it if e.is_dir()),
                     reverse=True,  # 时间降序
                 )
-                for i, folder in enumerate(folders, 1):
-                    md_file = folder / "note.md"
-                    if not md_file.exists():
-                        continue
-                    cache_info = cache_by_folder.get(folder.name)
-                    if cache_info:
-                        nid = cache_info["note_id"]
-                        title = cache_info["title"] or "(无标题)"
-                        created = cache_info["created_at"][:10] if cache_info["created_at"] else ""
-                    else:
-                        # 回退：尝试读 note.json
-                        json_file = folder / "note.json"
-                        if json_file.exists():
-                            try:
-                                nd = json.loads(json_file.read_text(encoding="utf-8"))
-                                nid = nd.get("note_id", "")
-                                title = nd.get("title", "(无标题)")
-                                created = nd.get("created_at", "")[:10]
-                            except Exception:
-                                nid, title, created = "", folder.name, ""
-                        else:
-                            nid, title, created = "", folder.name, ""
-                    f.write(f"| {i} | [{title}](notes/{folder.name}/note.md) | {created} | `{folder.name}` |\n")
+            folders = [notes_dir / name for name in names]
+            for i, folder in enumerate(folders, 1):
+                md_file = folder / "note.md"
+                if not md_file.exists():
+                    continue
+                cached = cache_by_folder.get(folder.name)
+                if cached:
+                    nid, info = cached
+                    title = info.get("title") or "(无标题)"
+                    created = (info.get("created_at") or "")[:10]
+                else:
+                    # 回退：尝试读 note.json（缓存缺失的旧目录）
+                    try:
+                        nd = _json.loads((folder / "note.json").read_bytes())
+                        nid = nd.get("note_id", "")
+                        title = nd.get("title", "(无标题)")
+                        created = nd.get("created_at", "")[:10]
+                    except Exception:
+                        nid, title, created = "", folder.name, ""
+                lines.append(f"| {i} | [{title}](notes/{folder.name}/note.md) | {created} | `{folder.name}` |\n")
+
+        # 一次编码、一次写入
+        index_path.write_bytes("".join(lines).encode("utf-8"))
@@ -1,132 +1,209 @@
 """导出模块 — 将本地 Markdown 笔记转换为 HTML / PDF 格式"""
 
 import html
+import io
 import logging
+import multiprocessing
+import os
+import platform
 import re
+import shutil
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
 logger = logging.getLogger(__name__)
 
+# 批量导出的工作进程数；笔记数少于 PARALLEL_EXPORT_MIN 时直接在当前进程转换
+EXPORT_WORKERS = os.cpu_count() or 1
+PARALLEL_EXPORT_MIN = 8
+
 # =========================================================================
 # Markdown → HTML
 # =========================================================================
 
-def _md_to_html(md: str) -> str:
-    """将 Markdown 文本转换为 HTML 片段（处理笔记常见语法）。"""
+# 块级语法
+_RE_HEADING = re.compile(r"^(#{1,6})\s+(.*)")
+_RE_HR = re.compile(r"^[-*_]{3,}$")
+_RE_LIST = re.compile(r"^[-*]\s+(.*)")
+_RE_H1 = re.compile(r"^#\s+(.*)")
+_RE_TITLE = re.compile(r"<title>(.*?)</title>")
+# PDF 只区分四级标题；独立成行的图片单独嵌入
+_RE_PDF_HEADING = re.compile(r"^(#{1,4})\s+(.*)")
+_RE_IMG_LINE = re.compile(r"^!\[([^\]]*)\]\(([^)]*)\)$")
+# 可能开启 PDF 块级语法（标题/分隔线/表格/引用/图片/列表）的行首字符
+_PDF_BLOCK_LEADS = frozenset("#-*_|>!")
+
+# 行内语法
+_RE_IMG = re.compile(r"!\[([^\]]*)\]\(([^)]*)\)")
+_RE_LINK = re.compile(r"\[([^\]]*)\]\(([^)]*)\)")
+_RE_CODE = re.compile(r"`([^`]+)`")
+_RE_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_RE_EM = re.compile(r"\*(.+?)\*")
+# 行内语法的触发字符（链接/图片以 "](" 判定）；不含这些字符的行无需任何替换
+_RE_INLINE_MARK = re.compile(r"[*`\]]")
+# PDF 额外需要 XML 转义的字符
+_RE_PDF_SPECIAL = re.compile(r"[*`\]&<>]")
+
+
+def _table_cells(line: str) -> list[str]:
+    return [c.strip() for c in line.strip().strip("|").split("|")]
+
+
+def _is_sep_cell(cell: str) -> bool:
+    """等价于 ^:?-+:?$（如 ---、:--、:-:），用切片代替逐单元格的正则匹配"""
+    if cell[:1] == ":":
+        cell = cell[1:]
+    if cell[-1:] == ":":
+        cell = cell[:-1]
+    return bool(cell) and not cell.strip("-")
+
+
+def _is_table_sep(cells: list[str]) -> bool:
+    return all(_is_sep_cell(c) for c in cells if c)
+
+
+def _inline_html(text: str) -> str:
+    """处理行内语法：bold, code, link, image
+
+    text 须已整体 html.escape 过（含引号），捕获组可直接放入标签与属性，
+    不再二次转义。
+    """
+    if not _RE_INLINE_MARK.search(text):
+        return text
+    # 先用 C 层的子串查找确认语法标记存在，再运行对应的正则：
+    # 未闭合的 * / ** 会让非贪婪匹配从每个起点扫到行尾，长行上代价可观
+    if "](" in text:
+        if "![" in text:
+            text = _RE_IMG.sub(r'<img src="\2" alt="\1" style="max-width:100%">', text)
+        text = _RE_LINK.sub(r'<a href="\2">\1</a>', text)
+    if "`" in text:
+        text = _RE_CODE.sub(r"<code>\1</code>", text)
+    if "*" in text:
+        text = _RE_BOLD.sub(r"<strong>\1</strong>", text)
+        text = _RE_EM.sub(r"<em>\1</em>", text)
+    return text
+
+
+def _md_to_html(md: str, out: io.TextIOBase | None = None) -> str | None:
+    """将 Markdown 文本转换为 HTML 片段（逐行处理）：标题、表格、引用、列表与行内语法。
+
+    传入 out 时逐行写入 out（每行以换行结尾）并返回 None，不在内存中拼出整篇 HTML。
+    """
     lines = md.split("\n")
-    output: list[str] = []
+    n = len(lines)
+    buf = io.StringIO() if out is None else out
     in_table = False
     in_blockquote = False
     in_list = False
     i = 0
 
+    def emit(line: str) -> None:
+        buf.write(line)
+        buf.write("\n")
+
     def flush_table():
         nonlocal in_table
         if in_table:
-            output.append("</tbody></table>")
+            emit("</tbody></table>")
             in_table = False
 
     def flush_blockquote():
         nonlocal in_blockquote
         if in_blockquote:
-            output.append("</blockquote>")
+            emit("</blockquote>")
             in_blockquote = False
 
     def flush_list():
         nonlocal in_list
         if in_list:
-            output.append("</ul>")
+            emit("</ul>")
             in_list = False
 
-    def inline(text: str) -> str:
-        """处理行内语法：bold, code, link, image"""
-        text = re.sub(
-            r"!\[([^\]]*)\]\(([^)]*)\)",
-            lambda m: f'<img src="{m.group(2)}" alt="{html.escape(m.group(1))}" style="max-width:100%">',
-            text,
-        )
-        text = re.sub(
-            r"\[([^\]]*)\]\(([^)]*)\)",
-            lambda m: f'<a href="{m.group(2)}">{html.escape(m.group(1))}</a>',
-            text,
-        )
-        text = re.sub(r"`([^`]+)`", lambda m: f"<code>{html.escape(m.group(1))}</code>", text)
-        text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
-        text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
-        return text
-
-    while i < len(lines):
+    while i < n:
         line = lines[i]
+        stripped = line.strip()
 
-        if not line.strip():
+        if not stripped:
             flush_table(); flush_blockquote(); flush_list()
-            output.append("")
+            emit("")
             i += 1
             continue
 
-        m = re.match(r"^(#{1,6})\s+(.*)", line)
+        # 按首字符分派，只对可能命中的分支执行正则
+        first = line[0]
+        m = _RE_HEADING.match(line) if first == "#" else None
         if m:
             flush_table(); flush_blockquote(); flush_list()
             level = len(m.group(1))
-            text = inline(html.escape(m.group(2)))
-            output.append(f"<h{level}>{text}</h{level}>")
+            text = _inline_html(html.escape(m.group(2)))
+            emit(f"<h{level}>{text}</h{level}>")
             i += 1
             continue
 
-        if re.match(r"^[-*_]{3,}$", line.strip()):
+        if stripped[0] in "-*_" and _RE_HR.match(stripped):
             flush_table(); flush_blockquote(); flush_list()
-            output.append("<hr>")
+            emit("<hr>")
             i += 1
             continue
 
         if "|" in line:
-            cells = [c.strip() for c in line.strip().strip("|").split("|")]
-            if all(re.match(r"^:?-+:?$", c) for c in cells if c):
-                if not in_table:
-                    if output and output[-1].startswith("<tr>"):
-                        header_row = output.pop()
-                        output.append("<table><thead>" + header_row + "</thead><tbody>")
-                        in_table = True
+            # 整行转义一次再拆分单元格（转义不影响 | 与首尾空白）
+            cells = _table_cells(html.escape(line))
+            if _is_table_sep(cells):
+                # 未紧跟在表头之后的分隔行直接忽略
                 i += 1
                 continue
+            row_html = "<tr>" + "".join(f"<td>{_inline_html(c)}</td>" for c in cells) + "</tr>"
+            # 向前看一行：下一行是分隔行时，本行即表头
+            nxt = lines[i + 1] if i + 1 < n else ""
+            if not in_table and "|" in nxt and _is_table_sep(_table_cells(nxt)):
+                emit("<table><thead>" + row_html + "</thead><tbody>")
+                in_table = True
+                i += 2
             else:
-                row_html = "<tr>" + "".join(f"<td>{inline(html.escape(c))}</td>" for c in cells) + "</tr>"
-                output.append(row_html)
+                emit(row_html)
                 i += 1
-                continue
+            continue
 
-        if line.startswith(">"):
+        if first == ">":
             flush_table(); flush_list()
-            text = inline(html.escape(line[1:].strip()))
+            text = _inline_html(html.escape(line[1:].strip()))
             if not in_blockquote:
-                output.append("<blockquote>")
+                emit("<blockquote>")
                 in_blockquote = True
-            output.append(f"<p>{text}</p>")
+            emit(f"<p>{text}</p>")
             i += 1
             continue
         else:
             flush_blockquote()
 
-        m = re.match(r"^[-*]\s+(.*)", line)
+        m = _RE_LIST.match(line) if first in "-*" else None
         if m:
             flush_table()
             if not in_list:
-                output.append("<ul>")
+                emit("<ul>")
                 in_list = True
-            text = inline(html.escape(m.group(1)))
-            output.append(f"<li>{text}</li>")
+            text = _inline_html(html.escape(m.group(1)))
+            emit(f"<li>{text}</li>")
             i += 1
             continue
         else:
             flush_list()
 
         flush_table()
-        text = inline(html.escape(line))
-        output.append(f"<p>{text}</p>")
+        text = _inline_html(html.escape(line))
+        emit(f"<p>{text}</p>")
         i += 1
 
     flush_table(); flush_blockquote(); flush_list()
-    return "\n".join(output)
+    if out is not None:
+        return None
+    # 与逐行 "\n".join 的结果一致：去掉末尾多出的换行
+    return buf.getvalue()[:-1]
 
 
 _HTML_TEMPLATE = """\
@@ -162,6 +239,7 @@ _HTML_TEMPLATE = """\
 </body>
 </html>
 """
+_HTML_HEAD, _HTML_TAIL = _HTML_TEMPLATE.split("{body}")
 
 
 def convert_md_to_html(md_path: Path, html_path: Path) -> None:
@@ -169,48 +247,122 @@ def convert_md_to_html(md_path: Path, html_path: Path) -> None:
     content = md_path.read_text(encoding="utf-8")
     title = "笔记"
     for line in content.splitlines():
-        m = re.match(r"^#\s+(.*)", line)
+        m = _RE_H1.match(line)
         if m:
             title = m.group(1).strip()
             break
-    body = _md_to_html(content)
-    html_content = _HTML_TEMPLATE.format(title=html.escape(title), body=body)
     html_path.parent.mkdir(parents=True, exist_ok=True)
-    html_path.write_text(html_content, encoding="utf-8")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(_HTML_HEAD.format(title=html.escape(title)))
+        # 正文直接流式写入文件；逐行输出已以换行结尾，省去模板中正文后的换行
+        start = f.tell()
+        _md_to_html(content, f)
+        f.write(_HTML_TAIL if f.tell() == start else _HTML_TAIL[1:])
+
 
+def _subdirs(root: Path) -> list[Path]:
+    """按名称排序返回 root 下的子目录（scandir 自带文件类型，无需逐个 stat）"""
+    with os.scandir(root) as it:
+        names = sorted(entry.name for entry in it if entry.is_dir())
+    return [root / name for name in names]
+
+
+def _mtime(path: Path) -> float:
+    """返回文件修改时间，不存在时返回 -1"""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return -1.0
 
-def export_notes_to_html(notes_dir: Path, output_dir: Path, force: bool = False) -> dict:
-    """批量将 notes/ 目录下所有笔记导出为 HTML。"""
+
+def _source_mtime(folder: Path) -> float | None:
+    """返回笔记文件夹的最新修改时间（note.md 与附件目录取较新者），没有 note.md 时返回 None"""
+    try:
+        md_mtime = (folder / "note.md").stat().st_mtime
+    except OSError:
+        return None
+    return max(md_mtime, _mtime(folder / "attachments"))
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """优先创建硬链接（不复制数据），跨文件系统等不支持时回退为复制"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _export_one_html(
+    folder: Path, html_file: Path, force: bool, hardlink: bool = False
+) -> str | None:
+    """转换单个笔记文件夹并复制附件（可在工作进程中运行），失败时返回错误信息"""
+    try:
+        convert_md_to_html(folder / "note.md", html_file)
+        att_src = folder / "attachments"
+        if att_src.exists():
+            att_dst = html_file.parent / "attachments"
+            dst_exists = att_dst.exists()
+            if dst_exists and force:
+                shutil.rmtree(att_dst)
+                dst_exists = False
+            if not dst_exists:
+                copy_function = _link_or_copy if hardlink else shutil.copy2
+                shutil.copytree(att_src, att_dst, copy_function=copy_function)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _run_exports(func, jobs: list[tuple], initializer=None) -> Iterator:
+    """按顺序返回 func(*job) 的结果；任务较多时分发到进程池（纯 Python 转换受 GIL 限制）。
+
+    initializer 在每个工作进程启动时调用一次。
+    """
+    if len(jobs) < PARALLEL_EXPORT_MIN:
+        return (func(*job) for job in jobs)
+    executor = ProcessPoolExecutor(max_workers=EXPORT_WORKERS, initializer=initializer)
+
+    def results() -> Iterator:
+        with executor:
+            yield from executor.map(func, *zip(*jobs), chunksize=4)
+
+    return results()
+
+
+def export_notes_to_html(
+    notes_dir: Path, output_dir: Path, force: bool = False, hardlink: bool = False
+) -> dict:
+    """批量将 notes/ 目录下所有笔记导出为 HTML（笔记较多时多进程并行转换）。
+
+    hardlink=True 时附件以硬链接方式导出，不占用额外磁盘空间
+    （修改导出目录中的附件会同时修改原文件）。
+    """
     stats = {"converted": 0, "skipped": 0, "errors": 0}
     if not notes_dir.exists():
         logger.warning("笔记目录不存在: %s", notes_dir)
         return stats
     output_dir.mkdir(parents=True, exist_ok=True)
-    for folder in sorted(notes_dir.iterdir()):
-        if not folder.is_dir():
-            continue
-        md_file = folder / "note.md"
-        if not md_file.exists():
+
+    jobs: list[tuple[Path, Path, bool, bool]] = []
+    for folder in _subdirs(notes_dir):
+        src_mtime = _source_mtime(folder)
+        if src_mtime is None:
             continue
         html_file = output_dir / folder.name / "note.html"
-        if html_file.exists() and not force:
+        html_mtime = _mtime(html_file)
+        # 已导出且不旧于笔记时跳过；笔记重新下载过则连同附件重新导出
+        if not force and html_mtime >= src_mtime:
             logger.info("  ⏭ 已存在: %s", folder.name)
             stats["skipped"] += 1
             continue
-        try:
-            convert_md_to_html(md_file, html_file)
-            att_src = folder / "attachments"
-            if att_src.exists():
-                import shutil
-                att_dst = output_dir / folder.name / "attachments"
-                if att_dst.exists() and force:
-                    shutil.rmtree(att_dst)
-                if not att_dst.exists():
-                    shutil.copytree(att_src, att_dst)
+        jobs.append((folder, html_file, force or html_mtime >= 0, hardlink))
+
+    for (folder, *_), error in zip(jobs, _run_exports(_export_one_html, jobs)):
+        if error is None:
             logger.info("  ✅ 已转换: %s", folder.name[:60])
             stats["converted"] += 1
-        except Exception as e:
-            logger.error("  ❌ 转换失败: %s — %s", folder.name, e)
+        else:
+            logger.error("  ❌ 转换失败: %s — %s", folder.name, error)
             stats["errors"] += 1
     _generate_html_index(output_dir, stats)
     return stats
@@ -218,18 +370,14 @@ def export_notes_to_html(notes_dir: Path, output_dir: Path, force: bool = False)
 
 def _generate_html_index(output_dir: Path, stats: dict) -> None:
     """在导出目录生成 HTML 索引页。"""
-    from datetime import datetime
-
     items: list[tuple[str, str]] = []
-    for folder in sorted(output_dir.iterdir()):
-        if not folder.is_dir():
-            continue
+    for folder in _subdirs(output_dir):
         html_file = folder / "note.html"
         if not html_file.exists():
             continue
         try:
             content = html_file.read_text(encoding="utf-8")
-            m = re.search(r"<title>(.*?)</title>", content)
+            m = _RE_TITLE.search(content)
             title = m.group(1) if m else folder.name
         except Exception:
             title = folder.name
@@ -282,9 +430,38 @@ _PDF_FONT_NAME: str = "Helvetica"
 _PDF_FONT_REGISTERED: bool = False
 
 
+@lru_cache(maxsize=None)
+def _reportlab() -> SimpleNamespace:
+    """导入 PDF 导出用到的 reportlab 对象（首次调用时导入一次，HTML 导出不加载 reportlab）。
+
+    Raises:
+        ImportError: 若 reportlab 未安装
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        HRFlowable,
+        Image,
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    return SimpleNamespace(
+        colors=colors, A4=A4, ParagraphStyle=ParagraphStyle, cm=cm,
+        HRFlowable=HRFlowable, Image=Image, Paragraph=Paragraph,
+        SimpleDocTemplate=SimpleDocTemplate, Spacer=Spacer, Table=Table,
+        TableStyle=TableStyle,
+    )
+
+
+@lru_cache(maxsize=None)
 def _find_cjk_font_path() -> str | None:
     """在常见系统路径中查找支持中文的 TTF/TTC 字体。"""
-    import platform
     system = platform.system()
     candidates: list[str] = []
     if system == "Darwin":
@@ -341,10 +518,11 @@ def _ensure_pdf_font() -> str:
     return "Helvetica"
 
 
+@lru_cache(maxsize=4)
 def _make_pdf_styles(font: str) -> dict:
-    """根据字体名创建 reportlab 段落样式表。"""
-    from reportlab.lib import colors
-    from reportlab.lib.styles import ParagraphStyle
+    """根据字体名创建 reportlab 段落样式表（按字体缓存，批量导出时各文档共用，调用方勿修改）。"""
+    rl = _reportlab()
+    colors, ParagraphStyle = rl.colors, rl.ParagraphStyle
 
     def s(name: str, **kw) -> ParagraphStyle:
         return ParagraphStyle(name, fontName=font, **kw)
@@ -378,145 +556,156 @@ def _pdf_inline(raw: str, font: str) -> str:
 
     顺序：先转义 XML 特殊字符，再匹配 Markdown 语法（不含 < > &）。
     """
-    import xml.sax.saxutils as sax
+    # 多数中文正文行既无需转义也没有行内语法，原样返回
+    if not _RE_PDF_SPECIAL.search(raw):
+        return raw
 
-    text = sax.escape(raw)   # & → &amp;  < → &lt;  > → &gt;
+    text = html.escape(raw, quote=False)   # & → &amp;  < → &lt;  > → &gt;
 
-    # 图片（内联）→ 跳过（独立行图片在 _build_story 中单独处理）
-    text = re.sub(r"!\[[^\]]*\]\([^)]*\)", "[图片]", text)
+    # 各组正则只在对应标记出现时运行（见 _inline_html）
+    if "](" in text:
+        # 图片（内联）→ 跳过（独立行图片在 _build_story 中单独处理）
+        if "![" in text:
+            text = _RE_IMG.sub("[图片]", text)
 
-    # 链接 [text](url)
-    text = re.sub(
-        r"\[([^\]]*)\]\(([^)]*)\)",
-        r'<font color="#0366d6">\1</font>',
-        text,
-    )
+        # 链接 [text](url)
+        text = _RE_LINK.sub(r'<font color="#0366d6">\1</font>', text)
 
-    # 行内代码 `code` (去除Courier以支持中文)
-    text = re.sub(
-        r"`([^`]+)`",
-        r'<font backColor="#f0f0f0"> \1 </font>',
-        text,
-    )
+    if "`" in text:
+        # 行内代码 `code` (去除Courier以支持中文)
+        text = _RE_CODE.sub(r'<font backColor="#f0f0f0"> \1 </font>', text)
 
-    # **bold** (使用颜色替代黑框危险的 <b>)
-    text = re.sub(r"\*\*(.+?)\*\*", r'<font color="#b30000">\1</font>', text)
+    if "*" in text:
+        # **bold** (使用颜色替代黑框危险的 <b>)
+        text = _RE_BOLD.sub(r'<font color="#b30000">\1</font>', text)
 
-    # *italic* (使用颜色替代 <i>)
-    text = re.sub(r"\*(.+?)\*", r'<font color="#555555">\1</font>', text)
+        # *italic* (使用颜色替代 <i>)
+        text = _RE_EM.sub(r'<font color="#555555">\1</font>', text)
 
     return text
 
 
+@lru_cache(maxsize=16)
+def _read_image(path: str, mtime_ns: int, size: int) -> bytes:
+    """读取图片内容；按路径与修改时间缓存，同一图片被多次引用时只读一次盘"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
 def _build_story(content: str, note_dir: Path, styles: dict, font: str) -> list:
     """将 Markdown 文本解析为 reportlab Platypus flowable 列表。"""
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    from reportlab.platypus import (
-        HRFlowable,
-        Image as RLImage,
-        Paragraph,
-        Spacer,
-        Table,
-        TableStyle,
-    )
+    rl = _reportlab()
+    colors, cm = rl.colors, rl.cm
+    HRFlowable, RLImage, Paragraph = rl.HRFlowable, rl.Image, rl.Paragraph
+    Spacer, Table = rl.Spacer, rl.Table
 
     story: list = []
     lines = content.split("\n")
+    n = len(lines)
+    max_w = 14 * cm
+    # 循环内频繁使用的全局函数与样式绑定为局部变量
+    append = story.append
+    inline = _pdf_inline
+    body_style = styles["body"]
+    list_style = styles["list"]
     i = 0
 
-    while i < len(lines):
+    while i < n:
         line = lines[i]
         stripped = line.strip()
 
         # ── 空行 ──────────────────────────────────────────────────────────
         if not stripped:
-            story.append(Spacer(1, 5))
+            append(Spacer(1, 5))
             i += 1
             continue
 
+        # 按首字符分派：首字符不可能开启任何块级语法的行（最常见）直接作为段落输出
+        lead = stripped[0]
+        if lead not in _PDF_BLOCK_LEADS:
+            append(Paragraph(inline(line, font), body_style))
+            i += 1
+            continue
+        first = line[0]
+
         # ── 标题 ──────────────────────────────────────────────────────────
-        m = re.match(r"^(#{1,4})\s+(.*)", line)
+        m = _RE_PDF_HEADING.match(line) if first == "#" else None
         if m:
             level = min(len(m.group(1)), 4)
-            text = _pdf_inline(m.group(2), font)
-            story.append(Paragraph(text, styles[f"h{level}"]))
+            text = inline(m.group(2), font)
+            append(Paragraph(text, styles[f"h{level}"]))
             i += 1
             continue
 
         # ── 分隔线 ────────────────────────────────────────────────────────
-        if re.match(r"^[-*_]{3,}$", stripped):
-            story.append(HRFlowable(width="100%", thickness=0.5,
-                                    color=colors.HexColor("#dddddd"),
-                                    spaceAfter=6, spaceBefore=6))
+        if lead in "-*_" and _RE_HR.match(stripped):
+            append(HRFlowable(width="100%", thickness=0.5,
+                              color=colors.HexColor("#dddddd"),
+                              spaceAfter=6, spaceBefore=6))
             i += 1
             continue
 
         # ── 表格（连续多行含 |） ───────────────────────────────────────────
-        if "|" in line and stripped.startswith("|"):
+        if lead == "|":
             table_lines: list[str] = []
-            while i < len(lines) and "|" in lines[i] and lines[i].strip().startswith("|"):
+            while i < n and lines[i].lstrip().startswith("|"):
                 table_lines.append(lines[i])
                 i += 1
             flowable = _build_pdf_table(table_lines, styles, font)
             if flowable:
-                story.append(flowable)
-                story.append(Spacer(1, 6))
+                append(flowable)
+                append(Spacer(1, 6))
             continue
 
         # ── 引用块（连续 > 行） ────────────────────────────────────────────
-        if line.startswith(">"):
+        if first == ">":
             quote_parts: list[str] = []
-            while i < len(lines) and lines[i].startswith(">"):
+            while i < n and lines[i].startswith(">"):
                 quote_parts.append(lines[i][1:].strip())
                 i += 1
-            text = _pdf_inline(" ".join(quote_parts), font)
+            text = inline(" ".join(quote_parts), font)
             # 用带左边框的 Table 模拟 blockquote
             inner = Paragraph(text, styles["quote"])
             tbl = Table([[inner]], colWidths=["100%"])
-            tbl.setStyle(TableStyle([
-                ("LEFTPADDING",  (0, 0), (-1, -1), 12),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                ("TOPPADDING",   (0, 0), (-1, -1), 6),
-                ("BOTTOMPADDING",(0, 0), (-1, -1), 6),
-                ("LINEBEFORE",   (0, 0), (0, -1), 3, colors.HexColor("#cccccc")),
-                ("BACKGROUND",   (0, 0), (-1, -1), colors.HexColor("#f9f9f9")),
-            ]))
-            story.append(tbl)
-            story.append(Spacer(1, 4))
+            tbl.setStyle(_pdf_quote_style())
+            append(tbl)
+            append(Spacer(1, 4))
             continue
 
         # ── 独立图片行 ![alt](path) ────────────────────────────────────────
-        m_img = re.match(r"^!\[([^\]]*)\]\(([^)]*)\)$", stripped)
+        m_img = _RE_IMG_LINE.match(stripped) if lead == "!" else None
         if m_img:
-            img_rel = m_img.group(2)
-            img_path = (note_dir / img_rel).resolve()
-            if img_path.exists():
+            img_path = note_dir / m_img.group(2)
+            try:
+                st = img_path.stat()
+            except OSError:
+                st = None
+            if st is not None:
                 try:
-                    max_w = 14 * cm
-                    img_obj = RLImage(str(img_path))
+                    data = _read_image(str(img_path), st.st_mtime_ns, st.st_size)
+                    img_obj = RLImage(io.BytesIO(data))
                     if img_obj.drawWidth > max_w:
                         ratio = img_obj.drawHeight / img_obj.drawWidth
                         img_obj.drawWidth = max_w
                         img_obj.drawHeight = max_w * ratio
-                    story.append(img_obj)
-                    story.append(Spacer(1, 6))
+                    append(img_obj)
+                    append(Spacer(1, 6))
                 except Exception as exc:
                     logger.warning("无法嵌入图片 %s: %s", img_path, exc)
             i += 1
             continue
 
         # ── 无序列表 ──────────────────────────────────────────────────────
-        m = re.match(r"^[-*]\s+(.*)", line)
+        m = _RE_LIST.match(line) if first in "-*" else None
         if m:
-            text = _pdf_inline(m.group(1), font)
-            story.append(Paragraph(f"• {text}", styles["list"]))
+            text = inline(m.group(1), font)
+            append(Paragraph(f"• {text}", list_style))
             i += 1
             continue
 
         # ── 普通段落 ──────────────────────────────────────────────────────
-        text = _pdf_inline(line, font)
-        story.append(Paragraph(text, styles["body"]))
+        text = inline(line, font)
+        append(Paragraph(text, body_style))
         i += 1
 
     return story
@@ -524,17 +713,17 @@ def _build_story(content: str, note_dir: Path, styles: dict, font: str) -> list:
 
 def _build_pdf_table(table_lines: list[str], styles: dict, font: str):
     """将 Markdown 表格行列表转换为 reportlab Table flowable。"""
-    from reportlab.lib import colors
-    from reportlab.platypus import Paragraph, Table, TableStyle
+    rl = _reportlab()
+    Paragraph, Table = rl.Paragraph, rl.Table
 
     data: list[list] = []
     is_first_row = True
     has_header = False
 
     for line in table_lines:
-        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        cells = _table_cells(line)
         # 跳过分隔行（全是 --- 的行）
-        if all(re.match(r"^:?-+:?$", c) for c in cells if c):
+        if _is_table_sep(cells):
             has_header = True
             continue
         style = styles["table_head"] if (is_first_row and has_header) else styles["table_cell"]
@@ -552,7 +741,33 @@ def _build_pdf_table(table_lines: list[str], styles: dict, font: str):
             row.append(Paragraph("", styles["table_cell"]))
 
     tbl = Table(data, hAlign="LEFT", repeatRows=1 if has_header else 0)
-    tbl.setStyle(TableStyle([
+    tbl.setStyle(_pdf_table_style(font))
+    return tbl
+
+
+# setStyle 只读取 TableStyle 中的命令，同一对象可供所有表格复用
+
+@lru_cache(maxsize=None)
+def _pdf_quote_style():
+    """引用块（单格表格模拟）的样式"""
+    rl = _reportlab()
+    colors = rl.colors
+    return rl.TableStyle([
+        ("LEFTPADDING",  (0, 0), (-1, -1), 12),
+        ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+        ("TOPPADDING",   (0, 0), (-1, -1), 6),
+        ("BOTTOMPADDING",(0, 0), (-1, -1), 6),
+        ("LINEBEFORE",   (0, 0), (0, -1), 3, colors.HexColor("#cccccc")),
+        ("BACKGROUND",   (0, 0), (-1, -1), colors.HexColor("#f9f9f9")),
+    ])
+
+
+@lru_cache(maxsize=4)
+def _pdf_table_style(font: str):
+    """Markdown 表格的样式（按字体缓存）"""
+    rl = _reportlab()
+    colors = rl.colors
+    return rl.TableStyle([
         ("FONTNAME",      (0, 0), (-1, -1), font),
         ("FONTSIZE",      (0, 0), (-1, -1), 9.5),
         ("BACKGROUND",    (0, 0), (-1, 0),  colors.HexColor("#f5f5f5")),
@@ -562,28 +777,28 @@ def _build_pdf_table(table_lines: list[str], styles: dict, font: str):
         ("LEFTPADDING",   (0, 0), (-1, -1), 8),
         ("RIGHTPADDING",  (0, 0), (-1, -1), 8),
         ("VALIGN",        (0, 0), (-1, -1), "TOP"),
-    ]))
-    return tbl
+    ])
 
 
 # ── 页眉页脚 ──────────────────────────────────────────────────────────────
 
 def _make_header_footer(title: str, font: str):
     """返回 onFirstPage / onLaterPages 回调，用于绘制页眉页脚。"""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import cm
-    from reportlab.pdfgen.canvas import Canvas
-
-    W, H = A4
-
-    def draw(canvas: "Canvas", doc) -> None:  # type: ignore[name-defined]
+    rl = _reportlab()
+    cm = rl.cm
+    W, H = rl.A4
+    # 每页都会回调 draw：颜色与截断后的标题只计算一次
+    text_color = rl.colors.HexColor("#999999")
+    line_color = rl.colors.HexColor("#eeeeee")
+    header = title[:80]
+
+    def draw(canvas, doc) -> None:
         canvas.saveState()
         # 页眉
         canvas.setFont(font, 8)
-        canvas.setFillColor(colors.HexColor("#999999"))
-        canvas.drawString(2.5 * cm, H - 1.8 * cm, title[:80])
-        canvas.setStrokeColor(colors.HexColor("#eeeeee"))
+        canvas.setFillColor(text_color)
+        canvas.drawString(2.5 * cm, H - 1.8 * cm, header)
+        canvas.setStrokeColor(line_color)
         canvas.line(2.5 * cm, H - 2.0 * cm, W - 2.5 * cm, H - 2.0 * cm)
         # 页脚
         canvas.setFont(font, 8)
@@ -606,9 +821,7 @@ def convert_md_to_pdf(md_path: Path, pdf_path: Path) -> None:
         ImportError: 若 reportlab 未安装
     """
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.units import cm
-        from reportlab.platypus import SimpleDocTemplate, Spacer
+        rl = _reportlab()
     except ImportError as exc:
         raise ImportError(
             "PDF 导出需要安装 reportlab：\n  pip install reportlab\n  或  uv add reportlab"
@@ -622,7 +835,7 @@ def convert_md_to_pdf(md_path: Path, pdf_path: Path) -> None:
     # 提取标题用于元数据
     title = md_path.parent.name
     for line in content.splitlines():
-        m = re.match(r"^#\s+(.*)", line)
+        m = _RE_H1.match(line)
         if m:
             title = m.group(1).strip()
             break
@@ -632,9 +845,10 @@ def convert_md_to_pdf(md_path: Path, pdf_path: Path) -> None:
     pdf_path.parent.mkdir(parents=True, exist_ok=True)
     on_first, on_later = _make_header_footer(title, font)
 
-    doc = SimpleDocTemplate(
+    cm = rl.cm
+    doc = rl.SimpleDocTemplate(
         str(pdf_path),
-        pagesize=A4,
+        pagesize=rl.A4,
         leftMargin=2.5 * cm,
         rightMargin=2.5 * cm,
         topMargin=3.0 * cm,
@@ -646,13 +860,29 @@ def convert_md_to_pdf(md_path: Path, pdf_path: Path) -> None:
     doc.build(story, onFirstPage=on_first, onLaterPages=on_later)
 
 
+def _init_pdf_worker() -> None:
+    """PDF 工作进程初始化：注册 CJK 字体（fork 时已从主进程继承则直接返回）"""
+    _ensure_pdf_font()
+
+
+def _export_one_pdf(md_file: Path, pdf_file: Path) -> str | None:
+    """转换单个笔记为 PDF（可在工作进程中运行），失败时返回错误信息"""
+    try:
+        convert_md_to_pdf(md_file, pdf_file)
+    except ImportError:
+        raise
+    except Exception as e:
+        return str(e)
+    return None
+
+
 def export_notes_to_pdf(notes_dir: Path, output_dir: Path, force: bool = False) -> dict:
-    """批量将 notes/ 目录下所有笔记导出为 PDF。
+    """批量将 notes/ 目录下所有笔记导出为 PDF（笔记较多时多进程并行转换）。
 
     Args:
         notes_dir: 笔记源目录（包含按文件夹组织的笔记）
         output_dir: PDF 输出根目录
-        force: 是否覆盖已存在的 PDF 文件
+        force: 是否重新生成所有 PDF（默认只转换新增或有更新的笔记）
 
     Returns:
         {"converted": int, "skipped": int, "errors": int}
@@ -665,28 +895,38 @@ def export_notes_to_pdf(notes_dir: Path, output_dir: Path, force: bool = False)
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    for folder in sorted(notes_dir.iterdir()):
-        if not folder.is_dir():
+    jobs: list[tuple[Path, Path]] = []
+    for folder in _subdirs(notes_dir):
+        src_mtime = _source_mtime(folder)
+        if src_mtime is None:
             continue
         md_file = folder / "note.md"
-        if not md_file.exists():
-            continue
-
         pdf_file = output_dir / f"{folder.name}.pdf"
 
-        if pdf_file.exists() and not force:
+        # 已导出且不旧于笔记（含嵌入的图片）时跳过，只重新生成有变化的笔记
+        if not force and _mtime(pdf_file) >= src_mtime:
             logger.info("  ⏭ 已存在: %s.pdf", folder.name[:55])
             stats["skipped"] += 1
             continue
-
-        try:
-            convert_md_to_pdf(md_file, pdf_file)
-            logger.info("  ✅ 已转换: %s.pdf", folder.name[:55])
+        jobs.append((md_file, pdf_file))
+
+    if len(jobs) >= PARALLEL_EXPORT_MIN:
+        # 缺少 reportlab 时在主进程中尽早抛出 ImportError
+        _reportlab()
+        # 仅 fork 的工作进程会继承主进程中已解析的字体；spawn / forkserver
+        # （macOS、Windows 的默认方式）下由各工作进程在 initializer 中自行注册
+        if multiprocessing.get_start_method() == "fork":
+            _ensure_pdf_font()
+
+    # 缺少 reportlab 时 ImportError 从工作进程原样抛出，由调用方处理
+    results = _run_exports(_export_one_pdf, jobs, initializer=_init_pdf_worker)
+    for (md_file, _), error in zip(jobs, results):
+        name = md_file.parent.name
+        if error is None:
+            logger.info("  ✅ 已转换: %s.pdf", name[:55])
             stats["converted"] += 1
-        except ImportError as exc:
-            raise   # 让调用方处理缺少依赖的情况
-        except Exception as exc:
-            logger.error("  ❌ 转换失败: %s — %s", folder.name, exc)
+        else:
+            logger.error("  ❌ 转换失败: %s — %s", name, error)
             stats["errors"] += 1
 
     return stats
@@ -3,26 +3,82 @@
 import os
 import re
 import urllib.parse
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import TextIO
+
+_RE_BAD_CHARS = re.compile(r'[<>:"/\\|?*\n\r\t]')
 
 
 def sanitize_filename(name: str, max_length: int = 80) -> str:
     """清理文件名，移除非法字符"""
-    name = re.sub(r'[<>:"/\\|?*\n\r\t]', '_', name)
+    name = _RE_BAD_CHARS.sub('_', name)
     name = name.strip(' .')
     if len(name) > max_length:
         name = name[:max_length].rstrip(' .')
     return name or "untitled"
 
 
+def _url_path(url: str) -> str:
+    """返回解码后的 URL 路径，等价于 unquote(urlparse(url).path)
+
+    常见的 http(s) URL 直接按分隔符切片，不构造 ParseResult；
+    含制表/换行符等需要 urlparse 预处理的 URL 仍走标准库。
+    """
+    if not url.startswith(("https://", "http://")) or "\t" in url or "\n" in url or "\r" in url:
+        return urllib.parse.unquote(urllib.parse.urlparse(url).path)
+    start = url.index("//") + 2
+    end = len(url)
+    for sep in "?#":
+        pos = url.find(sep, start, end)
+        if pos >= 0:
+            end = pos
+    slash = url.find("/", start, end)
+    if slash < 0:
+        return ""
+    path = url[slash:end]
+    # urlparse 会把最后一段中 ';' 之后的部分作为 params 拆出
+    semi = path.find(";", path.rfind("/"))
+    if semi >= 0:
+        path = path[:semi]
+    return urllib.parse.unquote(path) if "%" in path else path
+
+
+@lru_cache(maxsize=512)
 def get_file_extension(url: str, default_ext: str = "") -> str:
-    """从 URL 中提取文件扩展名"""
-    parsed = urllib.parse.urlparse(url)
-    path = urllib.parse.unquote(parsed.path)
-    _, ext = os.path.splitext(path)
+    """从 URL 中提取文件扩展名
+
+    同一附件 URL 常在多条笔记间重复出现，解析结果按 (url, default_ext) 缓存。
+    """
+    _, ext = os.path.splitext(_url_path(url))
     return ext if ext else default_ext
 
 
+def format_date_prefix(created_at: str) -> str:
+    """将 "2024-01-02 03:04:05" 转为文件夹名前缀 "20240102_030405"
+
+    接口返回的时间格式固定，按位置切片即可；格式不符时再交给 strptime，
+    仍无法解析则仅替换空格与冒号。
+    """
+    if (
+        len(created_at) == 19
+        and created_at[4] == created_at[7] == "-"
+        and created_at[10] == " "
+        and created_at[13] == created_at[16] == ":"
+    ):
+        prefix = (
+            created_at[:4] + created_at[5:7] + created_at[8:10] + "_"
+            + created_at[11:13] + created_at[14:16] + created_at[17:19]
+        )
+        if prefix[:8].isdigit() and prefix[9:].isdigit():
+            return prefix
+    try:
+        return datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S").strftime("%Y%m%d_%H%M%S")
+    except ValueError:
+        return created_at.replace(" ", "_").replace(":", "")
+
+
 def format_duration(ms: int) -> str:
     """将毫秒转换为可读的时长格式"""
     if ms <= 0:
@@ -38,124 +94,147 @@ def format_duration(ms: int) -> str:
         return f"{seconds}秒"
 
 
-def note_to_markdown(note: dict, attachments_dir: Path, note_dir: Path) -> str:
-    """将单条笔记转换为 Markdown 格式"""
-    lines = []
+def _rel_prefix(attachments_dir: Path, note_dir: Path) -> str:
+    """附件目录相对笔记目录的路径前缀（含结尾分隔符），每条笔记只算一次"""
+    rel_base = os.path.relpath(attachments_dir, note_dir)
+    return "" if rel_base == os.curdir else rel_base + os.sep
 
-    title = note.get("title", "").strip()
-    if title:
-        lines.append(f"# {title}")
-        lines.append("")
-
-    # --- 元信息表格 ---
-    lines.append("## 📋 笔记信息")
-    lines.append("")
-    lines.append("| 属性 | 值 |")
-    lines.append("|------|-----|")
-    lines.append(f"| ID | `{note.get('note_id', '')}` |")
-    lines.append(f"| 来源 | {note.get('source', '')} |")
-    lines.append(f"| 类型 | {note.get('note_type', '')} |")
-    lines.append(f"| 录入方式 | {note.get('entry_type', '')} |")
-    lines.append(f"| 创建时间 | {note.get('created_at', '')} |")
-    lines.append(f"| 更新时间 | {note.get('updated_at', note.get('edit_time', ''))} |")
-    lines.append(f"| AI 生成 | {'是' if note.get('is_ai_generated') else '否'} |")
 
+def _render_meta_table(note: dict) -> str:
     tags = note.get("tags", [])
+    tag_row = ""
     if tags:
         tag_names = ", ".join(f"`{t['name']}`" for t in tags if isinstance(t, dict))
-        lines.append(f"| 标签 | {tag_names} |")
+        tag_row = f"| 标签 | {tag_names} |\n"
+    return (
+        "## 📋 笔记信息\n"
+        "\n"
+        "| 属性 | 值 |\n"
+        "|------|-----|\n"
+        f"| ID | `{note.get('note_id', '')}` |\n"
+        f"| 来源 | {note.get('source', '')} |\n"
+        f"| 类型 | {note.get('note_type', '')} |\n"
+        f"| 录入方式 | {note.get('entry_type', '')} |\n"
+        f"| 创建时间 | {note.get('created_at', '')} |\n"
+        f"| 更新时间 | {note.get('updated_at', note.get('edit_time', ''))} |\n"
+        f"| AI 生成 | {'是' if note.get('is_ai_generated') else '否'} |\n"
+        f"{tag_row}"
+        "\n"
+    )
+
+
+def _render_attachments(attachments: list, rel_prefix: str) -> str:
+    if not attachments:
+        return ""
+    parts = ["## 🔊 附件\n\n"]
+    for i, att in enumerate(attachments):
+        att_type = att.get("type", "unknown")
+        att_url = att.get("url", "")
+        att_title = att.get("title", "")
+
+        if att_type == "link":
+            # 链接类型附件
+            if att_title and att_url:
+                parts.append(f"- 🔗 [{att_title}]({att_url})\n")
+            elif att_url:
+                parts.append(f"- 🔗 [{att_url}]({att_url})\n")
+        elif att_url:
+            ext = get_file_extension(att_url, f".{att_type}")
+            att_filename = f"attachment_{i + 1}{ext}"
+            duration_str = format_duration(att.get("duration", 0))
+            dur_info = f"（时长: {duration_str}）" if duration_str else ""
+            parts.append(
+                f"- **{att_type.upper()}** {dur_info}: [{att_filename}]({rel_prefix}{att_filename})\n"
+            )
+        else:
+            parts.append(f"- **{att_type.upper()}**: (无链接)\n")
+    parts.append("\n")
+    return "".join(parts)
+
+
+def _render_images(images: list, rel_prefix: str) -> str:
+    if not images:
+        return ""
+    parts = ["## 🖼️ 图片\n\n"]
+    for i, img in enumerate(images):
+        img_url = img if isinstance(img, str) else img.get("url", "") if isinstance(img, dict) else ""
+        if img_url:
+            ext = get_file_extension(img_url, ".jpg")
+            parts.append(f"![图片 {i + 1}]({rel_prefix}image_{i + 1}{ext})\n\n")
+    return "".join(parts)
+
+
+def _render_res_info(res_info) -> str:
+    if not isinstance(res_info, dict):
+        return ""
+    res_title = res_info.get("title", "").strip()
+    res_url = res_info.get("url", "").strip()
+    if res_title and res_url:
+        body = f"[{res_title}]({res_url})\n"
+    elif res_title:
+        body = f"{res_title}\n"
+    elif res_url:
+        body = f"[链接]({res_url})\n"
+    else:
+        return ""
+    return f"## 🔗 引用来源\n\n{body}\n"
+
+
+def _render_topics(topics: list) -> str:
+    if not topics:
+        return ""
+    items = "".join(f"- {t.get('topic_name', '(未知)')}\n" for t in topics if isinstance(t, dict))
+    return f"## 📚 所属知识库\n\n{items}\n"
 
-    lines.append("")
+
+def _note_sections(note: dict, attachments_dir: Path, note_dir: Path) -> tuple[str, ...]:
+    """按顺序渲染笔记各小节，每节为空串或以空行结尾的字符串"""
+    rel_prefix = _rel_prefix(attachments_dir, note_dir)
+
+    title = note.get("title", "").strip()
+    header = f"# {title}\n\n" if title else ""
 
     # --- 正文内容 ---
     content = note.get("content", "").strip()
-    if content:
-        lines.append("## 📝 内容")
-        lines.append("")
-        lines.append(content)
-        lines.append("")
+    content_section = f"## 📝 内容\n\n{content}\n\n" if content else ""
 
     # --- 引用内容 ---
     ref_content = note.get("ref_content", "").strip()
-    if ref_content:
-        lines.append("## 📖 引用内容")
-        lines.append("")
-        lines.append("> " + ref_content.replace("\n", "\n> "))
-        lines.append("")
-
-    # --- 附件（音频/链接） ---
-    attachments = note.get("attachments", [])
-    if attachments:
-        lines.append("## 🔊 附件")
-        lines.append("")
-        for i, att in enumerate(attachments):
-            att_type = att.get("type", "unknown")
-            att_url = att.get("url", "")
-            att_title = att.get("title", "")
-            duration = att.get("duration", 0)
-
-            if att_type == "link":
-                # 链接类型附件
-                if att_title and att_url:
-                    lines.append(f"- 🔗 [{att_title}]({att_url})")
-                elif att_url:
-                    lines.append(f"- 🔗 [{att_url}]({att_url})")
-            elif att_url:
-                ext = get_file_extension(att_url, f".{att_type}")
-                att_filename = f"attachment_{i + 1}{ext}"
-                att_path = attachments_dir / att_filename
-                rel_path = os.path.relpath(att_path, note_dir)
-
-                duration_str = format_duration(duration)
-                dur_info = f"（时长: {duration_str}）" if duration_str else ""
-                lines.append(f"- **{att_type.upper()}** {dur_info}: [{att_filename}]({rel_path})")
-            else:
-                lines.append(f"- **{att_type.upper()}**: (无链接)")
-        lines.append("")
+    ref_section = (
+        "## 📖 引用内容\n\n> " + ref_content.replace("\n", "\n> ") + "\n\n"
+        if ref_content else ""
+    )
 
     # --- 图片 ---
-    original_images = note.get("original_images", [])
-    small_images = note.get("small_images", [])
-    body_images = note.get("body_images", [])
-    images = original_images or small_images or body_images
-
-    if images:
-        lines.append("## 🖼️ 图片")
-        lines.append("")
-        for i, img in enumerate(images):
-            img_url = img if isinstance(img, str) else img.get("url", "") if isinstance(img, dict) else ""
-            if img_url:
-                ext = get_file_extension(img_url, ".jpg")
-                img_filename = f"image_{i + 1}{ext}"
-                img_path = attachments_dir / img_filename
-                rel_path = os.path.relpath(img_path, note_dir)
-                lines.append(f"![图片 {i + 1}]({rel_path})")
-                lines.append("")
-
-    # --- 资源引用信息 ---
-    res_info = note.get("res_info", {})
-    if isinstance(res_info, dict):
-        res_title = res_info.get("title", "").strip()
-        res_url = res_info.get("url", "").strip()
-        if res_title or res_url:
-            lines.append("## 🔗 引用来源")
-            lines.append("")
-            if res_title and res_url:
-                lines.append(f"[{res_title}]({res_url})")
-            elif res_title:
-                lines.append(res_title)
-            elif res_url:
-                lines.append(f"[链接]({res_url})")
-            lines.append("")
-
-    # --- 所属知识库 ---
-    topics = note.get("topics", [])
-    if topics:
-        lines.append("## 📚 所属知识库")
-        lines.append("")
-        for t in topics:
-            if isinstance(t, dict):
-                lines.append(f"- {t.get('topic_name', '(未知)')}")
-        lines.append("")
-
-    return "\n".join(lines)
+    images = note.get("original_images", []) or note.get("small_images", []) or note.get("body_images", [])
+
+    return (
+        header,
+        _render_meta_table(note),
+        content_section,
+        ref_section,
+        _render_attachments(note.get("attachments", []), rel_prefix),
+        _render_images(images, rel_prefix),
+        _render_res_info(note.get("res_info", {})),
+        _render_topics(note.get("topics", [])),
+    )
+
+
+def note_to_markdown(note: dict, attachments_dir: Path, note_dir: Path) -> str:
+    """将单条笔记转换为 Markdown 格式
+
+    各小节由辅助函数渲染为以换行结尾的字符串，最后一次性拼接。
+    """
+    md = "".join(_note_sections(note, attachments_dir, note_dir))
+    # 每一节都以空行结束，去掉最后一个换行以保持原有输出格式
+    return md[:-1]
+
+
+def write_note_markdown(note: dict, attachments_dir: Path, note_dir: Path, fp: TextIO) -> None:
+    """与 note_to_markdown 输出相同，但逐节写入已打开的文本文件，不拼接完整文档"""
+    sections = [section for section in _note_sections(note, attachments_dir, note_dir) if section]
+    last = sections.pop()  # 元信息表格总是存在
+    for section in sections:
+        fp.write(section)
+    fp.write(last[:-1])
+
@@ -40,9 +40,16 @@ Auth details: The auth is handled by the `getnotes-cli`. Users must run `getnote
 
 mcp_logger = logging.getLogger("getnotes_cli.mcp")
 
+# Set once the tools have been registered with `mcp`
+_REGISTERED = False
+
 
 def _register_tools():
-    """Import and register all tools from the modular tools package."""
+    """Import and register all tools from the modular tools package (idempotent)."""
+    global _REGISTERED
+    if _REGISTERED:
+        return
+
     from .tools._utils import register_all_tools
     
     # Import all tool modules to populate the registry
@@ -53,6 +60,7 @@ def _register_tools():
     
     # Register collected tools with mcp
     register_all_tools(mcp)
+    _REGISTERED = True
 
 
 # Register tools on import
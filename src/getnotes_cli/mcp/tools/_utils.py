@@ -1,4 +1,3 @@
-import inspect
 import logging
 
 def register_all_tools(mcp_server):
@@ -10,26 +9,29 @@ def register_all_tools(mcp_server):
     
     logger = logging.getLogger("getnotes_cli.mcp.tools")
     registered_count = 0
+    # Functions already registered (e.g. re-exported by more than one module)
+    seen: set = set()
     
     for mod in modules:
-        if not hasattr(mod, "__all__"):
-            logger.warning(f"Module {mod.__name__} has no __all__ defined.")
+        exported = mod.__dict__.get("__all__")
+        if exported is None:
+            logger.warning("Module %s has no __all__ defined.", mod.__name__)
             continue
-            
-        for func_name in mod.__all__:
-            if hasattr(mod, func_name):
-                func = getattr(mod, func_name)
-                if inspect.isfunction(func):
-                    # Register with FastMCP
-                    msg = f"Registering tool: {func_name} from {mod.__name__}"
-                    logger.debug(msg)
-                    try:
-                        mcp_server.tool()(func)
-                        registered_count += 1
-                    except Exception as e:
-                        logger.error(f"Failed to register {func_name}: {e}")
-                        
-    logger.info(f"Registered {registered_count} tools.")
+
+        for func_name in exported:
+            func = mod.__dict__.get(func_name)
+            if not callable(func) or func in seen:
+                continue
+            seen.add(func)
+            # Register with FastMCP
+            logger.debug("Registering tool: %s from %s", func_name, mod.__name__)
+            try:
+                mcp_server.tool()(func)
+                registered_count += 1
+            except Exception as e:
+                logger.error("Failed to register %s: %s", func_name, e)
+
+    logger.info("Registered %d tools.", registered_count)
 
 # We can define a global tools registry or let fastmcp discover them
 # This is a stub for potential future use cases.
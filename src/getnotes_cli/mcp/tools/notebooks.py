@@ -3,8 +3,13 @@
 from pathlib import Path
 
 from getnotes_cli.auth import get_or_refresh_token
-from getnotes_cli.config import DEFAULT_OUTPUT_DIR
-from getnotes_cli.notebook import fetch_notebooks, fetch_subscribed_notebooks
+from getnotes_cli.config import get_default_output_dir
+from getnotes_cli.notebook import (
+    cached_fetch_notebooks,
+    cached_fetch_subscribed_notebooks,
+    cached_find_notebook,
+    invalidate_cached_notebooks,
+)
 from getnotes_cli.notebook_downloader import NotebookDownloader
 
 __all__ = ["list_notebooks", "list_subscribed_notebooks", "download_notebook", "download_subscribed_notebook", "add_note_to_notebook"]
@@ -21,7 +26,7 @@ def list_notebooks() -> str:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
         
     try:
-        notebooks = fetch_notebooks(auth)
+        notebooks = cached_fetch_notebooks(auth)
         if not notebooks:
             return "You have no notebooks."
             
@@ -48,7 +53,7 @@ def list_subscribed_notebooks() -> str:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
         
     try:
-        notebooks = fetch_subscribed_notebooks(auth)
+        notebooks = cached_fetch_subscribed_notebooks(auth)
         if not notebooks:
             return "You have no subscribed notebooks."
             
@@ -80,15 +85,14 @@ def download_notebook(notebook_id: str, force: bool = False) -> str:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
         
     try:
-        notebooks = fetch_notebooks(auth)
-        target = next((nb for nb in notebooks if nb.get("id_alias") == notebook_id), None)
+        target = cached_find_notebook(auth, notebook_id)
         
         if not target:
             return f"Error: Could not find notebook with ID '{notebook_id}'."
             
         downloader = NotebookDownloader(
             token=auth,
-            output_dir=DEFAULT_OUTPUT_DIR,
+            output_dir=get_default_output_dir(),
             force=force,
         )
         
@@ -98,9 +102,10 @@ def download_notebook(notebook_id: str, force: bool = False) -> str:
         return (
             f"Successfully downloaded notebook '{name}'\n"
             f"- Notes: {stats['notes']}\n"
+            f"- Unchanged: {stats['unchanged']}\n"
             f"- Files: {stats['files']}\n"
             f"- Skipped: {stats['skipped']}\n"
-            f"Saved to {DEFAULT_OUTPUT_DIR.resolve()}/notebooks/"
+            f"Saved to {get_default_output_dir().resolve()}/notebooks/"
         )
     except Exception as e:
         return f"Error downloading notebook: {e}"
@@ -121,15 +126,14 @@ def download_subscribed_notebook(notebook_id: str, force: bool = False) -> str:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
         
     try:
-        notebooks = fetch_subscribed_notebooks(auth)
-        target = next((nb for nb in notebooks if nb.get("id_alias") == notebook_id), None)
+        target = cached_find_notebook(auth, notebook_id, subscribed=True)
         
         if not target:
             return f"Error: Could not find subscribed notebook with ID '{notebook_id}'."
             
         downloader = NotebookDownloader(
             token=auth,
-            output_dir=DEFAULT_OUTPUT_DIR,
+            output_dir=get_default_output_dir(),
             force=force,
         )
         
@@ -140,9 +144,10 @@ def download_subscribed_notebook(notebook_id: str, force: bool = False) -> str:
         return (
             f"Successfully downloaded subscribed notebook '{name}' by {creator}\n"
             f"- Notes: {stats['notes']}\n"
+            f"- Unchanged: {stats['unchanged']}\n"
             f"- Files: {stats['files']}\n"
             f"- Skipped: {stats['skipped']}\n"
-            f"Saved to {DEFAULT_OUTPUT_DIR.resolve()}/notebooks/"
+            f"Saved to {get_default_output_dir().resolve()}/notebooks/"
         )
     except Exception as e:
         return f"Error downloading subscribed notebook: {e}"
@@ -163,8 +168,7 @@ def add_note_to_notebook(note_id: str, notebook_id: str) -> str:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
 
     try:
-        notebooks = fetch_notebooks(auth)
-        target = next((nb for nb in notebooks if nb.get("id_alias") == notebook_id), None)
+        target = cached_find_notebook(auth, notebook_id)
 
         if not target:
             return (
@@ -184,6 +188,8 @@ def add_note_to_notebook(note_id: str, notebook_id: str) -> str:
 
         header = result.get("h", {})
         if header.get("c") == 0:
+            # 知识库内容数已变化，下次列出时重新拉取
+            invalidate_cached_notebooks(auth)
             nb_name = target.get("name", notebook_id)
             return f"Successfully added note '{note_id}' to notebook '{nb_name}'."
         else:
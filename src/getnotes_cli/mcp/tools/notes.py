@@ -4,8 +4,9 @@ import json
 import tempfile
 from pathlib import Path
 
+from getnotes_cli import _json
 from getnotes_cli.auth import get_or_refresh_token
-from getnotes_cli.config import DEFAULT_OUTPUT_DIR, NOTES_API_URL
+from getnotes_cli.config import NOTES_API_URL, get_default_output_dir
 from getnotes_cli.creator import NoteCreator
 from getnotes_cli.downloader import NoteDownloader
 from getnotes_cli.searcher import NoteSearcher
@@ -32,7 +33,7 @@ def download_notes(limit: int = 10, force: bool = False) -> str:
     except Exception as e:
         return f"Error: Authentication failed. Please run 'getnotes login' in your terminal. ({e})"
         
-    output_dir = DEFAULT_OUTPUT_DIR
+    output_dir = get_default_output_dir()
     downloader = NoteDownloader(
         token=auth,
         output_dir=output_dir,
@@ -79,7 +80,7 @@ def get_recent_notes(limit: int = 10) -> str:
         with httpx.Client(timeout=30) as client:
             resp = client.get(NOTES_API_URL, headers=headers, params=params)
             resp.raise_for_status()
-            data = resp.json()
+            data = _json.loads(resp.content)
             
         content = data.get("c", {})
         notes_list = content.get("list", [])
@@ -268,14 +269,14 @@ def read_note(note_id: str) -> str:
     """
     from getnotes_cli.cache import CacheManager
 
-    cache = CacheManager(DEFAULT_OUTPUT_DIR)
+    cache = CacheManager(get_default_output_dir())
     cache.load()
 
     info = cache.get(note_id)
     if info:
         folder_name = info.get("folder_name", "")
         if folder_name:
-            md_file = DEFAULT_OUTPUT_DIR / "notes" / folder_name / "note.md"
+            md_file = get_default_output_dir() / "notes" / folder_name / "note.md"
             if md_file.exists():
                 return md_file.read_text(encoding="utf-8")
 
@@ -1,9 +1,20 @@
 """知识库 (Notebook/Topic) API 客户端 — 获取知识库列表与知识库内笔记"""
 
+from collections import ChainMap
+from collections.abc import Callable, Mapping
+from typing import Any
+
 import httpx
 
+from getnotes_cli import _json, api_cache
+from getnotes_cli._http import shared_client
 from getnotes_cli.auth import AuthToken
-from getnotes_cli.config import KNOWLEDGE_API_URL, NOTEBOOKS_API_URL, SUBSCRIBE_NOTEBOOKS_API_URL
+from getnotes_cli.config import (
+    API_CACHE_TTL,
+    KNOWLEDGE_API_URL,
+    NOTEBOOKS_API_URL,
+    SUBSCRIBE_NOTEBOOKS_API_URL,
+)
 
 # 知识库 API 需要的额外 headers（固定值）
 KNOWLEDGE_EXTRA_HEADERS = {
@@ -15,11 +26,17 @@ KNOWLEDGE_EXTRA_HEADERS = {
 }
 
 
-def _build_headers(auth: AuthToken) -> dict[str, str]:
-    """构建知识库 API 请求 headers"""
-    headers = auth.get_headers()
-    headers.update(KNOWLEDGE_EXTRA_HEADERS)
-    return headers
+# 订阅知识库列表查询参数（一次拉取全部）
+SUBSCRIBE_NOTEBOOKS_PARAMS = {
+    "page": 1,
+    "size": 200,
+    "exclude_mine": "true",
+}
+
+
+def _build_headers(auth: AuthToken) -> Mapping[str, str]:
+    """构建知识库 API 请求 headers（不修改 token 缓存的 headers）"""
+    return ChainMap(KNOWLEDGE_EXTRA_HEADERS, auth.get_headers())
 
 
 def fetch_notebooks(auth: AuthToken, client: httpx.Client | None = None) -> list[dict]:
@@ -28,16 +45,12 @@ def fetch_notebooks(auth: AuthToken, client: httpx.Client | None = None) -> list
     Returns:
         知识库列表，每个元素包含 id, id_alias, name, extend_data, root_dir 等
     """
-    _client = client or httpx.Client(timeout=30)
-    try:
-        headers = _build_headers(auth)
-        resp = _client.get(NOTEBOOKS_API_URL, headers=headers, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("c", [])
-    finally:
-        if client is None:
-            _client.close()
+    _client = client or shared_client()
+    headers = _build_headers(auth)
+    resp = _client.get(NOTEBOOKS_API_URL, headers=headers, timeout=30)
+    resp.raise_for_status()
+    data = _json.loads(resp.content)
+    return data.get("c", [])
 
 
 def fetch_notebook_resources(
@@ -59,24 +72,20 @@ def fetch_notebook_resources(
     Returns:
         包含 has_next, resources 等字段的 dict
     """
-    _client = client or httpx.Client(timeout=30)
-    try:
-        params = {
-            "topic_id": -1,
-            "topic_id_alias": topic_id_alias,
-            "directory_id": directory_id,
-            "sort": "create_time_desc",
-            "resource_type": 0,
-            "page": page,
-        }
-        headers = _build_headers(auth)
-        resp = _client.get(KNOWLEDGE_API_URL, headers=headers, params=params, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("c", {})
-    finally:
-        if client is None:
-            _client.close()
+    _client = client or shared_client()
+    params = {
+        "topic_id": -1,
+        "topic_id_alias": topic_id_alias,
+        "directory_id": directory_id,
+        "sort": "create_time_desc",
+        "resource_type": 0,
+        "page": page,
+    }
+    headers = _build_headers(auth)
+    resp = _client.get(KNOWLEDGE_API_URL, headers=headers, params=params, timeout=30)
+    resp.raise_for_status()
+    data = _json.loads(resp.content)
+    return data.get("c", {})
 
 
 def fetch_subscribed_notebooks(
@@ -87,23 +96,138 @@ def fetch_subscribed_notebooks(
     Returns:
         订阅知识库列表，结构与 fetch_notebooks 返回一致
     """
-    _client = client or httpx.Client(timeout=30)
-    try:
-        params = {
-            "page": 1,
-            "size": 200,
-            "exclude_mine": "true",
-        }
-        headers = _build_headers(auth)
-        resp = _client.get(
-            SUBSCRIBE_NOTEBOOKS_API_URL, headers=headers, params=params, timeout=30
-        )
+    _client = client or shared_client()
+    headers = _build_headers(auth)
+    resp = _client.get(
+        SUBSCRIBE_NOTEBOOKS_API_URL,
+        headers=headers,
+        params=SUBSCRIBE_NOTEBOOKS_PARAMS,
+        timeout=30,
+    )
+    resp.raise_for_status()
+    data = _json.loads(resp.content)
+    return data.get("c", {}).get("list", [])
+
+
+def _validators_from(resp: httpx.Response) -> dict[str, str]:
+    """从响应中提取下次条件请求所需的 headers"""
+    validators = {}
+    if etag := resp.headers.get("ETag"):
+        validators["If-None-Match"] = etag
+    if last_modified := resp.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = last_modified
+    return validators
+
+
+def _revalidating_fetcher(
+    auth: AuthToken, url: str, params: dict | None, extract: Callable[[dict], Any]
+) -> Callable[[dict[str, str]], tuple[Any, dict[str, str]]]:
+    """构建 api_cache.get_or_revalidate 使用的条件请求 fetcher"""
+
+    def fetcher(validators: dict[str, str]) -> tuple[Any, dict[str, str]]:
+        headers = ChainMap(validators, _build_headers(auth))
+        resp = shared_client().get(url, headers=headers, params=params, timeout=30)
+        if resp.status_code == 304:
+            return api_cache.NOT_MODIFIED, _validators_from(resp)
         resp.raise_for_status()
-        data = resp.json()
-        return data.get("c", {}).get("list", [])
-    finally:
-        if client is None:
-            _client.close()
+        return extract(_json.loads(resp.content)), _validators_from(resp)
+
+    return fetcher
+
+
+def index_notebooks(notebooks: list[dict]) -> dict:
+    """为知识库列表建立查找索引（不修改列表中的 dict）。
+
+    Returns:
+        {"list": 原列表, "by_id": id_alias → 下标（id 重复时取第一个）,
+         "names_lower": 与列表一一对应的小写名称}
+    """
+    by_id: dict[str, int] = {}
+    for i, nb in enumerate(notebooks):
+        if id_alias := nb.get("id_alias"):
+            by_id.setdefault(id_alias, i)
+    names_lower = [(nb.get("name") or "").lower() for nb in notebooks]
+    return {"list": notebooks, "by_id": by_id, "names_lower": names_lower}
+
+
+def lookup_notebook(index: dict, id_alias: str) -> dict | None:
+    """按 id_alias 查找知识库（index 来自 index_notebooks）"""
+    i = index["by_id"].get(id_alias)
+    return None if i is None else index["list"][i]
+
+
+def match_notebooks(index: dict, name: str) -> list[dict]:
+    """按名称模糊匹配知识库（不区分大小写，index 来自 index_notebooks）"""
+    name_lower = name.lower()
+    return [
+        nb for nb, lowered in zip(index["list"], index["names_lower"])
+        if name_lower in lowered
+    ]
+
+
+def cached_notebook_index(
+    auth: AuthToken,
+    ttl: float = API_CACHE_TTL,
+    *,
+    subscribed: bool = False,
+    refresh: bool = False,
+) -> dict:
+    """读取（订阅）知识库列表缓存，返回 index_notebooks() 结构。
+
+    索引在拉取到新列表时与列表一起写入缓存条目，缓存刷新时一并重建。
+    """
+    if subscribed:
+        key = f"subscribed_notebooks:{auth.token_hash()}"
+        fetcher = _revalidating_fetcher(
+            auth,
+            SUBSCRIBE_NOTEBOOKS_API_URL,
+            SUBSCRIBE_NOTEBOOKS_PARAMS,
+            lambda data: index_notebooks(data.get("c", {}).get("list", [])),
+        )
+    else:
+        key = f"notebooks:{auth.token_hash()}"
+        fetcher = _revalidating_fetcher(
+            auth, NOTEBOOKS_API_URL, None, lambda data: index_notebooks(data.get("c", []))
+        )
+    body = api_cache.get_or_revalidate(key, ttl, fetcher, refresh=refresh)
+    if isinstance(body, list):
+        # 旧版本写入的缓存只有列表，没有索引
+        body = index_notebooks(body)
+    return body
+
+
+def cached_fetch_notebooks(
+    auth: AuthToken, ttl: float = API_CACHE_TTL, *, refresh: bool = False
+) -> list[dict]:
+    """带磁盘 TTL 缓存的 fetch_notebooks。
+
+    缓存过期后携带 ETag / Last-Modified 发起条件请求，未变化时服务端仅返回 304；
+    请求失败时回退到过期缓存。
+    """
+    return cached_notebook_index(auth, ttl, refresh=refresh)["list"]
+
+
+def invalidate_cached_notebooks(auth: AuthToken) -> None:
+    """使 cached_fetch_notebooks 的缓存失效（知识库内容变化后调用）"""
+    api_cache.invalidate(f"notebooks:{auth.token_hash()}")
+
+
+def cached_fetch_subscribed_notebooks(
+    auth: AuthToken, ttl: float = API_CACHE_TTL, *, refresh: bool = False
+) -> list[dict]:
+    """带磁盘 TTL 缓存与条件请求的 fetch_subscribed_notebooks"""
+    return cached_notebook_index(auth, ttl, subscribed=True, refresh=refresh)["list"]
+
+
+def cached_find_notebook(
+    auth: AuthToken,
+    id_alias: str,
+    ttl: float = API_CACHE_TTL,
+    *,
+    subscribed: bool = False,
+) -> dict | None:
+    """按 id_alias 从缓存的（订阅）知识库列表中查找，使用缓存条目自带的索引"""
+    return lookup_notebook(cached_notebook_index(auth, ttl, subscribed=subscribed), id_alias)
 
 
 def add_note_to_notebook(
@@ -130,17 +254,15 @@ def add_note_to_notebook(
     """
     from getnotes_cli.config import ADD_TO_NOTEBOOK_API_URL
 
-    _client = client or httpx.Client(timeout=30)
-    try:
-        headers = auth.get_headers()
-        payload = {
-            "ids": note_id,
-            "topic_id": topic_id,
-            "directory_id": directory_id,
-        }
-        resp = _client.post(ADD_TO_NOTEBOOK_API_URL, headers=headers, json=payload, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    finally:
-        if client is None:
-            _client.close()
+    _client = client or shared_client()
+    headers = auth.get_headers()
+    payload = {
+        "ids": note_id,
+        "topic_id": topic_id,
+        "directory_id": directory_id,
+    }
+    resp = _client.post(
+        ADD_TO_NOTEBOOK_API_URL, headers=headers, content=_json.dumps(payload), timeout=30
+    )
+    resp.raise_for_status()
+    return _json.loads(resp.content)
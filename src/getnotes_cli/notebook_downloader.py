@@ -1,24 +1,29 @@
 """知识库笔记下载器 — 下载知识库内的笔记资源并保存为 Markdown"""
 
-import json
 import logging
 import os
-import time
+import threading
 from datetime import datetime
 from pathlib import Path
 
-import httpx
-
+from getnotes_cli import _json
+from getnotes_cli._fs import ensure_dir
+from getnotes_cli._http import shared_client
 from getnotes_cli.auth import AuthToken
-from getnotes_cli.config import REQUEST_DELAY
+from getnotes_cli.config import DOWNLOAD_CHUNK_SIZE, NOTEBOOK_CONCURRENCY, REQUEST_DELAY
 from getnotes_cli.markdown import (
+    format_date_prefix,
     get_file_extension,
     sanitize_filename,
 )
 from getnotes_cli.notebook import fetch_notebook_resources
+from getnotes_cli.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+# 每个知识库目录下记录 note_id → edit_time，用于增量同步时判断笔记是否有改动
+SYNC_STATE_FILE = ".sync_state.json"
+
 
 class NotebookDownloader:
     """知识库笔记下载器"""
@@ -29,19 +34,30 @@ class NotebookDownloader:
         output_dir: Path,
         *,
         delay: float = REQUEST_DELAY,
+        limiter: RateLimiter | None = None,
         force: bool = False,
         save_json: bool = False,
     ):
         self.token = token
         self.output_dir = output_dir
         self.delay = delay
+        # 列表接口限速；并发下载多个知识库时共享同一个令牌桶
+        self.limiter = limiter or RateLimiter.from_delay(delay)
         self.force = force
         self.save_json = save_json
 
-        self.client = httpx.Client(timeout=60)
-        self.stats = {"notes": 0, "files": 0, "skipped": 0}
-        # note_id → existing folder Path mapping (populated by _scan_existing_notes)
-        self._existing_notes: dict[str, Path] = {}
+        self.client = shared_client()
+        self.stats = {"notes": 0, "unchanged": 0, "files": 0, "skipped": 0}
+        # 多个知识库并发下载时保护 self.stats
+        self._stats_lock = threading.Lock()
+        # 本次运行中已创建的目录，避免每个附件重复 mkdir
+        self._created_dirs: set[Path] = set()
+        # 中断信号：工作线程中的下载无法被 asyncio 取消，由翻页/资源循环主动检查
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """请求停止下载：正在进行的知识库在处理完当前资源后返回"""
+        self.cancelled.set()
 
     def download_notebook(self, notebook: dict) -> dict:
         """下载单个知识库的所有笔记。
@@ -62,9 +78,9 @@ class NotebookDownloader:
         notebook_dir = self.output_dir / "notebooks" / sanitize_filename(name)
         notebook_dir.mkdir(parents=True, exist_ok=True)
 
-        # 扫描已有笔记文件夹，建立 note_id → folder 映射
-        self._existing_notes = {}
-        self._scan_existing_notes(notebook_dir)
+        # 扫描已有笔记文件夹，建立 note_id → folder 映射（每个知识库独立，便于并发）
+        existing_notes = self._scan_existing_notes(notebook_dir)
+        sync_state = self._load_sync_state(notebook_dir)
 
         logger.info("=" * 60)
         logger.info("📚 知识库: %s", name)
@@ -72,19 +88,21 @@ class NotebookDownloader:
         logger.info("   输出目录: %s", notebook_dir)
         logger.info("=" * 60)
 
-        local_stats = {"notes": 0, "files": 0, "skipped": 0}
+        local_stats = {"notes": 0, "unchanged": 0, "files": 0, "skipped": 0}
 
         # 递归下载根目录及其所有子目录
         self._download_directory(
-            topic_id_alias, directory_id, notebook_dir, local_stats
+            topic_id_alias, directory_id, notebook_dir, local_stats, existing_notes, sync_state
         )
+        self._save_sync_state(notebook_dir, sync_state)
 
         # 生成知识库索引
         self._generate_notebook_index(notebook, notebook_dir, local_stats)
 
         # 汇总统计
-        for k in local_stats:
-            self.stats[k] += local_stats[k]
+        with self._stats_lock:
+            for k in local_stats:
+                self.stats[k] += local_stats[k]
 
         logger.info("✅ 知识库 [%s] 下载完成: %d 篇笔记, %d 个文件",
                      name, local_stats['notes'], local_stats['files'])
@@ -97,6 +115,8 @@ class NotebookDownloader:
         directory_id: int,
         target_dir: Path,
         stats: dict,
+        existing_notes: dict[str, Path],
+        sync_state: dict[str, str],
         depth: int = 0,
     ) -> None:
         """递归下载某个目录下的所有资源和子目录。
@@ -106,6 +126,8 @@ class NotebookDownloader:
             directory_id: 目录 ID
             target_dir: 本地目标目录
             stats: 统计字典（原地修改）
+            existing_notes: 已有笔记 note_id → 文件夹映射
+            sync_state: 上次同步的 note_id → edit_time（原地修改）
             depth: 递归深度（用于日志缩进）
         """
         indent = "  " * depth
@@ -113,9 +135,10 @@ class NotebookDownloader:
         files_dir = target_dir / "files"
         page = 1
 
-        while True:
+        while not self.cancelled.is_set():
             logger.info("%s📄 正在拉取第 %d 页 (dir=%s)...", indent, page, directory_id)
 
+            self.limiter.acquire()
             content = fetch_notebook_resources(
                 self.token, topic_id_alias, directory_id, page=page, client=self.client
             )
@@ -126,6 +149,8 @@ class NotebookDownloader:
                 if directories:
                     logger.info("%s  📂 发现 %d 个子目录", indent, len(directories))
                     for sub_dir in directories:
+                        if self.cancelled.is_set():
+                            return
                         sub_name = sub_dir.get("name", "未命名目录")
                         sub_id = sub_dir.get("id", 0)
                         sub_target = target_dir / sanitize_filename(sub_name)
@@ -133,9 +158,9 @@ class NotebookDownloader:
 
                         logger.info("%s  📂 进入子目录: %s", indent, sub_name)
                         self._download_directory(
-                            topic_id_alias, sub_id, sub_target, stats, depth=depth + 1
+                            topic_id_alias, sub_id, sub_target, stats, existing_notes,
+                            sync_state, depth=depth + 1,
                         )
-                        time.sleep(self.delay)
 
             # 处理资源
             resources = content.get("resources", []) or []
@@ -148,13 +173,18 @@ class NotebookDownloader:
             if resources:
                 logger.info("%s  本页 %d 个资源:", indent, len(resources))
                 for resource in resources:
+                    if self.cancelled.is_set():
+                        return
                     resource_type = resource.get("resource_type", "")
                     if resource_type == "NOTE":
-                        notes_dir.mkdir(exist_ok=True)
-                        self._process_note_resource(resource, notes_dir)
+                        ensure_dir(notes_dir, self._created_dirs)
+                        if self._process_note_resource(
+                            resource, notes_dir, existing_notes, sync_state
+                        ) == "unchanged":
+                            stats["unchanged"] += 1
                         stats["notes"] += 1
                     elif resource_type == "FILE":
-                        files_dir.mkdir(parents=True, exist_ok=True)
+                        ensure_dir(files_dir, self._created_dirs)
                         self._process_file_resource(resource, files_dir)
                         stats["files"] += 1
                     else:
@@ -165,74 +195,74 @@ class NotebookDownloader:
                 break
 
             page += 1
-            time.sleep(self.delay)
 
-    def download_all(self, notebooks: list[dict]) -> dict:
-        """下载所有知识库的笔记。"""
-        logger.info("🚀 开始下载 %d 个知识库...", len(notebooks))
+    def download_all(
+        self, notebooks: list[dict], concurrency: int = NOTEBOOK_CONCURRENCY
+    ) -> dict:
+        """下载所有知识库的笔记（多个知识库并发处理，见 download_all_async）"""
+        import asyncio
 
-        for i, nb in enumerate(notebooks, 1):
-            name = nb.get("name", "未命名")
-            logger.info("[%d/%d] 正在处理知识库: %s", i, len(notebooks), name)
-            try:
-                self.download_notebook(nb)
-            except Exception as e:
-                logger.error("  ❌ 下载失败: %s", e)
-            time.sleep(self.delay)
+        from getnotes_cli.async_downloader import download_all_async
 
-        self._print_summary(len(notebooks))
-        return self.stats
+        return asyncio.run(download_all_async(self, notebooks, concurrency))
 
     # ------------------------------------------------------------------
     # 资源处理
     # ------------------------------------------------------------------
 
-    def _process_note_resource(self, resource: dict, notes_dir: Path) -> None:
-        """处理笔记类型资源"""
+    def _process_note_resource(
+        self,
+        resource: dict,
+        notes_dir: Path,
+        existing_notes: dict[str, Path],
+        sync_state: dict[str, str],
+    ) -> str | None:
+        """处理笔记类型资源，返回 "saved"（写入了 note.md）、"unchanged"（未改动而跳过），
+        无笔记数据时返回 None
+
+        已存在的笔记若 edit_time 与上次同步记录一致则跳过；记录不同说明笔记
+        在服务端被编辑过，重新生成 note.md 并重新下载附件。没有记录的已有笔记
+        沿用旧行为直接跳过，并补记当前 edit_time。
+        """
         meta = resource.get("resource_note_meta_data", {})
         if not meta:
-            return
+            return None
 
         title = meta.get("title", "").strip() or "无标题"
         note_id = meta.get("note_id", meta.get("id", "unknown"))
         created_at = meta.get("created_at", "")
+        edit_time = meta.get("edit_time", "")
+        synced = sync_state.get(note_id)
+        edited = synced is not None and synced != edit_time
 
         # 优先通过 note_id 匹配已有文件夹
-        existing_dir = self._existing_notes.get(note_id)
-        if existing_dir and not self.force:
-            md_file = existing_dir / "note.md"
-            if md_file.exists():
-                logger.info("    ⏭ 已存在: %s", title[:40])
-                return
-
-        # 生成新的文件夹名
+        existing_dir = existing_notes.get(note_id)
         folder_name = self._make_note_folder_name(title, created_at, note_id)
         note_dir = existing_dir if existing_dir else notes_dir / folder_name
 
-        if note_dir.exists() and not self.force:
-            md_file = note_dir / "note.md"
-            if md_file.exists():
-                logger.info("    ⏭ 已存在: %s", title[:40])
-                return
+        if not self.force and not edited and (note_dir / "note.md").exists():
+            sync_state[note_id] = edit_time
+            logger.info("    ⏭ 已存在: %s", title[:40])
+            return "unchanged"
 
         note_dir.mkdir(parents=True, exist_ok=True)
         attachments_dir = note_dir / "attachments"
 
-        # 下载附件
-        self._download_note_attachments(meta, attachments_dir, note_dir)
+        # 下载附件（笔记被编辑过时覆盖旧附件，图片/附件可能已被替换）
+        self._download_note_attachments(meta, attachments_dir, note_dir, overwrite=edited)
 
         # 生成 Markdown
         md_content = self._notebook_note_to_markdown(meta, attachments_dir, note_dir)
-        (note_dir / "note.md").write_text(md_content, encoding="utf-8")
+        (note_dir / "note.md").write_bytes(md_content.encode("utf-8"))
 
         # 保存原始 JSON
         if self.save_json:
-            (note_dir / "note.json").write_text(
-                json.dumps(resource, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            (note_dir / "note.json").write_bytes(_json.dumps(resource, indent=True))
+        sync_state[note_id] = edit_time
 
         display_title = title[:40] + "..." if len(title) > 40 else title
         logger.info("    ✨ %s", display_title)
+        return "saved"
 
     def _process_file_resource(self, resource: dict, files_dir: Path) -> None:
         """处理文件类型资源"""
@@ -247,7 +277,7 @@ class NotebookDownloader:
             logger.warning("    ⚠️ 文件无下载链接: %s", name)
             return
 
-        files_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(files_dir, self._created_dirs)
         save_path = files_dir / sanitize_filename(name, max_length=120)
 
         if save_path.exists() and not self.force:
@@ -258,9 +288,9 @@ class NotebookDownloader:
         self._download_file(file_url, save_path)
 
     def _download_note_attachments(
-        self, meta: dict, attachments_dir: Path, note_dir: Path
+        self, meta: dict, attachments_dir: Path, note_dir: Path, overwrite: bool = False
     ) -> bool:
-        """下载笔记类型资源的附件"""
+        """下载笔记类型资源的附件（overwrite=True 时覆盖已存在的文件）"""
         has = False
 
         # 附件（音频/链接等）
@@ -270,7 +300,9 @@ class NotebookDownloader:
             if att_url and att_type != "link":
                 has = True
                 ext = get_file_extension(att_url, f".{att_type or 'bin'}")
-                self._download_file(att_url, attachments_dir / f"attachment_{i + 1}{ext}")
+                self._download_file(
+                    att_url, attachments_dir / f"attachment_{i + 1}{ext}", overwrite
+                )
 
         # 图片
         images = (
@@ -282,22 +314,28 @@ class NotebookDownloader:
             if img_url:
                 has = True
                 ext = get_file_extension(img_url, ".jpg")
-                self._download_file(img_url, attachments_dir / f"image_{i + 1}{ext}")
+                self._download_file(img_url, attachments_dir / f"image_{i + 1}{ext}", overwrite)
 
         return has
 
-    def _download_file(self, url: str, save_path: Path) -> bool:
-        """下载文件，已存在则跳过"""
+    def _download_file(self, url: str, save_path: Path, overwrite: bool = False) -> bool:
+        """下载文件，已存在则跳过（force 或 overwrite 时重新下载）"""
         try:
-            if save_path.exists() and not self.force:
+            if save_path.exists() and not (self.force or overwrite):
                 return True
 
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            with self.client.stream("GET", url, timeout=60) as resp:
-                resp.raise_for_status()
-                with open(save_path, "wb") as f:
-                    for chunk in resp.iter_bytes(8192):
-                        f.write(chunk)
+            ensure_dir(save_path.parent, self._created_dirs)
+            # 先写入 .part 再原子替换，中断的下载不会被下次当作已存在而跳过
+            part_path = save_path.with_name(save_path.name + ".part")
+            try:
+                with self.client.stream("GET", url, timeout=60) as resp:
+                    resp.raise_for_status()
+                    with open(part_path, "wb", buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                        for chunk in resp.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                os.replace(part_path, save_path)
+            finally:
+                part_path.unlink(missing_ok=True)
 
             kb = save_path.stat().st_size / 1024
             logger.info("      ✅ 下载: %s (%.1f KB)", save_path.name, kb)
@@ -412,36 +450,44 @@ class NotebookDownloader:
     # 辅助方法
     # ------------------------------------------------------------------
 
-    def _scan_existing_notes(self, root_dir: Path) -> None:
-        """递归扫描目录下所有已存在的 note.json，建立 note_id → folder 映射。"""
+    def _scan_existing_notes(self, root_dir: Path) -> dict[str, Path]:
+        """递归扫描目录下所有已存在的 note.json，返回 note_id → folder 映射。"""
+        existing: dict[str, Path] = {}
         if not root_dir.exists():
-            return
+            return existing
 
         for json_file in root_dir.rglob("note.json"):
             try:
-                data = json.loads(json_file.read_text(encoding="utf-8"))
+                data = _json.loads(json_file.read_bytes())
                 # notebook_downloader 保存的 JSON 结构是整个 resource 对象
                 meta = data.get("resource_note_meta_data", data)
                 note_id = meta.get("note_id", meta.get("id", ""))
                 if note_id:
-                    self._existing_notes[note_id] = json_file.parent
-            except (json.JSONDecodeError, IOError):
+                    existing[note_id] = json_file.parent
+            except (_json.JSONDecodeError, IOError):
                 continue
 
-        if self._existing_notes:
-            logger.info("  💾 扫描到 %d 个已有笔记", len(self._existing_notes))
+        if existing:
+            logger.info("  💾 扫描到 %d 个已有笔记", len(existing))
+        return existing
+
+    def _load_sync_state(self, notebook_dir: Path) -> dict[str, str]:
+        """读取上次同步记录（note_id → edit_time），文件缺失或损坏时返回空字典"""
+        try:
+            state = _json.loads((notebook_dir / SYNC_STATE_FILE).read_bytes())
+        except (_json.JSONDecodeError, OSError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_sync_state(self, notebook_dir: Path, sync_state: dict[str, str]) -> None:
+        """写回同步记录"""
+        (notebook_dir / SYNC_STATE_FILE).write_bytes(_json.dumps(sync_state))
 
     def _make_note_folder_name(
         self, title: str, created_at: str, note_id: str
     ) -> str:
         """生成笔记文件夹名"""
-        date_prefix = ""
-        if created_at:
-            try:
-                dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-                date_prefix = dt.strftime("%Y%m%d_%H%M%S")
-            except ValueError:
-                date_prefix = created_at.replace(" ", "_").replace(":", "")
+        date_prefix = format_date_prefix(created_at) if created_at else ""
 
         base = f"{date_prefix}_{title}" if title else f"{date_prefix}_{note_id}"
         return sanitize_filename(base)
@@ -484,14 +530,15 @@ class NotebookDownloader:
                         kb = fi.stat().st_size / 1024
                         f.write(f"| {i} | [{fi.name}](files/{fi.name}) | {kb:.1f} KB |\n")
 
-    def _print_summary(self, total_notebooks: int) -> None:
+    def print_summary(self, total_notebooks: int) -> None:
         """打印下载总结"""
         logger.info("=" * 60)
         logger.info("📊 全部知识库下载总结")
         logger.info("=" * 60)
         logger.info("  📚 知识库数:   %d", total_notebooks)
-        logger.info("  📝 笔记:       %d 篇", self.stats['notes'])
+        logger.info("  📝 笔记:       %d 篇（其中未改动跳过 %d 篇）",
+                    self.stats['notes'], self.stats['unchanged'])
         logger.info("  📁 文件:       %d 个", self.stats['files'])
-        logger.info("  ⏭  跳过:       %d 个", self.stats['skipped'])
+        logger.info("  ⏭  跳过未知类型: %d 个", self.stats['skipped'])
         logger.info("  📂 输出目录:   %s", self.output_dir.resolve())
         logger.info("=" * 60)
@@ -0,0 +1,42 @@
+"""请求限速 — 线程安全的令牌桶，替代逐请求的固定 sleep"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """令牌桶限速器，可在多个线程间共享。
+
+    与每次请求后固定 sleep 不同，只有当请求速率超过 rate 时才会阻塞：
+    若请求本身耗时已超过间隔，acquire() 立即返回。
+
+    Args:
+        rate: 每秒允许的请求数；<= 0 表示不限速
+        capacity: 桶容量（允许的最大突发请求数）
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_delay(cls, delay: float) -> "RateLimiter":
+        """由请求间隔（秒）构建，如 delay=0.5 → rate=2.0 req/s"""
+        return cls(1.0 / delay if delay > 0 else 0)
+
+    def acquire(self) -> None:
+        """获取一个令牌，必要时阻塞等待"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # 先预订令牌（允许为负），锁外 sleep，保证多线程按到达顺序排队
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
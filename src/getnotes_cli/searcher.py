@@ -4,6 +4,7 @@ import re
 
 import httpx
 
+from getnotes_cli import _json
 from getnotes_cli.auth import AuthToken
 from getnotes_cli.config import SEARCH_API_URL
 
@@ -44,7 +45,7 @@ class NoteSearcher:
             timeout=30,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = _json.loads(resp.content)
 
         content = data.get("c", {})
         return {
@@ -1,10 +1,10 @@
 """用户配置持久化管理 — 保存到 ~/.getnotes-cli/config.json"""
 
-import json
 from pathlib import Path
 from typing import Any, Optional
 
-from getnotes_cli.config import CONFIG_DIR
+from getnotes_cli import _json
+from getnotes_cli.config import CONFIG_DIR, get_default_output_dir
 
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
@@ -34,19 +34,14 @@ class UserSettings:
     # ------------------------------------------------------------------
 
     def _load(self) -> dict[str, Any]:
-        if CONFIG_FILE.exists():
-            try:
-                return json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, OSError):
-                return {}
-        return {}
+        try:
+            return _json.loads(CONFIG_FILE.read_bytes())
+        except (_json.JSONDecodeError, OSError):
+            return {}
 
     def _save(self) -> None:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        CONFIG_FILE.write_text(
-            json.dumps(self._data, ensure_ascii=False, indent=2) + "\n",
-            encoding="utf-8",
-        )
+        CONFIG_FILE.write_bytes(_json.dumps(self._data, indent=True) + b"\n")
 
     # ------------------------------------------------------------------
     # 公共 API
@@ -104,7 +99,7 @@ def _get_settings() -> UserSettings:
     return _settings
 
 
-def resolve_output(cli_value: Optional[str], default: str) -> str:
+def resolve_output(cli_value: Optional[str], default: Optional[str]) -> Optional[str]:
     """解析 output 的最终值"""
     if cli_value is not None:
         return cli_value
@@ -112,6 +107,12 @@ def resolve_output(cli_value: Optional[str], default: str) -> str:
     return saved if saved is not None else default
 
 
+def resolve_output_dir(cli_value: Optional[str]) -> Path:
+    """解析最终的下载目录；命令行与配置文件均未指定时才计算默认目录"""
+    value = resolve_output(cli_value, None)
+    return Path(value) if value is not None else get_default_output_dir()
+
+
 def resolve_delay(cli_value: Optional[float], default: float) -> float:
     """解析 delay 的最终值"""
     if cli_value is not None:
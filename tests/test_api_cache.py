@@ -0,0 +1,106 @@
+"""Tests for getnotes_cli.api_cache module"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from getnotes_cli import api_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    """Point the API cache at a temp dir so we don't touch ~/.getnotes-cli."""
+    with patch.object(api_cache, "API_CACHE_DIR", tmp_path / "api_cache"):
+        api_cache.clear()
+        yield tmp_path / "api_cache"
+        api_cache.clear()
+
+
+class TestGetOrFetch:
+    def test_fetches_and_caches(self):
+        fetcher = MagicMock(return_value=[{"id": 1}])
+        assert api_cache.get_or_fetch("k", 60, fetcher) == [{"id": 1}]
+        assert api_cache.get_or_fetch("k", 60, fetcher) == [{"id": 1}]
+        assert fetcher.call_count == 1
+
+    def test_refetches_when_expired(self):
+        fetcher = MagicMock(side_effect=[["old"], ["new"]])
+        api_cache.get_or_fetch("k", 0, fetcher)
+        assert api_cache.get_or_fetch("k", 0, fetcher) == ["new"]
+
+    def test_refresh_bypasses_fresh_entry(self):
+        fetcher = MagicMock(side_effect=[["old"], ["new"]])
+        api_cache.get_or_fetch("k", 60, fetcher)
+        assert api_cache.get_or_fetch("k", 60, fetcher, refresh=True) == ["new"]
+
+    def test_keys_are_isolated(self):
+        api_cache.get_or_fetch("a", 60, lambda: "A")
+        assert api_cache.get_or_fetch("b", 60, lambda: "B") == "B"
+
+    def test_falls_back_to_stale_on_error(self):
+        api_cache.get_or_fetch("k", 0, lambda: ["stale"])
+        failing = MagicMock(side_effect=RuntimeError("offline"))
+        assert api_cache.get_or_fetch("k", 0, failing) == ["stale"]
+
+    def test_raises_without_cached_entry(self):
+        failing = MagicMock(side_effect=RuntimeError("offline"))
+        with pytest.raises(RuntimeError):
+            api_cache.get_or_fetch("k", 60, failing)
+
+    def test_ignores_corrupt_entry(self, cache_dir):
+        api_cache.get_or_fetch("k", 60, lambda: "v")
+        next(cache_dir.glob("*.json")).write_text("!!!", encoding="utf-8")
+        api_cache._memory.clear()
+        assert api_cache.get_or_fetch("k", 60, lambda: "fresh") == "fresh"
+
+    def test_fresh_entry_served_from_memory(self, cache_dir):
+        api_cache.get_or_fetch("k", 60, lambda: "v")
+        for path in cache_dir.glob("*.json"):
+            path.unlink()
+        assert api_cache.get_or_fetch("k", 60, lambda: "refetched") == "v"
+
+
+class TestGetOrRevalidate:
+    def test_sends_saved_validators_after_expiry(self):
+        fetcher = MagicMock(side_effect=[(["v1"], {"If-None-Match": '"e1"'}), (["v2"], {})])
+        api_cache.get_or_revalidate("k", 0, fetcher)
+        assert api_cache.get_or_revalidate("k", 0, fetcher) == ["v2"]
+        assert fetcher.call_args_list[0].args == ({},)
+        assert fetcher.call_args_list[1].args == ({"If-None-Match": '"e1"'},)
+
+    def test_not_modified_reuses_cached_body(self):
+        api_cache.get_or_revalidate("k", 0, lambda v: (["cached"], {"If-None-Match": '"e1"'}))
+        fetcher = MagicMock(return_value=(api_cache.NOT_MODIFIED, {}))
+        assert api_cache.get_or_revalidate("k", 0, fetcher) == ["cached"]
+        # 304 后仍保留原有 validators
+        api_cache.get_or_revalidate("k", 0, fetcher)
+        assert fetcher.call_args.args == ({"If-None-Match": '"e1"'},)
+
+    def test_fresh_entry_skips_fetcher(self):
+        api_cache.get_or_revalidate("k", 60, lambda v: ("v", {"If-None-Match": '"e1"'}))
+        fetcher = MagicMock()
+        assert api_cache.get_or_revalidate("k", 60, fetcher) == "v"
+        fetcher.assert_not_called()
+
+
+class TestInvalidate:
+    def test_removes_only_the_given_key(self):
+        api_cache.get_or_fetch("a", 60, lambda: "A")
+        api_cache.get_or_fetch("b", 60, lambda: "B")
+        assert api_cache.invalidate("a") is True
+        assert api_cache.get_or_fetch("a", 60, lambda: "A2") == "A2"
+        assert api_cache.get_or_fetch("b", 60, lambda: "B2") == "B"
+
+    def test_missing_key(self):
+        assert api_cache.invalidate("nope") is False
+
+
+class TestClear:
+    def test_clear_removes_entries(self):
+        api_cache.get_or_fetch("a", 60, lambda: 1)
+        api_cache.get_or_fetch("b", 60, lambda: 2)
+        assert api_cache.count() == 2
+        assert api_cache.clear() == 2
+        assert api_cache.count() == 0
+
+    def test_clear_when_missing_dir(self):
+        assert api_cache.clear() == 0
@@ -0,0 +1,86 @@
+"""Tests for getnotes_cli.async_downloader module"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from getnotes_cli.async_downloader import download_all_async
+from getnotes_cli.auth import AuthToken
+from getnotes_cli.notebook_downloader import NotebookDownloader
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    return NotebookDownloader(AuthToken(authorization="Bearer t"), tmp_path, delay=0)
+
+
+def make_notebooks(count: int) -> list[dict]:
+    return [{"name": f"nb{i}", "id_alias": f"a{i}"} for i in range(count)]
+
+
+class TestDownloadAllAsync:
+    def test_runs_every_notebook_within_concurrency(self, downloader):
+        active = peak = 0
+        seen = []
+        lock = threading.Lock()
+
+        def download_notebook(nb):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+                seen.append(nb["name"])
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        downloader.download_notebook = download_notebook
+        asyncio.run(download_all_async(downloader, make_notebooks(6), concurrency=2))
+        assert sorted(seen) == sorted(nb["name"] for nb in make_notebooks(6))
+        assert peak <= 2
+
+    def test_failed_notebook_does_not_stop_others(self, downloader, caplog):
+        seen = []
+
+        def download_notebook(nb):
+            if nb["name"] == "nb0":
+                raise RuntimeError("boom")
+            seen.append(nb["name"])
+
+        downloader.download_notebook = download_notebook
+        asyncio.run(download_all_async(downloader, make_notebooks(3), concurrency=1))
+        assert seen == ["nb1", "nb2"]
+        assert "boom" in caplog.text
+
+    def test_cancel_stops_worker_threads(self, downloader):
+        started = threading.Event()
+
+        def download_notebook(nb):
+            # 模拟一个耗时 3 秒、会检查中断信号的知识库下载
+            started.set()
+            downloader.cancelled.wait(3)
+
+        downloader.download_notebook = download_notebook
+
+        async def main():
+            task = asyncio.create_task(download_all_async(downloader, make_notebooks(4)))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        asyncio.run(main())
+        assert downloader.cancelled.is_set()
+        assert time.monotonic() - start < 1
+
+
+class TestDownloadAll:
+    def test_sync_wrapper_uses_async_driver(self, downloader):
+        seen = []
+        downloader.download_notebook = lambda nb: seen.append(nb["name"])
+        assert downloader.download_all(make_notebooks(3), concurrency=2) is downloader.stats
+        assert sorted(seen) == ["nb0", "nb1", "nb2"]
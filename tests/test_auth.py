@@ -1,5 +1,6 @@
 """Tests for getnotes_cli.auth module"""
 
+import dataclasses
 import json
 import time
 import pytest
@@ -21,6 +22,12 @@ class TestAuthToken:
         defaults.update(kwargs)
         return AuthToken(**defaults)
 
+    def test_token_hash_is_stable_and_opaque(self):
+        token = self._make_token(authorization="Bearer secret")
+        assert token.token_hash() == self._make_token(authorization="Bearer secret").token_hash()
+        assert token.token_hash() != self._make_token(authorization="Bearer other").token_hash()
+        assert "secret" not in token.token_hash()
+
     def test_to_dict_roundtrip(self):
         token = self._make_token()
         d = token.to_dict()
@@ -77,6 +84,30 @@ class TestAuthToken:
         for key in DEFAULT_HEADERS:
             assert key in headers
 
+    def test_get_headers_is_reused(self):
+        token = self._make_token()
+        assert token.get_headers() is token.get_headers()
+
+    def test_get_headers_is_read_only(self):
+        token = self._make_token()
+        with pytest.raises(TypeError):
+            token.get_headers()["X-Extra"] = "1"
+
+    def test_extra_headers_override_defaults(self):
+        token = self._make_token(extra_headers={"User-Agent": "custom"})
+        assert token.get_headers()["User-Agent"] == "custom"
+
+    def test_token_is_immutable(self):
+        token = self._make_token(authorization="Bearer old")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            token.authorization = "Bearer new"
+
+    def test_replaced_token_builds_fresh_headers(self):
+        token = self._make_token(authorization="Bearer old")
+        token.get_headers()
+        renewed = dataclasses.replace(token, authorization="Bearer new")
+        assert renewed.get_headers()["Authorization"] == "Bearer new"
+
     def test_to_dict_contains_all_fields(self):
         token = self._make_token(
             authorization="Bearer t",
@@ -122,6 +153,25 @@ class TestLoadCachedToken:
         with patch("getnotes_cli.auth.AUTH_CACHE_FILE", cache_file):
             assert load_cached_token() is None
 
+    def test_reuses_parsed_token_when_file_unchanged(self, tmp_path):
+        cache_file = tmp_path / "auth.json"
+        cache_file.write_text(json.dumps({"authorization": "Bearer a"}), encoding="utf-8")
+        with patch("getnotes_cli.auth.AUTH_CACHE_FILE", cache_file):
+            first = load_cached_token()
+            second = load_cached_token()
+        assert first is second
+
+    def test_reloads_after_save_token(self, tmp_path):
+        cache_file = tmp_path / "auth.json"
+        with (
+            patch("getnotes_cli.auth.AUTH_CACHE_FILE", cache_file),
+            patch("getnotes_cli.auth.CONFIG_DIR", tmp_path),
+        ):
+            save_token(AuthToken(authorization="Bearer old"))
+            assert load_cached_token().authorization == "Bearer old"
+            save_token(AuthToken(authorization="Bearer new"))
+            assert load_cached_token().authorization == "Bearer new"
+
 
 class TestSaveToken:
     def test_saves_token_to_file(self, tmp_path):
@@ -141,6 +191,21 @@ class TestSaveToken:
         data = json.loads(cache_file.read_text(encoding="utf-8"))
         assert data["authorization"] == "Bearer saved"
 
+    def test_saved_file_matches_to_dict(self, tmp_path):
+        cache_file = tmp_path / "auth.json"
+        token = AuthToken(
+            authorization="Bearer 令牌",
+            csrf_token="c",
+            extra_headers={"X-Av": "1"},
+            extracted_at=1712345678.125,
+        )
+        with (
+            patch("getnotes_cli.auth.AUTH_CACHE_FILE", cache_file),
+            patch("getnotes_cli.auth.CONFIG_DIR", tmp_path),
+        ):
+            save_token(token)
+        assert json.loads(cache_file.read_text(encoding="utf-8")) == token.to_dict()
+
     def test_creates_config_dir_if_missing(self, tmp_path):
         sub_dir = tmp_path / "subdir"
         cache_file = sub_dir / "auth.json"
@@ -152,6 +217,25 @@ class TestSaveToken:
             save_token(token)
         assert cache_file.exists()
 
+    def test_config_dir_created_only_when_missing(self, tmp_path):
+        sub_dir = tmp_path / "once"
+        cache_file = sub_dir / "auth.json"
+        real_mkdir = Path.mkdir
+        with (
+            patch("getnotes_cli.auth.AUTH_CACHE_FILE", cache_file),
+            patch("getnotes_cli.auth.CONFIG_DIR", sub_dir),
+            patch.object(Path, "mkdir", autospec=True, side_effect=real_mkdir) as mkdir,
+        ):
+            save_token(AuthToken(authorization="Bearer a"))
+            save_token(AuthToken(authorization="Bearer b"))
+            assert mkdir.call_count == 1
+            # 目录在进程运行期间被删除后仍能重新创建
+            cache_file.unlink()
+            sub_dir.rmdir()
+            save_token(AuthToken(authorization="Bearer c"))
+        assert mkdir.call_count == 2
+        assert cache_file.exists()
+
 
 class TestLoginWithToken:
     def test_adds_bearer_prefix_if_missing(self, tmp_path):
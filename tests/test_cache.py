@@ -5,7 +5,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch
 
-from getnotes_cli.cache import CacheManager
+from getnotes_cli.cache import CHECK_PREVIEW_LIMIT, CacheManager
 
 
 def make_manager(tmp_path: Path) -> CacheManager:
@@ -47,6 +47,15 @@ class TestCacheManagerIsCached:
         assert mgr.is_cached(note)
 
 
+    def test_update_refreshes_signature(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1, "updated_at": "2024-01-01"})
+        note = {"note_id": "n1", "version": 2, "updated_at": "2024-01-02"}
+        assert not mgr.is_cached(note)
+        mgr.update("n1", {"version": 2, "updated_at": "2024-01-02"})
+        assert mgr.is_cached(note)
+
+
 class TestCacheManagerUpdateAndGet:
     def test_update_stores_info(self, tmp_path):
         mgr = make_manager(tmp_path)
@@ -82,6 +91,12 @@ class TestCacheManagerCountAndManifest:
         assert m is mgr._manifest  # manifest returns the internal dict directly
         assert "x" in m
 
+    def test_by_folder_maps_folder_to_entry(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"folder_name": "20240101_a", "title": "A"})
+        mgr.update("n2", {"title": "no folder"})
+        assert mgr.by_folder() == {"20240101_a": ("n1", {"folder_name": "20240101_a", "title": "A"})}
+
 
 class TestCacheManagerLoadSave:
     def test_load_returns_empty_when_no_file(self, tmp_path):
@@ -98,6 +113,18 @@ class TestCacheManagerLoadSave:
         loaded = mgr2.load()
         assert loaded["n1"]["title"] == "Test"
 
+    def test_save_is_compact_by_default(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.save()
+        assert b"\n" not in mgr.cache_path.read_bytes()
+
+    def test_save_pretty_indents(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.save(pretty=True)
+        assert mgr.cache_path.read_text(encoding="utf-8").startswith('{\n  "n1"')
+
     def test_load_returns_empty_on_corrupt_json(self, tmp_path):
         mgr = make_manager(tmp_path)
         mgr.cache_path.write_text("!!!corrupt!!!", encoding="utf-8")
@@ -105,6 +132,72 @@ class TestCacheManagerLoadSave:
         assert result == {}
 
 
+class TestCacheManagerLog:
+    def test_update_appends_to_log(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.update("n2", {"version": 2})
+        lines = mgr.log_path.read_bytes().splitlines()
+        assert len(lines) == 2
+        assert not mgr.cache_path.exists()
+
+    def test_load_replays_log_over_snapshot(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.save()
+        mgr.update("n1", {"version": 2})
+        mgr.update("n2", {"version": 1})
+
+        mgr2 = make_manager(tmp_path)
+        loaded = mgr2.load()
+        assert loaded["n1"]["version"] == 2
+        assert "n2" in loaded
+
+    def test_load_ignores_truncated_log_line(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        with open(mgr.log_path, "ab") as f:
+            f.write(b'{"id": "n2", "in')
+
+        mgr2 = make_manager(tmp_path)
+        loaded = mgr2.load()
+        assert list(loaded) == ["n1"]
+
+    def test_compact_writes_snapshot_and_removes_log(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.compact()
+        assert not mgr.log_path.exists()
+        data = json.loads(mgr.cache_path.read_text(encoding="utf-8"))
+        assert data == {"n1": {"version": 1}}
+
+    def test_compact_skips_rewrite_when_unchanged(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr.compact()
+        mgr2 = make_manager(tmp_path)
+        mgr2.load()
+        with patch("getnotes_cli.cache.os.replace") as replace:
+            mgr2.compact()
+        replace.assert_not_called()
+
+    def test_compact_after_replaying_log(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {"version": 1})
+        mgr2 = make_manager(tmp_path)
+        mgr2.load()
+        mgr2.compact()
+        assert not mgr2.log_path.exists()
+        assert json.loads(mgr2.cache_path.read_text(encoding="utf-8")) == {"n1": {"version": 1}}
+
+    def test_update_compacts_when_log_too_large(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        with patch("getnotes_cli.cache.LOG_COMPACT_THRESHOLD", 10):
+            mgr.update("n1", {"title": "long enough to exceed"})
+        assert mgr.cache_path.exists()
+        assert not mgr.log_path.exists()
+
+
 class TestCacheManagerCheck:
     def test_check_when_no_cache_file(self, tmp_path):
         mgr = make_manager(tmp_path)
@@ -124,6 +217,25 @@ class TestCacheManagerCheck:
         assert "n1" in result["notes"]
         assert result["notes"]["n1"]["title"] == "Note"
 
+    def test_check_limits_notes_preview(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        for i in range(CHECK_PREVIEW_LIMIT + 5):
+            mgr.update(f"n{i}", {"title": f"Note {i}"})
+
+        result = make_manager(tmp_path).check()
+        assert result["count"] == CHECK_PREVIEW_LIMIT + 5
+        assert len(result["notes"]) == CHECK_PREVIEW_LIMIT
+
+    def test_clear_after_check_does_not_reload(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {})
+
+        mgr2 = make_manager(tmp_path)
+        mgr2.check()
+        with patch.object(mgr2, "load") as load:
+            assert mgr2.clear() == 1
+        load.assert_not_called()
+
 
 class TestCacheManagerRebuildFromDisk:
     def test_rebuild_zero_when_notes_dir_missing(self, tmp_path):
@@ -183,6 +295,19 @@ class TestCacheManagerRebuildFromDisk:
         count = mgr.rebuild_from_disk(notes_dir)
         assert count == 0
 
+    def test_rebuild_many_folders(self, tmp_path):
+        notes_dir = tmp_path / "notes"
+        for i in range(40):
+            folder = notes_dir / f"folder_{i:02d}"
+            folder.mkdir(parents=True)
+            (folder / "note.json").write_text(
+                json.dumps({"note_id": f"n{i}", "title": f"T{i}"}), encoding="utf-8"
+            )
+
+        mgr = make_manager(tmp_path)
+        assert mgr.rebuild_from_disk(notes_dir) == 40
+        assert mgr.get("n7")["folder_name"] == "folder_07"
+
     def test_rebuild_saves_manifest(self, tmp_path):
         notes_dir = tmp_path / "notes"
         folder = notes_dir / "n1_folder"
@@ -206,8 +331,28 @@ class TestCacheManagerClear:
         mgr.update("n1", {})
         mgr.update("n2", {})
         mgr.save()
+        mgr.check()
 
         count = mgr.clear()
         assert count == 2
         assert not mgr.cache_path.exists()
         assert mgr.count == 0
+
+    def test_clear_removes_pending_log(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {})
+
+        mgr2 = make_manager(tmp_path)
+        mgr2.check()
+        assert mgr2.clear() == 1
+        assert not mgr2.log_path.exists()
+
+    def test_clear_without_load_skips_parsing(self, tmp_path):
+        mgr = make_manager(tmp_path)
+        mgr.update("n1", {})
+
+        mgr2 = make_manager(tmp_path)
+        with patch.object(mgr2, "load") as load:
+            assert mgr2.clear() is None
+        load.assert_not_called()
+        assert not mgr2.log_path.exists()
@@ -0,0 +1,171 @@
+"""Tests for getnotes_cli.cdp module"""
+
+import socket
+
+import pytest
+from unittest.mock import patch
+
+from getnotes_cli import _json, cdp
+
+
+class FakeWebSocket:
+    """Scripted stand-in for websocket.WebSocket: recv() replays queued frames."""
+
+    def __init__(self, frames=()):
+        self.frames = list(frames)
+        self.sent = []
+        self.closed = False
+
+    def send(self, payload):
+        self.sent.append(_json.loads(payload))
+
+    def recv(self):
+        frame = self.frames.pop(0)
+        if isinstance(frame, Exception):
+            raise frame
+        return frame if isinstance(frame, (str, bytes)) else _json.dumps(frame).decode()
+
+    def settimeout(self, timeout):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_ws():
+    ws = FakeWebSocket()
+    with patch("websocket.create_connection", return_value=ws):
+        yield ws
+
+
+def auth_event(url="https://get-notes.luojilab.com/voicenotes/web/notes", **headers):
+    return {
+        "method": "Network.requestWillBeSent",
+        "params": {"request": {"url": url, "headers": headers}},
+    }
+
+
+class TestCDPSession:
+    def test_matches_response_by_id(self, fake_ws):
+        fake_ws.frames = [
+            {"method": "Network.dataReceived", "params": {}},
+            {"id": 99, "result": {"stale": True}},
+            {"id": 1, "result": {"value": "ok"}},
+        ]
+        with cdp.CDPSession("ws://fake") as session:
+            assert session.send("Runtime.evaluate", {"expression": "1"}) == {"value": "ok"}
+        assert fake_ws.sent == [
+            {"id": 1, "method": "Runtime.evaluate", "params": {"expression": "1"}}
+        ]
+        assert fake_ws.closed
+
+    def test_ids_increment_per_command(self, fake_ws):
+        fake_ws.frames = [{"id": 1, "result": {}}, {"id": 2, "result": {"n": 2}}]
+        session = cdp.CDPSession("ws://fake")
+        session.send("Page.enable")
+        assert session.send("Page.navigate", {"url": "x"}) == {"n": 2}
+        assert [msg["id"] for msg in fake_ws.sent] == [1, 2]
+        assert fake_ws.sent[0]["params"] == {}
+
+    def test_missing_result_returns_empty_dict(self, fake_ws):
+        fake_ws.frames = [{"id": 1}]
+        assert cdp.execute_cdp_command("ws://fake", "Network.enable") == {}
+        assert fake_ws.closed
+
+    def test_page_helpers_share_one_session(self, fake_ws):
+        fake_ws.frames = [
+            {"id": 1, "result": {}},
+            {"id": 2, "result": {"result": {"type": "string", "value": "https://www.biji.com/"}}},
+            {"id": 3, "result": {}},
+            {"id": 4, "result": {"frameId": "f"}},
+        ]
+        with cdp.CDPSession("ws://fake") as session:
+            assert cdp.get_current_url(session) == "https://www.biji.com/"
+            cdp.navigate_to_url(session, "https://www.biji.com/notes")
+        assert [msg["method"] for msg in fake_ws.sent] == [
+            "Runtime.enable", "Runtime.evaluate", "Page.enable", "Page.navigate",
+        ]
+        assert fake_ws.sent[-1]["params"] == {"url": "https://www.biji.com/notes"}
+
+
+class TestFrameFilter:
+    def test_candidate_frame(self):
+        frame = _json.dumps(auth_event(Authorization="Bearer t"))
+        assert cdp._is_candidate_frame(frame)
+        assert cdp._is_candidate_frame(frame.decode())
+
+    def test_rejects_other_frames(self):
+        assert not cdp._is_candidate_frame(_json.dumps(auth_event(Cookie="c")))
+        assert not cdp._is_candidate_frame('{"method": "Network.responseReceived", "Authorization"}')
+
+    def test_api_domain_regex(self):
+        assert cdp._API_RE.search("https://knowledge-api.trytalks.com/v1/x")
+        assert cdp._API_RE.search("https://get-notes.luojilab.com/api")
+        assert not cdp._API_RE.search("https://get-notes-luojilab.com/api")
+
+
+class TestPorts:
+    def test_port_in_use(self):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+            port = server.getsockname()[1]
+            assert cdp._port_in_use(port)
+        assert not cdp._port_in_use(port)
+
+    def test_find_available_port_skips_busy(self):
+        with patch.object(cdp, "_port_in_use", side_effect=lambda p: p < 9224):
+            assert cdp.find_available_port(9222, 5) == 9224
+
+    def test_find_available_port_exhausted(self):
+        with patch.object(cdp, "_port_in_use", return_value=True):
+            with pytest.raises(RuntimeError):
+                cdp.find_available_port(9222, 3)
+
+    def test_find_existing_chrome_returns_lowest_port(self):
+        urls = {9224: "ws://b", 9226: "ws://c"}
+        with patch.object(cdp, "_probe_port", side_effect=urls.get):
+            assert cdp.find_existing_chrome(range(9222, 9228)) == (9224, "ws://b")
+
+    def test_find_existing_chrome_none(self):
+        with patch.object(cdp, "_probe_port", return_value=None):
+            assert cdp.find_existing_chrome() == (None, None)
+        assert cdp.find_existing_chrome(range(0)) == (None, None)
+
+
+class TestExtractAuth:
+    @pytest.fixture
+    def chrome(self, fake_ws):
+        page = {"url": "https://www.biji.com/", "webSocketDebuggerUrl": "ws://page"}
+        with patch.object(cdp, "find_existing_chrome", return_value=(9222, "ws://browser")), \
+             patch.object(cdp, "_find_biji_page", return_value=page), \
+             patch.object(cdp, "terminate_chrome") as terminate:
+            yield fake_ws, terminate
+
+    def test_captures_bearer_token(self, chrome, capsys):
+        ws, terminate = chrome
+        ws.frames = [
+            {"method": "Network.requestWillBeSent", "params": {}},
+            {"id": 1, "result": {}},
+            auth_event("https://cdn.example.com/a.js", Authorization="Bearer other"),
+            auth_event(Authorization="Basic x"),
+            auth_event(Authorization="Bearer tok", **{"Xi-Csrf-Token": "csrf", "Cookie": "c"}),
+        ]
+        headers = cdp.extract_auth_via_cdp(auto_launch=False, login_timeout=5)
+        assert headers == {"Authorization": "Bearer tok", "Xi-Csrf-Token": "csrf"}
+        assert ws.sent[0]["method"] == "Network.enable"
+        assert ws.closed
+        # 复用已有 Chrome 时不关闭浏览器
+        terminate.assert_not_called()
+
+    def test_ignores_malformed_frames(self, chrome, capsys):
+        ws, _ = chrome
+        ws.frames = [
+            {"id": 1, "result": {}},
+            '{"Authorization" Network.requestWillBeSent',
+            OSError("recv failed"),
+            auth_event(Authorization="Bearer tok"),
+        ]
+        headers = cdp.extract_auth_via_cdp(auto_launch=False, login_timeout=5)
+        assert headers == {"Authorization": "Bearer tok"}
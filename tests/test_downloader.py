@@ -0,0 +1,97 @@
+"""Tests for getnotes_cli.downloader module"""
+
+import logging
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from getnotes_cli.auth import AuthToken
+from getnotes_cli.downloader import NoteDownloader
+
+
+def make_downloader(tmp_path, notes, **kwargs) -> NoteDownloader:
+    """NoteDownloader whose single API page returns `notes`; caches live in tmp_path."""
+    downloader = NoteDownloader(
+        AuthToken(authorization="Bearer t"), tmp_path / "out", delay=0, limit=None, **kwargs
+    )
+    downloader.cache.cache_path = tmp_path / "cache_manifest.json"
+    page = {"c": {"list": notes, "has_more": False, "total_items": len(notes)}}
+    downloader._fetch_page = lambda since_id="": (page, b"{}")
+    return downloader
+
+
+def make_notes(count: int) -> list[dict]:
+    return [{"note_id": f"n{i}", "id": f"n{i}", "title": f"Note {i}"} for i in range(count)]
+
+
+class TestRunPipeline:
+    def test_processes_every_note(self, tmp_path):
+        downloader = make_downloader(tmp_path, make_notes(10))
+        seen = []
+        lock = threading.Lock()
+
+        def process(note, index=None):
+            with lock:
+                seen.append(note["note_id"])
+            return "new"
+
+        downloader._process_note = process
+        downloader.run()
+        assert sorted(seen) == sorted(n["note_id"] for n in make_notes(10))
+
+    def test_worker_error_propagates(self, tmp_path, caplog):
+        downloader = make_downloader(tmp_path, make_notes(50), page_size=10)
+
+        def process(note, index=None):
+            time.sleep(0.05)
+            if note["note_id"] == "n0":
+                raise RuntimeError("disk full")
+            return "new"
+
+        downloader._process_note = process
+        with caplog.at_level(logging.ERROR), pytest.raises(RuntimeError, match="disk full"):
+            downloader.run()
+        # 被取消的排队笔记不应在回调中再抛出 CancelledError
+        assert "exception calling callback" not in caplog.text
+
+    def test_in_flight_notes_are_bounded(self, tmp_path):
+        downloader = make_downloader(tmp_path, make_notes(20), page_size=2)
+        release = threading.Event()
+
+        def process(note, index=None):
+            release.wait(5)
+            return "new"
+
+        downloader._process_note = process
+        runner = threading.Thread(target=downloader.run)
+        runner.start()
+        try:
+            deadline = time.monotonic() + 5
+            while downloader.total_processed < 4 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            # 已提交未完成的笔记数不超过 page_size * 2
+            assert downloader.total_processed == 4
+        finally:
+            release.set()
+            runner.join(5)
+        assert downloader.total_processed == 20
+
+
+class TestDownloadFile:
+    def test_duplicate_url_is_copied_not_linked(self, tmp_path):
+        downloader = make_downloader(tmp_path, [])
+        resp = MagicMock()
+        resp.iter_bytes.return_value = [b"image-bytes"]
+        downloader.client = MagicMock()
+        downloader.client.stream.return_value.__enter__.return_value = resp
+
+        first = tmp_path / "a" / "image_1.jpg"
+        second = tmp_path / "b" / "image_1.jpg"
+        assert downloader._download_file("https://cdn/x.jpg", first)
+        assert downloader._download_file("https://cdn/x.jpg", second)
+
+        assert downloader.client.stream.call_count == 1
+        assert second.read_bytes() == b"image-bytes"
+        assert first.stat().st_ino != second.stat().st_ino
@@ -0,0 +1,46 @@
+"""Tests for getnotes_cli._json module"""
+
+import json
+import pytest
+from unittest.mock import patch
+
+import getnotes_cli._json as json_module
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request):
+    """Run each test against orjson (if installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if json_module.orjson is None:
+            pytest.skip("orjson not installed")
+        yield
+    else:
+        with patch.object(json_module, "orjson", None):
+            yield
+
+
+class TestDumps:
+    def test_returns_bytes(self, backend):
+        assert isinstance(json_module.dumps({"a": 1}), bytes)
+
+    def test_keeps_chinese_unescaped(self, backend):
+        out = json_module.dumps({"title": "我的笔记"})
+        assert "我的笔记".encode("utf-8") in out
+
+    def test_indent_uses_two_spaces(self, backend):
+        out = json_module.dumps({"a": 1}, indent=True).decode("utf-8")
+        assert out == '{\n  "a": 1\n}'
+
+    def test_compact_output_is_valid_json(self, backend):
+        data = {"n1": {"version": 1, "title": "T"}}
+        assert json.loads(json_module.dumps(data)) == data
+
+
+class TestLoads:
+    def test_accepts_bytes_and_str(self, backend):
+        assert json_module.loads(b'{"a": 1}') == {"a": 1}
+        assert json_module.loads('{"a": 1}') == {"a": 1}
+
+    def test_invalid_input_raises_json_decode_error(self, backend):
+        with pytest.raises(json_module.JSONDecodeError):
+            json_module.loads(b"not-json")
@@ -1,13 +1,16 @@
 """Tests for getnotes_cli.markdown module"""
 
+import io
 import pytest
 from pathlib import Path
 
 from getnotes_cli.markdown import (
     sanitize_filename,
     get_file_extension,
+    format_date_prefix,
     format_duration,
     note_to_markdown,
+    write_note_markdown,
 )
 
 
@@ -78,6 +81,22 @@ class TestGetFileExtension:
         url = "https://cdn.example.com/images/photo.PNG"
         assert get_file_extension(url) == ".PNG"
 
+    def test_default_is_part_of_cache_key(self):
+        url = "https://example.com/path/noext"
+        assert get_file_extension(url, ".jpg") == ".jpg"
+        assert get_file_extension(url, ".bin") == ".bin"
+
+
+class TestFormatDatePrefix:
+    def test_standard_format(self):
+        assert format_date_prefix("2024-01-02 03:04:05") == "20240102_030405"
+
+    def test_unpadded_falls_back_to_strptime(self):
+        assert format_date_prefix("2024-1-2 3:04:05") == "20240102_030405"
+
+    def test_unparseable_keeps_text(self):
+        assert format_date_prefix("2024-01-02T03:04:05Z") == "2024-01-02T030405Z"
+
 
 class TestFormatDuration:
     def test_zero_returns_empty(self):
@@ -203,3 +222,18 @@ class TestNoteToMarkdown:
         md = note_to_markdown(note, self.attachments_dir, self.note_dir)
         assert "## 📋 笔记信息" in md
         assert "| 属性 | 值 |" in md
+
+
+class TestWriteNoteMarkdown:
+    def test_matches_note_to_markdown(self):
+        note = {
+            "title": "T",
+            "content": "body",
+            "topics": [{"topic_name": "K"}],
+            "original_images": ["https://e.com/a.png"],
+        }
+        note_dir = Path("/tmp/note")
+        buf = io.StringIO()
+        write_note_markdown(note, note_dir / "attachments", note_dir, buf)
+        assert buf.getvalue() == note_to_markdown(note, note_dir / "attachments", note_dir)
+
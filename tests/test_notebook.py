@@ -0,0 +1,105 @@
+"""Tests for getnotes_cli.notebook module"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from getnotes_cli import _json, api_cache, notebook
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    """Point the API cache at a temp dir so we don't touch ~/.getnotes-cli."""
+    with patch.object(api_cache, "API_CACHE_DIR", tmp_path / "api_cache"):
+        api_cache.clear()
+        yield tmp_path / "api_cache"
+        api_cache.clear()
+
+
+@pytest.fixture
+def auth():
+    token = MagicMock()
+    token.token_hash.return_value = "abc"
+    token.get_headers.return_value = {}
+    return token
+
+
+def mock_client(*bodies):
+    """shared_client() stand-in answering each GET with the next JSON body."""
+    client = MagicMock()
+    responses = []
+    for body in bodies:
+        resp = MagicMock(status_code=200, headers={}, content=_json.dumps(body))
+        responses.append(resp)
+    client.get.side_effect = responses
+    return client
+
+
+NOTEBOOKS = [
+    {"id": 1, "id_alias": "a", "name": "First"},
+    {"id": 2, "id_alias": "b", "name": "Second"},
+    {"id": 3, "id_alias": "a", "name": "Duplicate"},
+]
+
+
+class TestIndexNotebooks:
+    def test_lookup_first_match_wins(self):
+        index = notebook.index_notebooks(NOTEBOOKS)
+        assert notebook.lookup_notebook(index, "a")["id"] == 1
+        assert notebook.lookup_notebook(index, "zzz") is None
+
+    def test_match_is_case_insensitive_substring(self):
+        index = notebook.index_notebooks(NOTEBOOKS + [{"id": 4, "id_alias": "d", "name": None}])
+        assert [nb["id"] for nb in notebook.match_notebooks(index, "SECOND")] == [2]
+        assert [nb["id"] for nb in notebook.match_notebooks(index, "i")] == [1, 3]
+        assert notebook.match_notebooks(index, "zzz") == []
+
+    def test_does_not_mutate_notebooks(self):
+        notebook.index_notebooks(NOTEBOOKS)
+        assert all(set(nb) == {"id", "id_alias", "name"} for nb in NOTEBOOKS)
+
+
+class TestCachedFindNotebook:
+    def test_uses_index_from_cache_entry(self, auth):
+        client = mock_client({"c": NOTEBOOKS})
+        with patch.object(notebook, "shared_client", return_value=client):
+            assert notebook.cached_find_notebook(auth, "b")["id"] == 2
+            assert notebook.cached_find_notebook(auth, "a")["id"] == 1
+            assert notebook.cached_find_notebook(auth, "zzz") is None
+            assert notebook.cached_fetch_notebooks(auth) == NOTEBOOKS
+        assert client.get.call_count == 1
+
+    def test_index_rebuilt_on_refresh(self, auth):
+        updated = [{"id": 9, "id_alias": "b", "name": "Moved"}]
+        client = mock_client({"c": NOTEBOOKS}, {"c": updated})
+        with patch.object(notebook, "shared_client", return_value=client):
+            assert notebook.cached_find_notebook(auth, "b")["id"] == 2
+            notebook.cached_fetch_notebooks(auth, refresh=True)
+            assert notebook.cached_find_notebook(auth, "b")["id"] == 9
+            assert notebook.cached_find_notebook(auth, "a") is None
+
+    def test_subscribed_list_is_separate(self, auth):
+        subscribed = [{"id": 7, "id_alias": "s", "name": "Sub"}]
+        client = mock_client({"c": NOTEBOOKS}, {"c": {"list": subscribed}})
+        with patch.object(notebook, "shared_client", return_value=client):
+            assert notebook.cached_find_notebook(auth, "s") is None
+            assert notebook.cached_find_notebook(auth, "s", subscribed=True)["id"] == 7
+
+    def test_legacy_list_entry(self, auth):
+        api_cache.get_or_fetch("notebooks:abc", 60, lambda: NOTEBOOKS)
+        with patch.object(notebook, "shared_client") as shared:
+            assert notebook.cached_find_notebook(auth, "b")["id"] == 2
+            assert notebook.cached_fetch_notebooks(auth) == NOTEBOOKS
+        shared.assert_not_called()
+
+    def test_lowered_names_are_cached(self, auth):
+        client = mock_client({"c": NOTEBOOKS})
+        with patch.object(notebook, "shared_client", return_value=client):
+            index = notebook.cached_notebook_index(auth)
+        assert index["names_lower"] == ["first", "second", "duplicate"]
+        assert [nb["id"] for nb in notebook.match_notebooks(index, "first")] == [1]
+
+    def test_cached_response_not_mutated(self, auth):
+        client = mock_client({"c": NOTEBOOKS})
+        with patch.object(notebook, "shared_client", return_value=client):
+            notebooks = notebook.cached_fetch_notebooks(auth)
+        assert all(set(nb) == {"id", "id_alias", "name"} for nb in notebooks)
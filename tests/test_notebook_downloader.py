@@ -0,0 +1,111 @@
+"""Tests for getnotes_cli.notebook_downloader module"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from getnotes_cli import _json
+from getnotes_cli.auth import AuthToken
+from getnotes_cli.notebook_downloader import SYNC_STATE_FILE, NotebookDownloader
+
+NOTEBOOK = {"name": "KB", "id_alias": "kb", "root_dir": {"id": 1}}
+IMAGE_URL = "https://cdn.example.com/a.jpg"
+
+
+def note_resource(edit_time: str) -> dict:
+    return {
+        "resource_type": "NOTE",
+        "resource_note_meta_data": {
+            "note_id": "n1",
+            "title": "Hello",
+            "created_at": "2024-01-02 03:04:05",
+            "edit_time": edit_time,
+            "content": f"body {edit_time}",
+            "original_images": [IMAGE_URL],
+        },
+    }
+
+
+@pytest.fixture
+def downloader(tmp_path):
+    nd = NotebookDownloader(AuthToken(authorization="Bearer t"), tmp_path, delay=0)
+    resp = MagicMock()
+    resp.iter_bytes.return_value = [b"new-image"]
+    nd.client = MagicMock()
+    nd.client.stream.return_value.__enter__.return_value = resp
+    return nd
+
+
+@pytest.fixture
+def note_dir(tmp_path, downloader):
+    """A note downloaded by an earlier run: note.md plus an old image."""
+    folder = downloader._make_note_folder_name("Hello", "2024-01-02 03:04:05", "n1")
+    path = tmp_path / "notebooks" / "KB" / "notes" / folder
+    (path / "attachments").mkdir(parents=True)
+    (path / "note.md").write_text("old note")
+    (path / "attachments" / "image_1.jpg").write_bytes(b"old-image")
+    return path
+
+
+def write_sync_state(note_dir, state: dict) -> None:
+    (note_dir.parent.parent / SYNC_STATE_FILE).write_bytes(_json.dumps(state))
+
+
+def read_sync_state(note_dir) -> dict:
+    return _json.loads((note_dir.parent.parent / SYNC_STATE_FILE).read_bytes())
+
+
+def run(downloader, edit_time: str) -> dict:
+    content = {"resources": [note_resource(edit_time)], "has_next": 0}
+    with patch("getnotes_cli.notebook_downloader.fetch_notebook_resources", return_value=content):
+        return downloader.download_notebook(NOTEBOOK)
+
+
+class TestSyncState:
+    def test_unchanged_note_is_skipped(self, downloader, note_dir):
+        write_sync_state(note_dir, {"n1": "t1"})
+        stats = run(downloader, "t1")
+
+        assert (note_dir / "note.md").read_text() == "old note"
+        downloader.client.stream.assert_not_called()
+        assert stats["notes"] == 1
+        assert stats["unchanged"] == 1
+        assert stats["skipped"] == 0
+
+    def test_edited_note_is_rerendered_with_attachments(self, downloader, note_dir):
+        write_sync_state(note_dir, {"n1": "t1"})
+        stats = run(downloader, "t2")
+
+        assert "body t2" in (note_dir / "note.md").read_text()
+        assert (note_dir / "attachments" / "image_1.jpg").read_bytes() == b"new-image"
+        assert downloader.client.stream.call_count == 1
+        assert stats["unchanged"] == 0
+        assert read_sync_state(note_dir) == {"n1": "t2"}
+
+    def test_no_record_skips_and_records(self, downloader, note_dir):
+        stats = run(downloader, "t1")
+
+        assert (note_dir / "note.md").read_text() == "old note"
+        downloader.client.stream.assert_not_called()
+        assert stats["unchanged"] == 1
+        assert read_sync_state(note_dir) == {"n1": "t1"}
+
+    def test_unknown_resource_counts_as_skipped(self, downloader, tmp_path):
+        content = {"resources": [{"resource_type": "LINK"}], "has_next": 0}
+        with patch("getnotes_cli.notebook_downloader.fetch_notebook_resources", return_value=content):
+            stats = downloader.download_notebook(NOTEBOOK)
+        assert stats == {"notes": 0, "unchanged": 0, "files": 0, "skipped": 1}
+
+
+class TestCancel:
+    def test_cancel_stops_resource_loop(self, downloader, tmp_path):
+        resources = [note_resource("t1"), {"resource_type": "LINK"}]
+        content = {"resources": resources, "has_next": 1}
+
+        def fetch(*args, **kwargs):
+            downloader.cancel()
+            return content
+
+        with patch("getnotes_cli.notebook_downloader.fetch_notebook_resources", side_effect=fetch) as f:
+            stats = downloader.download_notebook(NOTEBOOK)
+        assert f.call_count == 1
+        assert stats["notes"] == 0 and stats["skipped"] == 0
@@ -0,0 +1,72 @@
+"""Tests for getnotes_cli.ratelimit module"""
+
+from unittest.mock import patch
+
+from getnotes_cli.ratelimit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(rate, clock, capacity=1):
+    with patch("getnotes_cli.ratelimit.time.monotonic", clock.monotonic):
+        return RateLimiter(rate, capacity)
+
+
+def acquire(limiter, clock):
+    with (
+        patch("getnotes_cli.ratelimit.time.monotonic", clock.monotonic),
+        patch("getnotes_cli.ratelimit.time.sleep", clock.sleep),
+    ):
+        limiter.acquire()
+
+
+class TestRateLimiter:
+    def test_first_acquire_does_not_wait(self):
+        clock = FakeClock()
+        limiter = make_limiter(2.0, clock)
+        acquire(limiter, clock)
+        assert clock.sleeps == []
+
+    def test_back_to_back_acquire_waits_interval(self):
+        clock = FakeClock()
+        limiter = make_limiter(2.0, clock)
+        acquire(limiter, clock)
+        acquire(limiter, clock)
+        assert clock.sleeps == [0.5]
+
+    def test_no_wait_when_requests_slower_than_rate(self):
+        clock = FakeClock()
+        limiter = make_limiter(2.0, clock)
+        acquire(limiter, clock)
+        clock.now += 1.0  # request itself took longer than the interval
+        acquire(limiter, clock)
+        assert clock.sleeps == []
+
+    def test_capacity_allows_burst(self):
+        clock = FakeClock()
+        limiter = make_limiter(1.0, clock, capacity=3)
+        for _ in range(3):
+            acquire(limiter, clock)
+        assert clock.sleeps == []
+
+    def test_zero_rate_never_waits(self):
+        clock = FakeClock()
+        limiter = make_limiter(0, clock)
+        for _ in range(5):
+            acquire(limiter, clock)
+        assert clock.sleeps == []
+
+    def test_from_delay(self):
+        assert RateLimiter.from_delay(0.5).rate == 2.0
+        assert RateLimiter.from_delay(0).rate == 0
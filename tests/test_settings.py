@@ -6,7 +6,13 @@ from pathlib import Path
 from unittest.mock import patch
 
 import getnotes_cli.settings as settings_module
-from getnotes_cli.settings import UserSettings, resolve_output, resolve_delay, resolve_page_size
+from getnotes_cli.settings import (
+    UserSettings,
+    resolve_output,
+    resolve_output_dir,
+    resolve_delay,
+    resolve_page_size,
+)
 
 
 def make_settings(tmp_path: Path) -> UserSettings:
@@ -217,6 +223,20 @@ class TestResolveFunctions:
         with patch.object(settings_module, "_get_settings", return_value=mock):
             assert resolve_output(None, "/default") == "/default"
 
+    def test_resolve_output_dir_returns_path(self, tmp_path):
+        mock = self._mock_settings(tmp_path, {"output": "/saved"})
+        with patch.object(settings_module, "_get_settings", return_value=mock):
+            assert resolve_output_dir(None) == Path("/saved")
+            assert resolve_output_dir("/cli") == Path("/cli")
+
+    def test_resolve_output_dir_uses_default_dir(self, tmp_path):
+        mock = self._mock_settings(tmp_path, {})
+        with (
+            patch.object(settings_module, "_get_settings", return_value=mock),
+            patch.object(settings_module, "get_default_output_dir", return_value=tmp_path),
+        ):
+            assert resolve_output_dir(None) == tmp_path
+
     def test_resolve_delay_cli_value_wins(self, tmp_path):
         mock = self._mock_settings(tmp_path, {"delay": 2.0})
         with patch.object(settings_module, "_get_settings", return_value=mock):